@@ -1,22 +1,303 @@
 from flask import Flask, jsonify, request, render_template
+import atexit
+import json
 import logging
-import joblib
+import hmac
 import numpy as np
 import os
+import time
+import threading
+from src.inference import InferenceEngine
+from src.micro_batching import MicroBatcher, BATCH_SIZE_BUCKETS
+from src.prediction_cache import PredictionCache
+from src.feature_transformer import (FeatureTransformer, timestamp_cache_info, decode_feature_matrix,
+                                     binary_body_error, BINARY_MIMETYPES)
+from src.response_encoding import ResponseEncoder, RESPONSE_FORMATS, dumps
+from src.model_registry import ModelRegistry, DEFAULT_RELOAD_TRIGGER_FILE
+from src.shared_artifacts import DEFAULT_SNAPSHOT_DIR
+from src.metrics import MetricsRegistry, DEFAULT_METRICS_DIR, CONTENT_TYPE
+from src.drift import DriftMonitor
+from src.prediction_log import PredictionLogger, DEFAULT_PREDICTION_LOG_DIR, new_request_id, prediction_ids
 
 app = Flask(__name__)
 
-MODEL_PATH = 'artifacts/model/logistic_regression_model.pkl'
+MODEL_PATH = os.environ.get('MODEL_PATH', 'artifacts/model/logistic_regression_model.pkl')
 SCALER_PATH = 'artifacts/processed/scaler.pkl'
+FEATURE_TRANSFORMER_PATH = 'artifacts/processed/feature_transformer.pkl'
+FEATURE_SCHEMA_PATH = 'artifacts/processed/feature_schema.json'
+DRIFT_REFERENCE_PATH = 'artifacts/processed/drift_reference.json'
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-lines')
+
+# Optional dynamic batching of concurrent /predict calls (useful with threaded workers)
+MICRO_BATCHING = os.environ.get('MICRO_BATCHING', '0') == '1'
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', 64))
+MICRO_BATCH_WAIT_MS = float(os.environ.get('MICRO_BATCH_WAIT_MS', 2.0))
+
+# Optional cache of predictions for repeated (quantized) feature vectors
+PREDICTION_CACHE = os.environ.get('PREDICTION_CACHE', '0') == '1'
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+PREDICTION_CACHE_QUANTUM = float(os.environ.get('PREDICTION_CACHE_QUANTUM', 1e-3))
+
+# Hot reload: poll the artifacts every MODEL_WATCH_INTERVAL seconds (0 disables);
+# POST /admin/reload with X-Admin-Token: $ADMIN_TOKEN triggers a reload on demand. It rewrites
+# RELOAD_TRIGGER_FILE, which every worker's watcher polls, so all workers pick it up
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 5))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Memory-map model arrays from a per-version snapshot shared by all workers (0 loads private copies)
+SHARED_MODEL = os.environ.get('SHARED_MODEL', '1') == '1'
+MODEL_SNAPSHOT_DIR = os.environ.get('MODEL_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR)
+RELOAD_TRIGGER_FILE = os.environ.get('RELOAD_TRIGGER_FILE', DEFAULT_RELOAD_TRIGGER_FILE)
+
+# Per-worker metric (and drift count) files are summed by /metrics and /drift; gunicorn.conf.py clears
+# the directory on start
+METRICS_DIR = os.environ.get('METRICS_DIR', DEFAULT_METRICS_DIR)
+# Live feature histograms vs the training reference; PSI/KS recomputed every DRIFT_INTERVAL seconds
+DRIFT_MONITORING = os.environ.get('DRIFT_MONITORING', '1') == '1'
+DRIFT_INTERVAL = float(os.environ.get('DRIFT_INTERVAL', 60))
+DRIFT_HALF_LIFE = float(os.environ.get('DRIFT_HALF_LIFE', 3600))
+
+# Optional log of served rows and predictions in hourly partitions, readable by DataProcessing
+PREDICTION_LOG = os.environ.get('PREDICTION_LOG', '0') == '1'
+PREDICTION_LOG_DIR = os.environ.get('PREDICTION_LOG_DIR', DEFAULT_PREDICTION_LOG_DIR)
+PREDICTION_LOG_CAPACITY = int(os.environ.get('PREDICTION_LOG_CAPACITY', 100000))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.environ.get('PREDICTION_LOG_FLUSH_SECONDS', 1.0))
+
+STAGES = ('parse', 'scale', 'model', 'serialize')
+ENDPOINTS = ('index', 'predict', 'predict_batch')
+
+metrics = MetricsRegistry(METRICS_DIR)
+STAGE_SECONDS = metrics.histogram('prediction_stage_seconds', 'Time spent in each stage of a prediction request',
+                                  label='stage', values=STAGES)
+REQUESTS = metrics.counter('prediction_requests', 'Prediction requests received', label='endpoint', values=ENDPOINTS)
+ERRORS = metrics.counter('prediction_errors', 'Prediction requests that failed', label='endpoint', values=ENDPOINTS)
+ROWS = metrics.counter('prediction_rows', 'Rows scored by the model')
+BATCH_ROWS = metrics.histogram('prediction_batch_rows', 'Records per /predict/batch request',
+                               buckets=BATCH_SIZE_BUCKETS)
+
+model, scaler = None, None
+# Without the saved transformer, Operation_Mode must be sent pre-encoded
+feature_transformer = FeatureTransformer()
+# Allowed dtypes and ranges of each feature, derived from the training data
+feature_schema = None
+engine = None
+# Compares served features with the loaded model's training data (None without a drift reference)
+drift_monitor = None
+prediction_logger = None
+if PREDICTION_LOG:
+    prediction_logger = PredictionLogger(PREDICTION_LOG_DIR, capacity_rows=PREDICTION_LOG_CAPACITY,
+                                         flush_interval=PREDICTION_LOG_FLUSH_SECONDS)
+    # Write the rows still buffered when the worker exits
+    atexit.register(prediction_logger.stop)
+engine_version = 0
+engine_lock = threading.Lock()
+
+
+def publish_bundle(bundle):
+    """Swap in a validated model bundle; requests already holding the old engine finish on it."""
+    global model, scaler, feature_transformer, feature_schema, engine, engine_version
+    with engine_lock:
+        model, scaler, feature_transformer = bundle.model, bundle.scaler, bundle.feature_transformer
+        feature_schema = bundle.feature_schema
+        engine = bundle.engine
+        engine_version += 1
+    metrics.set_info(model_version=bundle.version)
+    publish_drift_reference(bundle.drift_reference)
+    if prediction_logger is not None:
+        prediction_logger.set_categories(bundle.version, bundle.feature_transformer.categories)
+
+
+def publish_drift_reference(reference):
+    """Point the drift monitor at a new model's training reference."""
+    global drift_monitor
+    if not DRIFT_MONITORING:
+        return
+    if reference is None:
+        if drift_monitor is not None:
+            drift_monitor.stop()
+        drift_monitor = None
+    elif drift_monitor is None:
+        drift_monitor = DriftMonitor(reference, interval_seconds=DRIFT_INTERVAL, half_life_seconds=DRIFT_HALF_LIFE,
+                                     shared_dir=METRICS_DIR)
+    else:
+        drift_monitor.set_reference(reference)
+
+
+registry = ModelRegistry(MODEL_PATH, SCALER_PATH, FEATURE_TRANSFORMER_PATH, on_swap=publish_bundle,
+                         shared=SHARED_MODEL, snapshot_dir=MODEL_SNAPSHOT_DIR,
+                         feature_schema_path=FEATURE_SCHEMA_PATH, drift_reference_path=DRIFT_REFERENCE_PATH,
+                         trigger_path=RELOAD_TRIGGER_FILE)
 
 # Load model and scaler
 try:
-    model = joblib.load(MODEL_PATH)
-    scaler = joblib.load(SCALER_PATH)
-    print("[SUCCESS] Model and scaler loaded successfully")
+    registry.reload()
+    print(f"[SUCCESS] Model and scaler loaded successfully (version {registry.version})")
 except Exception as e:
     print(f"[ERROR] Error loading model/scaler: {e}")
-    model, scaler = None, None
+
+
+def get_engine():
+    """Return the fused inference engine for the loaded model and scaler."""
+    global engine, engine_version
+    current = engine
+    if current is not None and current.model is model and current.scaler is scaler:
+        return current
+    with engine_lock:
+        if engine is None or engine.model is not model or engine.scaler is not scaler:
+            engine = InferenceEngine(model, scaler)
+            engine_version += 1
+        return engine
+
+
+watcher_started = False
+
+
+@app.before_request
+def start_model_watcher():
+    """Start the artifact watcher lazily so it runs in each worker process."""
+    global watcher_started
+    if not watcher_started and MODEL_WATCH_INTERVAL > 0:
+        watcher_started = True
+        registry.start_watching(MODEL_WATCH_INTERVAL)
+
+
+@app.before_request
+def start_drift_monitor():
+    """Start the drift statistics thread lazily so it runs in each worker process."""
+    monitor = drift_monitor
+    if monitor is not None:
+        monitor.start()
+
+
+@app.before_request
+def start_prediction_logger():
+    """Start the prediction log writer lazily so it runs in each worker process."""
+    if prediction_logger is not None:
+        prediction_logger.start()
+
+
+batcher = None
+batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    """Return the micro-batcher, started lazily so it lives in the worker process."""
+    global batcher
+    with batcher_lock:
+        if batcher is None:
+            batcher = MicroBatcher(lambda X: get_engine().predict(X),
+                                   max_batch_size=MICRO_BATCH_MAX_SIZE,
+                                   max_wait_ms=MICRO_BATCH_WAIT_MS)
+    return batcher
+
+
+def validate_matrix(input_array):
+    """(row_indices, errors) for an encoded feature matrix, checked against the feature schema if loaded."""
+    if feature_schema is not None:
+        return feature_schema.validate(input_array)
+    return feature_transformer.check_matrix(input_array)
+
+
+def apply_schema(input_array, row_indices, errors):
+    """Drop matrix rows that violate the feature schema and add their per-field errors."""
+    if feature_schema is None or not len(input_array):
+        return input_array, row_indices, errors
+    valid, schema_errors = feature_schema.validate(input_array)
+    if not schema_errors:
+        return input_array, row_indices, errors
+    errors = errors + [dict(error, index=row_indices[error["index"]]) for error in schema_errors]
+    errors.sort(key=lambda error: error["index"])
+    return input_array[valid], [row_indices[row] for row in valid], errors
+
+
+def parse_binary_row(body):
+    """(1xN row, None) for a binary (float32) request body, or (None, reason) if it is invalid."""
+    error = binary_body_error(body)
+    if error is not None:
+        return None, error
+    input_array = decode_feature_matrix(body)
+    if len(input_array) != 1:
+        return None, f"Expected one row, got {len(input_array)}; use /predict/batch for several"
+    _, errors = validate_matrix(input_array)
+    if errors:
+        return None, errors[0]["error"]
+    return input_array, None
+
+
+def parse_record(data):
+    """(1xN row, None) for one request record, or (None, reason) if it is invalid."""
+    if not isinstance(data, dict):
+        return None, "Record must be a JSON object"
+    input_array, _, errors = apply_schema(*feature_transformer.transform_records([data]))
+    if errors:
+        return None, errors[0]["error"]
+    return input_array, None
+
+
+prediction_cache = None
+prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """Return the prediction cache, cleared whenever the model or scaler changes."""
+    global prediction_cache
+    with prediction_cache_lock:
+        if prediction_cache is None:
+            prediction_cache = PredictionCache(max_entries=PREDICTION_CACHE_MAX_ENTRIES,
+                                               ttl_seconds=PREDICTION_CACHE_TTL,
+                                               quantum=PREDICTION_CACHE_QUANTUM)
+    get_engine()
+    prediction_cache.bind(engine_version)
+    return prediction_cache
+
+
+def score_matrix(input_array):
+    """Run the model on a feature matrix; single rows go through the micro-batcher when enabled."""
+    start = time.perf_counter()
+    ROWS.inc(amount=len(input_array))
+    if MICRO_BATCHING and len(input_array) == 1:
+        pred_class, pred_proba = get_batcher().predict(input_array[0])
+        STAGE_SECONDS.observe(time.perf_counter() - start, 'model')
+        return [pred_class], [pred_proba]
+    current = get_engine()
+    scaled = current.scale(input_array)
+    scaled_at = time.perf_counter()
+    STAGE_SECONDS.observe(scaled_at - start, 'scale')
+    result = current.predict_scaled(scaled)
+    STAGE_SECONDS.observe(time.perf_counter() - scaled_at, 'model')
+    return result
+
+
+def predict_matrix(input_array, ids=None, records=None):
+    """Predict every row, answering repeated rows from the prediction cache when enabled.
+
+    ``ids`` are the rows' prediction IDs and ``records`` the request records
+    they came from; both are only kept in the prediction log.
+    """
+    monitor = drift_monitor
+    if monitor is not None:
+        monitor.observe(input_array)
+    if PREDICTION_CACHE:
+        result = get_prediction_cache().predict(input_array, score_matrix)
+    else:
+        result = score_matrix(input_array)
+    if prediction_logger is not None:
+        machine_ids = timestamps = None
+        if records is not None:
+            machine_ids = [record.get('Machine_ID') for record in records]
+            timestamps = [record.get('Timestamp') for record in records]
+        prediction_logger.log(input_array, *result, version=registry.version, ids=ids,
+                              machine_ids=machine_ids, timestamps=timestamps)
+    return result
+
+
+def predict_row(input_array, prediction_id=None, record=None):
+    """Predict a single 1xN row."""
+    pred_classes, pred_probas = predict_matrix(input_array, None if prediction_id is None else [prediction_id],
+                                               None if record is None else [record])
+    return pred_classes[0], pred_probas[0]
 
 FEATURES = ['Operation_Mode', 'Temperature_C', 'Vibration_Hz',
                 'Power_Consumption_kW', 'Network_Latency_ms', 'Packet_Loss_%',
@@ -30,6 +311,31 @@ LABELS = {
     2: 'High Efficiency'
 }
 
+encoder = ResponseEncoder(LABELS)
+
+
+def format_prediction(pred_class, pred_proba, prediction_id=None):
+    """Response body for a single prediction."""
+    return encoder.single(pred_class, pred_proba, prediction_id)
+
+
+def json_response(payload, status=200):
+    """JSON response encoded straight from NumPy values (orjson when installed)."""
+    return app.response_class(dumps(payload), status=status, mimetype="application/json")
+
+
+def rejection(endpoint, error):
+    """Error body for a request that failed validation; counted, logged lazily at debug level."""
+    ERRORS.inc(endpoint)
+    logging.debug("Rejected %s request: %s", endpoint, error)
+    return {"error": error}
+
+
+def reject(endpoint, error, status=400):
+    """Error response for a request that failed validation."""
+    return json_response(rejection(endpoint, error), status)
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "GET":
@@ -39,70 +345,267 @@ def index():
     confidence = None
     
     if request.method == "POST":
+        REQUESTS.inc('index')
+        prediction_id = prediction_ids(new_request_id(), [0])[0]
+        data = request.get_json(silent=True)
+        input_array, error = parse_record(data)
+        if error is not None:
+            return reject('index', "Invalid input data")
+        if model is None or scaler is None:
+            return reject('index', "Model not loaded", 500)
+
         try:
-            if model is None or scaler is None:
-                return jsonify({"error": "Model not loaded"}), 500
-                
-            data = request.get_json()
-            input_data = [data[feature] for feature in FEATURES]
-            input_array = np.array(input_data).reshape(1, -1)
-            input_scaled = scaler.transform(input_array)
-            
-            pred_class = model.predict(input_scaled)[0]
-            pred_proba = model.predict_proba(input_scaled)[0]
-            confidence = float(max(pred_proba))
-            
-            prediction = LABELS.get(pred_class, "Unknown")
-            
-            return jsonify({
-                "prediction": prediction,
-                "confidence": confidence,
-                "class": int(pred_class)
-            })
-            
+            pred_class, pred_proba = predict_row(input_array, prediction_id, data)
         except Exception as e:
-            logging.error(f"Error during prediction: {e}")
-            return jsonify({"error": "Invalid input data"}), 400
+            ERRORS.inc('index')
+            logging.error("Error during prediction: %s", e)
+            return json_response({"error": "Invalid input data"}, 400)
+
+        body = format_prediction(pred_class, pred_proba, prediction_id)
+        return json_response({key: body[key] for key in ("prediction", "confidence", "class", "prediction_id")})
 
 @app.route("/predict", methods=["POST"])
 def predict():
+    REQUESTS.inc('predict')
+    # Validation returns its error instead of raising, so bad input costs no more than good input
+    start = time.perf_counter()
+    prediction_id = prediction_ids(new_request_id(), [0])[0]
+    data = None
+    if request.mimetype in BINARY_MIMETYPES:
+        input_array, error = parse_binary_row(request.get_data())
+    else:
+        data = request.get_json(silent=True)
+        input_array, error = parse_record(data)
+    if error is not None:
+        return reject('predict', error)
+    if model is None or scaler is None:
+        return reject('predict', "Model not loaded", 500)
+    STAGE_SECONDS.observe(time.perf_counter() - start, 'parse')
+
     try:
-        if model is None or scaler is None:
-            return jsonify({"error": "Model not loaded"}), 500
-            
-        data = request.get_json()
-        input_data = [data[feature] for feature in FEATURES]
-        input_array = np.array(input_data).reshape(1, -1)
-        input_scaled = scaler.transform(input_array)
-        
-        pred_class = model.predict(input_scaled)[0]
-        pred_proba = model.predict_proba(input_scaled)[0]
-        confidence = float(max(pred_proba))
-        
-        prediction = LABELS.get(pred_class, "Unknown")
-        
-        return jsonify({
-            "prediction": prediction,
-            "confidence": confidence,
-            "class": int(pred_class),
-            "probabilities": {
-                "Low Efficiency": float(pred_proba[0]),
-                "Medium Efficiency": float(pred_proba[1]), 
-                "High Efficiency": float(pred_proba[2])
-            }
-        })
-        
+        pred_class, pred_proba = predict_row(input_array, prediction_id, data)
     except Exception as e:
-        logging.error(f"Error during prediction: {e}")
-        return jsonify({"error": str(e)}), 400
+        ERRORS.inc('predict')
+        logging.error("Error during prediction: %s", e)
+        return json_response({"error": str(e)}, 400)
 
-@app.route("/health", methods=["GET"])
-def health():
-    return jsonify({
+    start = time.perf_counter()
+    response = json_response(format_prediction(pred_class, pred_proba, prediction_id))
+    STAGE_SECONDS.observe(time.perf_counter() - start, 'serialize')
+    return response
+
+def parse_batch_records(body, mimetype):
+    """Read the records of a batch request body as (records, errors).
+
+    Accepts a JSON array, a JSON object with a ``records`` array, or
+    newline-delimited JSON. Lines of NDJSON that fail to parse are reported
+    as errors for their row instead of failing the whole batch.
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+
+    if mimetype in NDJSON_MIMETYPES:
+        records, errors = [], []
+        lines = [line for line in body.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(None)
+                errors.append({"index": index, "error": f"Invalid JSON: {e}"})
+        return records, errors
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        data = data.get("records")
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of records or newline-delimited JSON")
+    return data, []
+
+
+def records_to_matrix(records, errors=None):
+    """Build the feature matrix for the valid records of a batch.
+
+    Returns (matrix, row_indices, errors) where ``row_indices`` maps each
+    matrix row back to its position in ``records``.
+    """
+    errors = list(errors or [])
+    failed = {error["index"] for error in errors}
+    candidates = []
+    for index, record in enumerate(records):
+        if index in failed:
+            continue
+        if not isinstance(record, dict):
+            errors.append({"index": index, "error": "Record must be a JSON object"})
+            continue
+        candidates.append(index)
+
+    encoded = feature_transformer.transform_records([records[i] for i in candidates])
+    matrix, rows, row_errors = apply_schema(*encoded)
+    row_indices = [candidates[row] for row in rows]
+    errors.extend(dict(error, index=candidates[error["index"]]) for error in row_errors)
+    errors.sort(key=lambda error: error["index"])
+    return matrix, row_indices, errors
+
+
+def add_stage_time(timings, stage, start):
+    """Add the time since ``start`` to ``timings[stage]`` (if timing) and return the current time."""
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + now - start
+    return now
+
+
+def score_batch(records, errors=None, timings=None, response_format='rows', request_id=None):
+    """Score every valid record in one pass and build the batch response body.
+
+    Parse and serialize time are added to ``timings`` when a dict is given.
+    """
+    start = time.perf_counter()
+    input_array, row_indices, errors = records_to_matrix(records, errors)
+    add_stage_time(timings, 'parse', start)
+    return batch_response(len(records), input_array, row_indices, errors, timings, response_format, request_id,
+                          records)
+
+
+def score_binary_batch(input_array, timings=None, response_format='rows', request_id=None):
+    """Score a decoded binary batch; rows that fail validation are reported like invalid records."""
+    start = time.perf_counter()
+    count = len(input_array)
+    row_indices, errors = validate_matrix(input_array)
+    if len(row_indices) < count:
+        input_array = input_array[row_indices]
+    add_stage_time(timings, 'parse', start)
+    return batch_response(count, input_array, row_indices, errors, timings, response_format, request_id)
+
+
+def batch_response(count, input_array, row_indices, errors, timings=None, response_format='rows',
+                   request_id=None, records=None):
+    """Predict the valid rows of a batch and build the response body.
+
+    ``response_format='columnar'`` returns ``results`` as one array per field.
+    Every result carries ``prediction_id`` (``<request_id>-<index>``).
+    """
+    ids = prediction_ids(request_id or new_request_id(), row_indices)
+    pred_classes, pred_probas = [], []
+    if row_indices:
+        scored = None if records is None else [records[index] for index in row_indices]
+        pred_classes, pred_probas = predict_matrix(input_array, ids, scored)
+    start = time.perf_counter()
+    results = encoder.results(row_indices, pred_classes, pred_probas, response_format, ids)
+    add_stage_time(timings, 'serialize', start)
+
+    return {
+        "count": count,
+        "succeeded": len(row_indices),
+        "failed": len(errors),
+        "results": results,
+        "errors": errors
+    }
+
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    REQUESTS.inc('predict_batch')
+    request_id = new_request_id()
+    response_format = request.args.get("format", "rows")
+    if response_format not in RESPONSE_FORMATS:
+        return reject('predict_batch', f"Unknown response format {response_format!r}")
+
+    timings = {}
+    binary = request.mimetype in BINARY_MIMETYPES
+    start = time.perf_counter()
+    if binary:
+        error = binary_body_error(request.get_data())
+        if error is not None:
+            return reject('predict_batch', error)
+        records = decode_feature_matrix(request.get_data())
+    else:
+        try:
+            records, errors = parse_batch_records(request.get_data(), request.mimetype)
+        except ValueError as e:
+            return reject('predict_batch', str(e))
+    add_stage_time(timings, 'parse', start)
+
+    BATCH_ROWS.observe(len(records))
+    if len(records) > MAX_BATCH_SIZE:
+        return reject('predict_batch', f"Batch size {len(records)} exceeds maximum of {MAX_BATCH_SIZE}", 413)
+    if model is None or scaler is None:
+        return reject('predict_batch', "Model not loaded", 500)
+
+    try:
+        if binary:
+            body = score_binary_batch(records, timings, response_format, request_id)
+        else:
+            body = score_batch(records, errors, timings, response_format, request_id)
+    except Exception as e:
+        ERRORS.inc('predict_batch')
+        logging.error("Error during batch prediction: %s", e)
+        return json_response({"error": str(e)}, 400)
+
+    start = time.perf_counter()
+    response = json_response(body)
+    add_stage_time(timings, 'serialize', start)
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.observe(seconds, stage)
+    return response
+
+def health_status():
+    """Body of the /health response."""
+    status = {
         "status": "healthy",
         "model_loaded": model is not None,
-        "scaler_loaded": scaler is not None
-    })
+        "scaler_loaded": scaler is not None,
+        "model_version": registry.version,
+        "model_registry": registry.stats()
+    }
+    if batcher is not None:
+        status["micro_batching"] = batcher.stats()
+    if prediction_cache is not None:
+        status["prediction_cache"] = prediction_cache.stats()
+    if prediction_logger is not None:
+        status["prediction_log"] = prediction_logger.stats()
+    status["timestamp_cache"] = timestamp_cache_info()
+    return status
+
+@app.route("/admin/reload", methods=["POST"])
+def admin_reload():
+    """Reload the model artifacts now and signal the other workers through the trigger file.
+
+    The response reports this worker; the others reload on their next watcher
+    tick. The current model keeps serving if the new one fails.
+    """
+    token = request.headers.get("X-Admin-Token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(token, ADMIN_TOKEN):
+        return jsonify({"error": "Forbidden"}), 403
+    try:
+        reloaded = registry.request_reload(force=request.args.get("force") == "1")
+    except Exception as e:
+        return jsonify({"reloaded": False, "version": registry.version, "error": str(e)}), 500
+    return jsonify({"reloaded": reloaded, "version": registry.version})
+
+@app.route("/health", methods=["GET"])
+def health():
+    return jsonify(health_status())
+
+def drift_status():
+    """(body, status) of the /drift response: the latest drift statistics summed over all workers."""
+    if drift_monitor is None:
+        return {"error": "Drift monitoring is not enabled"}, 404
+    return drift_monitor.report(), 200
+
+@app.route("/drift", methods=["GET"])
+def drift():
+    payload, status = drift_status()
+    return jsonify(payload), status
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Prometheus exposition of the prediction metrics, summed over all workers."""
+    return metrics.render(), 200, {"Content-Type": CONTENT_TYPE}
 
 if __name__ == "__main__":
     app.run(debug=True, host='0.0.0.0', port=5000)
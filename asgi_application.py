@@ -0,0 +1,204 @@
+"""
+ASGI serving mode for the efficiency predictor.
+
+Exposes the same /predict, /predict/batch, /health, /drift and /metrics
+contract as application.py, reusing its loaded artifacts, feature
+transformer, request helpers and metrics. CPU-bound inference (and batch parsing) runs on a bounded thread
+pool so the event loop keeps accepting connections while NumPy does the work.
+
+Run with:  uvicorn asgi_application:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import application
+from src.response_encoding import RESPONSE_FORMATS, dumps
+from src.metrics import CONTENT_TYPE
+
+INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 4))
+MAX_PENDING_INFERENCES = int(os.environ.get('MAX_PENDING_INFERENCES', 256))
+
+
+class AsyncPredictionApp:
+    """Minimal ASGI app routing to the shared prediction helpers."""
+
+    def __init__(self, inference_threads=INFERENCE_THREADS, max_pending=MAX_PENDING_INFERENCES):
+        self.executor = ThreadPoolExecutor(max_workers=inference_threads, thread_name_prefix="inference")
+        self.max_pending = max_pending
+        self._pending = None
+        self.routes = {
+            ("POST", "/predict"): self.predict,
+            ("POST", "/predict/batch"): self.predict_batch,
+            ("GET", "/health"): self.health,
+            ("GET", "/drift"): self.drift,
+            ("GET", "/metrics"): self.metrics,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        handler = self.routes.get((scope["method"], scope["path"]))
+        if handler is None:
+            await self.send_json(send, {"error": "Not found"}, 404)
+            return
+
+        body = await self.read_body(receive)
+        headers = dict(scope.get("headers") or [])
+        mimetype = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip()
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        await self.send_response(send, *await handler(body, mimetype, query))
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                application.start_model_watcher()
+                application.start_drift_monitor()
+                application.start_prediction_logger()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                application.registry.stop_watching()
+                if application.prediction_logger is not None:
+                    application.prediction_logger.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def send_response(send, payload, status=200, content_type="application/json"):
+        """Send a complete response; ``payload`` is raw bytes, text, or a body to encode as JSON."""
+        if isinstance(payload, str):
+            body = payload.encode()
+        elif isinstance(payload, bytes):
+            body = payload
+        else:
+            body = dumps(payload)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def send_json(self, send, payload, status=200):
+        await self.send_response(send, payload, status)
+
+    async def run_inference(self, func, *args):
+        """Run CPU-bound work on the executor, with at most ``max_pending`` calls queued."""
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self.max_pending)
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def predict(self, body, mimetype, query):
+        application.REQUESTS.inc('predict')
+        start = time.perf_counter()
+        prediction_id = application.prediction_ids(application.new_request_id(), [0])[0]
+        data = None
+        if mimetype in application.BINARY_MIMETYPES:
+            input_array, error = application.parse_binary_row(body)
+        else:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = None
+            input_array, error = application.parse_record(data)
+        if error is not None:
+            return application.rejection('predict', error), 400
+        if application.model is None or application.scaler is None:
+            return application.rejection('predict', "Model not loaded"), 500
+        application.STAGE_SECONDS.observe(time.perf_counter() - start, 'parse')
+
+        try:
+            pred_class, pred_proba = await self.run_inference(application.predict_row, input_array, prediction_id,
+                                                              data)
+        except Exception as e:
+            application.ERRORS.inc('predict')
+            logging.error("Error during prediction: %s", e)
+            return {"error": str(e)}, 400
+
+        start = time.perf_counter()
+        response = dumps(application.format_prediction(pred_class, pred_proba, prediction_id))
+        application.STAGE_SECONDS.observe(time.perf_counter() - start, 'serialize')
+        return response, 200
+
+    async def predict_batch(self, body, mimetype, query):
+        application.REQUESTS.inc('predict_batch')
+        request_id = application.new_request_id()
+        response_format = query.get("format", ["rows"])[-1]
+        if response_format not in RESPONSE_FORMATS:
+            return application.rejection('predict_batch', f"Unknown response format {response_format!r}"), 400
+        return await self.run_inference(self.process_batch, body, mimetype, response_format, request_id)
+
+    @staticmethod
+    def process_batch(body, mimetype, response_format, request_id):
+        """Parse, score and serialize a batch on an inference thread; returns (response, status)."""
+        timings = {}
+        binary = mimetype in application.BINARY_MIMETYPES
+        start = time.perf_counter()
+        if binary:
+            error = application.binary_body_error(body)
+            if error is not None:
+                return application.rejection('predict_batch', error), 400
+            records = application.decode_feature_matrix(body)
+        else:
+            try:
+                records, errors = application.parse_batch_records(body, mimetype)
+            except ValueError as e:
+                return application.rejection('predict_batch', str(e)), 400
+        application.add_stage_time(timings, 'parse', start)
+
+        application.BATCH_ROWS.observe(len(records))
+        if len(records) > application.MAX_BATCH_SIZE:
+            error = f"Batch size {len(records)} exceeds maximum of {application.MAX_BATCH_SIZE}"
+            return application.rejection('predict_batch', error), 413
+        if application.model is None or application.scaler is None:
+            return application.rejection('predict_batch', "Model not loaded"), 500
+
+        try:
+            if binary:
+                payload = application.score_binary_batch(records, timings, response_format, request_id)
+            else:
+                payload = application.score_batch(records, errors, timings, response_format, request_id)
+        except Exception as e:
+            application.ERRORS.inc('predict_batch')
+            logging.error("Error during batch prediction: %s", e)
+            return {"error": str(e)}, 400
+
+        start = time.perf_counter()
+        response = dumps(payload)
+        application.add_stage_time(timings, 'serialize', start)
+        for stage, seconds in timings.items():
+            application.STAGE_SECONDS.observe(seconds, stage)
+        return response, 200
+
+    async def health(self, body, mimetype, query):
+        return application.health_status(), 200
+
+    async def drift(self, body, mimetype, query):
+        return application.drift_status()
+
+    async def metrics(self, body, mimetype, query):
+        return application.metrics.render(), 200, CONTENT_TYPE
+
+app = AsyncPredictionApp()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request-path cost of drift monitoring.
+
+Times application.predict_matrix for single rows and batches with the drift
+monitor off and on (the request thread only queues the matrix), then the
+background update that bins the queued rows and recomputes PSI/KS.
+
+Usage: python benchmarks/bench_drift_overhead.py [--batch 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='bench-metrics-')
+
+import application
+from bench_request_formats import build_rows, build_engine
+from src.drift import DriftReference, DriftMonitor
+from src.inference import InferenceEngine
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    X = build_rows(max(args.batch, 5000))
+    model, scaler = build_engine(X)
+    reference = DriftReference.from_sample(X).update(X)
+    # Queue everything: the interval is long enough that the thread never drains it mid-run
+    monitor = DriftMonitor(reference, interval_seconds=3600, max_pending_rows=10 ** 7)
+    patches = [patch('application.model', model), patch('application.scaler', scaler),
+               patch('application.engine', InferenceEngine(model, scaler))]
+    for app_patch in patches:
+        app_patch.start()
+
+    print(f"{'rows':>6} | {'off (us)':>10} | {'on (us)':>10} | {'overhead':>9}")
+    print("-" * 45)
+    for rows in (1, args.batch):
+        batch = X[:rows]
+        number = max(20, 20000 // rows)
+        with patch('application.drift_monitor', None):
+            off = time_per_call(lambda: application.predict_matrix(batch), number)
+        with patch('application.drift_monitor', monitor):
+            on = time_per_call(lambda: application.predict_matrix(batch), number)
+        print(f"{rows:>6} | {off * 1e6:>10.1f} | {on * 1e6:>10.1f} | {(on - off) / off:>8.1%}")
+
+    queued = sum(len(batch) for batch in monitor._pending)
+    start = time.perf_counter()
+    monitor.update()
+    update = time.perf_counter() - start
+    print(f"\nBackground update of {queued} queued rows: {update * 1e3:.1f} ms")
+    print(f"Recompute with an empty queue: {time_per_call(monitor.update, 20) * 1e3:.2f} ms")
+
+    for app_patch in patches:
+        app_patch.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: sklearn scaler.transform + predict + predict_proba
+versus the fused InferenceEngine at batch sizes 1, 64 and 4096.
+
+Usage: python benchmarks/bench_inference.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.inference import InferenceEngine
+
+BATCH_SIZES = [1, 64, 4096]
+N_FEATURES = 14
+
+
+def build_model():
+    rng = np.random.RandomState(42)
+    X = rng.normal(loc=50, scale=20, size=(5000, N_FEATURES))
+    y = rng.randint(0, 3, 5000)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(random_state=42, max_iter=1000).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def sklearn_path(model, scaler, X):
+    X_scaled = scaler.transform(X)
+    return model.predict(X_scaled), model.predict_proba(X_scaled)
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    model, scaler = build_model()
+    engine = InferenceEngine(model, scaler)
+    rng = np.random.RandomState(0)
+
+    print(f"{'batch':>6} | {'sklearn (us)':>12} | {'fused (us)':>10} | {'speedup':>7}")
+    print("-" * 46)
+    for batch_size in BATCH_SIZES:
+        X = rng.normal(loc=50, scale=20, size=(batch_size, N_FEATURES))
+        number = max(10, 20000 // batch_size)
+
+        baseline = time_per_call(lambda: sklearn_path(model, scaler, X), number)
+        fused = time_per_call(lambda: engine.predict(X), number)
+
+        print(f"{batch_size:>6} | {baseline * 1e6:>12.1f} | {fused * 1e6:>10.1f} | {baseline / fused:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: joblib pickles of X/y versus memory-mapped .npy splits.
+
+Reports write time, load time and the peak RSS of a fresh process that
+loads the splits and reads one feature column (the typical access pattern
+of evaluation and column statistics).
+
+Usage: python benchmarks/bench_processed_format.py --rows 2000000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.processed_store import save_processed, load_processed
+
+FEATURES = [f"feature_{i}" for i in range(14)]
+
+
+def write_pickles(path, X_train, X_test, y_train, y_test):
+    for name, array in (('X_train', X_train), ('X_test', X_test), ('y_train', y_train), ('y_test', y_test)):
+        joblib.dump(array, os.path.join(path, f"{name}.pkl"))
+
+
+def load_pickles(path):
+    return [joblib.load(os.path.join(path, f"{name}.pkl")) for name in ('X_train', 'X_test', 'y_train', 'y_test')]
+
+
+def peak_rss_mb():
+    """High-water RSS of this process (VmHWM), which unlike ru_maxrss is reset by exec."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def measure_load(fmt, path, queue):
+    """Runs in a fresh process so the peak RSS reflects only this load."""
+    start = time.perf_counter()
+    if fmt == "pickle":
+        X_train, _, _, _ = load_pickles(path)
+    else:
+        X_train, _, _, _ = load_processed(path)
+    load_time = time.perf_counter() - start
+    column_mean = float(X_train[:, 3].mean())
+    queue.put((load_time, peak_rss_mb(), column_mean))
+
+
+def run_in_subprocess(fmt, path):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=measure_load, args=(fmt, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare processed-data formats")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(42)
+    n_test = args.rows // 5
+    X_train = rng.normal(size=(args.rows - n_test, len(FEATURES)))
+    X_test = rng.normal(size=(n_test, len(FEATURES)))
+    y_train = rng.randint(0, 3, args.rows - n_test)
+    y_test = rng.randint(0, 3, n_test)
+
+    print(f"{'format':>8} | {'write s':>8} | {'load s':>8} | {'peak RSS MB':>11}")
+    print("-" * 46)
+    with tempfile.TemporaryDirectory() as pickle_dir, tempfile.TemporaryDirectory() as npy_dir:
+        start = time.perf_counter()
+        write_pickles(pickle_dir, X_train, X_test, y_train, y_test)
+        pickle_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_processed(npy_dir, X_train, X_test, y_train, y_test, FEATURES)
+        npy_write = time.perf_counter() - start
+
+        for fmt, path, write_time in (("pickle", pickle_dir, pickle_write), ("npy", npy_dir, npy_write)):
+            load_time, rss_mb, _ = run_in_subprocess(fmt, path)
+            print(f"{fmt:>8} | {write_time:>8.3f} | {load_time:>8.4f} | {rss_mb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
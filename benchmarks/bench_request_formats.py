@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON vs float32 binary request bodies.
+
+For single records and batches, times the request body -> feature matrix
+step (JSON: json.loads + FeatureTransformer.transform_records; binary:
+np.frombuffer + check_matrix), that step plus fused inference, and a full
+POST through the Flask app. Also reports the body size of each format.
+
+Usage: python benchmarks/bench_request_formats.py [--batch 1000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from unittest.mock import patch
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.feature_transformer import FEATURES, FeatureTransformer, decode_feature_matrix, encode_feature_matrix
+from src.inference import InferenceEngine
+
+MODES = ['Active', 'Idle', 'Maintenance']
+
+
+def build_rows(n):
+    rng = np.random.RandomState(0)
+    X = rng.normal(loc=50, scale=20, size=(n, len(FEATURES)))
+    X[:, FEATURES.index('Operation_Mode')] = rng.randint(0, len(MODES), n)
+    X[:, -4:] = [2024, 1, 15, 12]
+    return X
+
+
+def build_engine(X):
+    y = np.random.RandomState(1).randint(0, 3, len(X))
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def to_records(X):
+    return [{name: float(value) for name, value in zip(FEATURES, row)} for row in X]
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    X = build_rows(max(args.batch, 1000))
+    model, scaler = build_engine(X)
+    engine = InferenceEngine(model, scaler)
+    transformer = FeatureTransformer({'Operation_Mode': MODES})
+
+    import application
+    app_patches = [patch('application.model', model), patch('application.scaler', scaler),
+                   patch('application.engine', engine), patch('application.feature_transformer', transformer)]
+    for app_patch in app_patches:
+        app_patch.start()
+    client = application.app.test_client()
+
+    print(f"{'rows':>6} {'format':>7} {'bytes':>8} | {'decode (us)':>11} | {'+ predict (us)':>14} | "
+          f"{'HTTP (us)':>10}")
+    print("-" * 70)
+    for rows, endpoint in ((1, '/predict'), (args.batch, '/predict/batch')):
+        batch = X[:rows]
+        json_body = json.dumps(to_records(batch)[0] if rows == 1 else to_records(batch))
+        binary_body = encode_feature_matrix(batch)
+        number = max(10, 20000 // rows)
+
+        def json_decode():
+            data = json.loads(json_body)
+            return transformer.transform_records(data if isinstance(data, list) else [data])[0]
+
+        def binary_decode():
+            matrix = decode_feature_matrix(binary_body)
+            transformer.check_matrix(matrix)
+            return matrix
+
+        for name, body, decode, content_type in (
+                ('json', json_body, json_decode, 'application/json'),
+                ('binary', binary_body, binary_decode, 'application/x-float32')):
+            decode_time = time_per_call(decode, number)
+            predict_time = time_per_call(lambda: engine.predict(decode()), number)
+            http_time = time_per_call(lambda: client.post(endpoint, data=body, content_type=content_type),
+                                      max(5, number // 10))
+            print(f"{rows:>6} {name:>7} {len(body):>8} | {decode_time * 1e6:>11.1f} | "
+                  f"{predict_time * 1e6:>14.1f} | {http_time * 1e6:>10.1f}")
+
+    for app_patch in app_patches:
+        app_patch.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Profile: where serving time goes in /predict and /predict/batch.
+
+Sends requests through the Flask app (test client, so no network) and splits
+the mean time per request into the parse / scale / model / serialize stages
+recorded by the /metrics histograms, plus the remainder spent in Flask
+itself. Also compares building a 1000-row batch response the old way (a dict
+per prediction with float() conversions, then jsonify) with the NumPy-based
+row and columnar encoders.
+
+Usage: python benchmarks/bench_serving_profile.py [--requests 2000] [--batch 1000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import timeit
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Keep this run's metrics away from a running server's
+os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='bench-metrics-')
+
+import application
+from bench_request_formats import MODES, build_rows, build_engine, to_records
+from src.feature_transformer import FeatureTransformer, encode_feature_matrix
+from src.inference import InferenceEngine
+
+STAGES = application.STAGES
+
+
+def stage_sums():
+    totals, _ = application.metrics.collect()
+    sums = {}
+    for name, labels, value in application.STAGE_SECONDS.samples(totals):
+        if name.endswith('_sum'):
+            sums[labels['stage']] = value
+    return sums
+
+
+def profile(client, endpoint, body, content_type, n_requests):
+    # Leftovers of the previous scenario would be collected inside this one
+    gc.collect()
+    before = stage_sums()
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.post(endpoint, data=body, content_type=content_type)
+    elapsed = (time.perf_counter() - start) / n_requests
+    assert response.status_code == 200, response.data
+    after = stage_sums()
+    stages = {stage: (after[stage] - before[stage]) / n_requests for stage in STAGES}
+    return elapsed, stages
+
+
+def legacy_batch_body(row_indices, classes, probas):
+    results = []
+    for index, pred_class, pred_proba in zip(row_indices, classes, probas):
+        results.append({
+            "prediction": application.LABELS.get(pred_class, "Unknown"),
+            "confidence": float(max(pred_proba)),
+            "class": int(pred_class),
+            "probabilities": {application.LABELS[i]: float(p) for i, p in enumerate(pred_proba)},
+            "index": index,
+        })
+    return application.jsonify({"results": results}).get_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    X = build_rows(max(args.batch, 1000))
+    model, scaler = build_engine(X)
+    engine = InferenceEngine(model, scaler)
+    patches = [patch('application.model', model), patch('application.scaler', scaler),
+               patch('application.engine', engine),
+               patch('application.feature_transformer', FeatureTransformer({'Operation_Mode': MODES}))]
+    for app_patch in patches:
+        app_patch.start()
+    client = application.app.test_client()
+
+    batch = X[:args.batch]
+    scenarios = [
+        ("predict json", '/predict', json.dumps(to_records(X[:1])[0]), 'application/json', 1),
+        ("predict binary", '/predict', encode_feature_matrix(X[:1]), 'application/x-float32', 1),
+        ("batch json", '/predict/batch', json.dumps(to_records(batch)), 'application/json', len(batch)),
+        ("batch binary", '/predict/batch', encode_feature_matrix(batch), 'application/x-float32', len(batch)),
+        ("batch binary columnar", '/predict/batch?format=columnar', encode_feature_matrix(batch),
+         'application/x-float32', len(batch)),
+    ]
+
+    header = "".join(f"{stage:>11}" for stage in STAGES)
+    print(f"{'scenario':<22} {'total (us)':>11}{header}{'flask':>11}")
+    print("-" * (34 + 11 * (len(STAGES) + 1)))
+    for name, endpoint, body, content_type, rows in scenarios:
+        n_requests = max(20, args.requests // rows)
+        elapsed, stages = profile(client, endpoint, body, content_type, n_requests)
+        flask = elapsed - sum(stages.values())
+        cells = "".join(f"{stages[stage] * 1e6:>11.1f}" for stage in STAGES)
+        print(f"{name:<22} {elapsed * 1e6:>11.1f}{cells}{flask * 1e6:>11.1f}")
+
+    classes, probas = engine.predict(batch)
+    row_indices = list(range(len(batch)))
+    encoder = application.encoder
+    number = 20
+    with application.app.app_context():
+        legacy = min(timeit.repeat(lambda: legacy_batch_body(row_indices, classes, probas),
+                                   number=number, repeat=5)) / number
+    rows = min(timeit.repeat(lambda: application.dumps(encoder.rows(row_indices, classes, probas)),
+                             number=number, repeat=5)) / number
+    columnar = min(timeit.repeat(lambda: application.dumps(encoder.columnar(row_indices, classes, probas)),
+                                 number=number, repeat=5)) / number
+
+    print(f"\nEncoding {len(batch)} predictions:")
+    print(f"  dict per row + jsonify : {legacy * 1e3:8.2f} ms")
+    print(f"  ResponseEncoder rows   : {rows * 1e3:8.2f} ms ({legacy / rows:.1f}x)")
+    print(f"  ResponseEncoder columns: {columnar * 1e3:8.2f} ms ({legacy / columnar:.1f}x)")
+
+    for app_patch in patches:
+        app_patch.stop()
+
+
+if __name__ == "__main__":
+    main()
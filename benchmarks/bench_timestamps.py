@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: timestamp -> Year/Month/Day/Hour.
+
+Compares the previous pandas approach (pd.to_datetime plus four .dt passes)
+with the one-pass datetime64 decomposer, the fixed ISO string fast path and
+the per-request LRU cache used by serving, on timestamps clustered in time.
+
+Usage: python benchmarks/bench_timestamps.py [--rows 100000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.feature_transformer import (decompose_datetime64, decompose_timestamps, decompose_timestamp_cached,
+                                     timestamp_cache_info)
+
+
+def pandas_path(values):
+    timestamps = pd.to_datetime(pd.Series(values), errors='coerce')
+    return np.column_stack([timestamps.dt.year, timestamps.dt.month, timestamps.dt.day, timestamps.dt.hour])
+
+
+def cached_path(values):
+    return [decompose_timestamp_cached(value) for value in values]
+
+
+def time_per_call(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    # One reading per second over a day: heavy clustering within each hour
+    rng = np.random.RandomState(0)
+    offsets = np.sort(rng.randint(0, 24 * 3600, args.rows)).astype('timedelta64[s]')
+    datetimes = np.datetime64('2024-06-01T00:00:00') + offsets
+    strings = np.array([str(value).replace('T', ' ') for value in datetimes], dtype=object)
+
+    assert np.array_equal(pandas_path(strings), decompose_timestamps(strings))
+    assert np.array_equal(pandas_path(strings), np.array(cached_path(strings)))
+
+    cases = [
+        ("pandas to_datetime + .dt (strings)", lambda: pandas_path(strings)),
+        ("ISO fast path (strings)", lambda: decompose_timestamps(strings)),
+        ("datetime64 one-pass", lambda: decompose_datetime64(datetimes)),
+        ("serving LRU cache (per record)", lambda: cached_path(strings)),
+    ]
+    baseline = None
+    print(f"{args.rows} timestamps")
+    print(f"{'method':<36} | {'ms':>8} | {'ns/row':>7} | {'speedup':>7}")
+    print("-" * 68)
+    for name, func in cases:
+        seconds = time_per_call(func, number=3)
+        baseline = baseline or seconds
+        print(f"{name:<36} | {seconds * 1e3:>8.2f} | {seconds / args.rows * 1e9:>7.0f} | {baseline / seconds:>6.1f}x")
+
+    # Single-record latency, the /predict case
+    value = strings[len(strings) // 2]
+    single_pandas = time_per_call(lambda: pandas_path([value]), number=200)
+    single_cached = time_per_call(lambda: decompose_timestamp_cached(value), number=20000)
+    print(f"\nsingle record: pandas {single_pandas * 1e6:.1f} us, cached {single_cached * 1e6:.2f} us")
+    print(f"cache: {timestamp_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
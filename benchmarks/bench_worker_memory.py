@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: model memory across worker processes, private copies vs shared mmap.
+
+Starts N worker processes the way gunicorn would (each one loads the model
+itself) and sums their proportional set size (PSS) before and after the load.
+PSS splits shared pages between the processes mapping them, so the sum is
+the real memory cost of the fleet. Private loads grow linearly with the
+worker count; memory-mapped loads from one snapshot stay close to one copy.
+
+The default model is a HistGradientBoostingClassifier whose tree arrays are
+large enough to see the difference; the production LogisticRegression has a
+few hundred bytes of parameters. Pass --model to measure a real artifact.
+
+Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage: python benchmarks/bench_worker_memory.py [--workers 1 16] [--model path.pkl]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def pss_kb(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker(model_path, shared):
+    # Imports first, so the baseline measured by the parent excludes only the model
+    import sklearn.ensemble, sklearn.linear_model, sklearn.preprocessing  # noqa: F401
+    from src.shared_artifacts import load_shared
+    print("imported", flush=True)
+    sys.stdin.readline()
+    start = time.perf_counter()
+    model = load_shared(model_path) if shared else joblib.load(model_path)
+    print(f"loaded {time.perf_counter() - start:.4f}", flush=True)
+    sys.stdin.readline()
+    return model
+
+
+def build_model(path):
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    rng = np.random.RandomState(0)
+    X = rng.normal(size=(20000, 14))
+    y = (X[:, :3].sum(axis=1) * 2).astype(int) % 5
+    model = HistGradientBoostingClassifier(max_iter=300, max_leaf_nodes=255, early_stopping=False,
+                                           random_state=0).fit(X, y)
+    joblib.dump(model, path)
+
+
+def run_fleet(n_workers, model_path, shared):
+    procs = [subprocess.Popen([sys.executable, __file__, "--worker", model_path] + (["--shared"] if shared else []),
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for _ in range(n_workers)]
+    try:
+        for proc in procs:
+            proc.stdout.readline()
+        before = sum(pss_kb(proc.pid) for proc in procs)
+
+        for proc in procs:
+            proc.stdin.write("\n")
+            proc.stdin.flush()
+        load_seconds = [float(proc.stdout.readline().split()[1]) for proc in procs]
+        after = sum(pss_kb(proc.pid) for proc in procs)
+        return (after - before) / 1024, max(load_seconds)
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--model", help="Existing joblib model (default: build a synthetic one)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--shared", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.shared)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = args.model
+        if model_path is None:
+            model_path = os.path.join(tmp, "model.pkl")
+            build_model(model_path)
+        print(f"Model file: {os.path.getsize(model_path) / 2**20:.1f} MiB")
+        # Warm the page cache so neither mode pays for the first disk read
+        with open(model_path, "rb") as f:
+            while f.read(1 << 20):
+                pass
+
+        print(f"{'workers':>8} {'mode':>8} {'model PSS (MiB)':>16} {'per worker':>11} {'load (s)':>9}")
+        for n_workers in args.workers:
+            for shared in (False, True):
+                total, load_seconds = run_fleet(n_workers, model_path, shared)
+                print(f"{n_workers:>8} {'mmap' if shared else 'private':>8} {total:>16.1f} "
+                      f"{total / n_workers:>11.1f} {load_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
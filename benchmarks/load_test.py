@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Closed-loop load test comparing serving modes on /predict.
+
+Start the servers first, e.g.
+    gunicorn --bind 0.0.0.0:5000 --workers 4 application:app
+    uvicorn asgi_application:app --port 8000 --workers 4
+then
+    python benchmarks/load_test.py --target flask=http://localhost:5000 \\
+        --target asgi=http://localhost:8000 --concurrency 64 --duration 20
+
+Reports requests/sec, error count and p50/p99 latency per target.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+SAMPLE_RECORD = {
+    'Operation_Mode': 1, 'Temperature_C': 75.5, 'Vibration_Hz': 2.8,
+    'Power_Consumption_kW': 5.2, 'Network_Latency_ms': 15.3, 'Packet_Loss_%': 1.2,
+    'Quality_Control_Defect_Rate_%': 3.5, 'Production_Speed_units_per_hr': 350.0,
+    'Predictive_Maintenance_Score': 0.85, 'Error_Rate_%': 5.2,
+    'Year': 2024, 'Month': 1, 'Day': 1, 'Hour': 12
+}
+
+
+def client_loop(url, path, body, content_type, deadline, latencies, errors):
+    """One keep-alive client sending requests back to back until the deadline."""
+    parsed = urlparse(url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    headers = {"Content-Type": content_type}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except Exception as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_target(name, url, path, body, content_type, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client_loop, args=(url, path, body, content_type, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "target": name,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latency_ms, 50)),
+        "p99_ms": float(np.percentile(latency_ms, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the prediction endpoints")
+    parser.add_argument("--target", action="append", required=True,
+                        help="name=base_url, may be given several times")
+    parser.add_argument("--path", default="/predict")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="send JSON arrays of this size to /predict/batch instead of single records")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    path, payload = args.path, SAMPLE_RECORD
+    if args.batch_size:
+        path, payload = "/predict/batch", [SAMPLE_RECORD] * args.batch_size
+    body = json.dumps(payload).encode("utf-8")
+
+    print(f"{'target':>10} | {'requests':>8} | {'errors':>6} | {'req/s':>9} | {'p50 ms':>7} | {'p99 ms':>7}")
+    print("-" * 64)
+    for target in args.target:
+        name, url = target.split("=", 1)
+        result = run_target(name, url, path, body, "application/json", args.concurrency, args.duration)
+        print(f"{result['target']:>10} | {result['requests']:>8} | {result['errors']:>6} | "
+              f"{result['rps']:>9.1f} | {result['p50_ms']:>7.2f} | {result['p99_ms']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
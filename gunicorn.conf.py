@@ -0,0 +1,9 @@
+"""Gunicorn server hooks; worker count, bind address etc. come from the command line."""
+import os
+
+from src.metrics import DEFAULT_METRICS_DIR, clear_metrics_dir
+
+
+def on_starting(server):
+    # Counters from a previous run must not leak into this one's /metrics
+    clear_metrics_dir(os.environ.get('METRICS_DIR', DEFAULT_METRICS_DIR))
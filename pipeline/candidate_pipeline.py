@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import shutil
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import joblib
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from pipeline.dag import Stage, DagScheduler
+from src.data_processing import DataProcessing
+from src.processed_store import load_processed, MANIFEST_FILE
+
+CANDIDATE_MODELS = {
+    "logistic_regression": lambda: LogisticRegression(random_state=42, max_iter=1000),
+    "gradient_boosting": lambda: HistGradientBoostingClassifier(random_state=42),
+    "random_forest": lambda: RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=1),
+}
+
+# Share of the train split held out to compare candidates; the test split is only reported
+VALIDATION_SIZE = 0.2
+
+
+def process_data_stage(raw_data_path, processed_data_path):
+    processor = DataProcessing(raw_data_path, processed_data_path)
+    processor.run()
+
+
+def score(clf, X, y):
+    y_pred = clf.predict(X)
+    return {
+        "accuracy": float(accuracy_score(y, y_pred)),
+        "f1": float(f1_score(y, y_pred, average='weighted')),
+    }
+
+
+def train_candidate_stage(name, processed_data_path, candidates_path, validation_size=VALIDATION_SIZE):
+    """Fit one candidate on the shared processed split and record its validation and test metrics.
+
+    The validation metrics come from a fit on the train split minus a held-out
+    ``validation_size`` share and are what selection uses; the saved model is
+    then refitted on the whole train split and scored once on the test split.
+    """
+    X_train, X_test, y_train, y_test = load_processed(processed_data_path)
+    _, counts = np.unique(y_train, return_counts=True)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=validation_size, random_state=42,
+                                                  stratify=y_train if counts.min() >= 2 else None)
+    validation = score(CANDIDATE_MODELS[name]().fit(X_fit, y_fit), X_val, y_val)
+
+    clf = CANDIDATE_MODELS[name]()
+    clf.fit(X_train, y_train)
+    metrics = {"model": name, "validation": validation, "test": score(clf, X_test, y_test)}
+
+    os.makedirs(candidates_path, exist_ok=True)
+    joblib.dump(clf, os.path.join(candidates_path, f"{name}.pkl"))
+    with open(os.path.join(candidates_path, f"{name}.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+    return metrics
+
+
+def select_model_stage(names, candidates_path, model_output_path, metric="f1"):
+    """Copy the candidate with the best validation ``metric`` to ``best_model.pkl`` and write ``selection.json``."""
+    results = []
+    for name in names:
+        with open(os.path.join(candidates_path, f"{name}.json")) as f:
+            results.append(json.load(f))
+    best = max(results, key=lambda result: result["validation"][metric])
+
+    os.makedirs(model_output_path, exist_ok=True)
+    shutil.copy2(os.path.join(candidates_path, f"{best['model']}.pkl"),
+                 os.path.join(model_output_path, "best_model.pkl"))
+    with open(os.path.join(model_output_path, "selection.json"), "w") as f:
+        json.dump({"metric": metric, "best": best["model"], "candidates": results}, f, indent=2)
+    return best
+
+
+class CandidatePipeline:
+    """
+    Process the raw data once, train every candidate model on the same split
+    in parallel, then select the best one by its validation ``metric``.
+    """
+
+    def __init__(self, raw_data_path="artifacts/raw/manufacturing_6G_dataset.csv",
+                 processed_data_path="artifacts/processed/", model_output_path="artifacts/model/",
+                 candidates=None, metric="f1", max_workers=None):
+        self.raw_data_path = raw_data_path
+        self.processed_data_path = processed_data_path
+        self.model_output_path = model_output_path
+        self.candidates_path = os.path.join(model_output_path, "candidates")
+        self.candidates = candidates or list(CANDIDATE_MODELS)
+        self.metric = metric
+        self.max_workers = max_workers
+        self.scheduler = None
+
+    def build_stages(self):
+        manifest = os.path.join(self.processed_data_path, MANIFEST_FILE)
+        stages = [Stage("process_data", process_data_stage,
+                        inputs=[self.raw_data_path], outputs=[manifest],
+                        kwargs={"raw_data_path": self.raw_data_path,
+                                "processed_data_path": self.processed_data_path})]
+
+        candidate_outputs = []
+        for name in self.candidates:
+            output = os.path.join(self.candidates_path, f"{name}.json")
+            candidate_outputs.append(output)
+            stages.append(Stage(f"train_{name}", train_candidate_stage,
+                                inputs=[manifest], outputs=[output],
+                                kwargs={"name": name, "processed_data_path": self.processed_data_path,
+                                        "candidates_path": self.candidates_path}))
+
+        stages.append(Stage("select_model", select_model_stage,
+                            inputs=candidate_outputs,
+                            outputs=[os.path.join(self.model_output_path, "selection.json")],
+                            kwargs={"names": self.candidates, "candidates_path": self.candidates_path,
+                                    "model_output_path": self.model_output_path, "metric": self.metric}))
+        return stages
+
+    def run(self):
+        self.scheduler = DagScheduler(self.build_stages(), max_workers=self.max_workers)
+        results = self.scheduler.run()
+        self.scheduler.report()
+        best = results["select_model"]
+        print(f"\nBest model: {best['model']} (validation {self.metric}={best['validation'][self.metric]:.4f}, "
+              f"test {self.metric}={best['test'][self.metric]:.4f})")
+        return best
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train candidate models in parallel and select the best")
+    parser.add_argument("--candidates", nargs="+", choices=list(CANDIDATE_MODELS), default=None)
+    parser.add_argument("--metric", choices=["f1", "accuracy"], default="f1")
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    CandidatePipeline(candidates=args.candidates, metric=args.metric, max_workers=args.max_workers).run()
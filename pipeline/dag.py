@@ -0,0 +1,158 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+
+class Stage:
+    """
+    One unit of pipeline work.
+
+    ``func`` must be a module-level function so it can run in a worker
+    process; it is called with ``kwargs``. ``inputs`` and ``outputs`` are the
+    artifact paths the stage reads and writes, and define the DAG edges.
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), kwargs=None):
+        self.name = name
+        self.func = func
+        self.inputs = [os.path.normpath(path) for path in inputs]
+        self.outputs = [os.path.normpath(path) for path in outputs]
+        self.kwargs = kwargs or {}
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def timed_call(func, kwargs):
+    """Run a stage in its worker and time it there, so time spent queued for a worker is not counted."""
+    start = time.time()
+    result = func(**kwargs)
+    return result, start, time.time()
+
+
+class DagScheduler:
+    """
+    Runs stages as soon as the stages producing their inputs have finished,
+    with independent stages executing concurrently in a process pool.
+    """
+
+    def __init__(self, stages, max_workers=None, executor="process"):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise CustomException("Stage names must be unique", sys)
+        self.max_workers = max_workers or os.cpu_count()
+        self.executor = executor
+        self.dependencies = self.resolve_dependencies()
+        self.order = self.topological_order()
+        self.timings = {}
+        self.results = {}
+        self.wall_time = None
+
+    def resolve_dependencies(self):
+        """Map each stage to the stages producing the artifacts it reads."""
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise CustomException(f"Artifact {output} is produced by both "
+                                          f"{producers[output]} and {stage.name}", sys)
+                producers[output] = stage.name
+
+        dependencies = {}
+        for stage in self.stages.values():
+            dependencies[stage.name] = {producers[path] for path in stage.inputs if path in producers}
+            dependencies[stage.name].discard(stage.name)
+        return dependencies
+
+    def topological_order(self):
+        remaining = {name: set(deps) for name, deps in self.dependencies.items()}
+        order = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                raise CustomException(f"Dependency cycle between stages: {sorted(remaining)}", sys)
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _pool(self):
+        if self.executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def run(self):
+        """Execute every stage; returns a dict of stage results."""
+        self.timings, self.results = {}, {}
+        done, running = set(), {}
+        # Wall clock, because stage start/end are taken in the worker processes
+        start = time.time()
+
+        with self._pool() as pool:
+            while len(done) < len(self.stages):
+                for name in self.order:
+                    if name in done or name in running.values():
+                        continue
+                    if self.dependencies[name] <= done:
+                        stage = self.stages[name]
+                        logger.info(f"Submitting stage {name}")
+                        running[pool.submit(timed_call, stage.func, stage.kwargs)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.results[name], stage_start, stage_end = future.result()
+                    except Exception as e:
+                        for pending in running:
+                            pending.cancel()
+                        logger.error(f"Stage {name} failed: {e}")
+                        raise CustomException(f"Stage {name} failed: {e}", sys)
+                    timing = {"start": stage_start - start, "end": stage_end - start}
+                    timing["duration"] = timing["end"] - timing["start"]
+                    self.timings[name] = timing
+                    logger.info(f"Stage {name} finished in {timing['duration']:.2f}s")
+                    done.add(name)
+
+        self.wall_time = time.time() - start
+        return self.results
+
+    def critical_path(self):
+        """Longest chain of dependent stages by duration: (stage names, seconds)."""
+        finish, previous = {}, {}
+        for name in self.order:
+            duration = self.timings.get(name, {}).get("duration", 0.0)
+            best = max(self.dependencies[name], key=lambda dep: finish[dep], default=None)
+            finish[name] = duration + (finish[best] if best else 0.0)
+            previous[name] = best
+
+        name = max(finish, key=finish.get)
+        total, path = finish[name], []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
+
+    def report(self):
+        print(f"\n{'stage':<28} | {'start s':>8} | {'duration s':>10}")
+        print("-" * 52)
+        for name in sorted(self.timings, key=lambda n: self.timings[n]["start"]):
+            timing = self.timings[name]
+            print(f"{name:<28} | {timing['start']:>8.2f} | {timing['duration']:>10.2f}")
+
+        path, total = self.critical_path()
+        serial = sum(timing["duration"] for timing in self.timings.values())
+        print(f"\nCritical path: {' -> '.join(path)} ({total:.2f}s)")
+        print(f"Wall time: {self.wall_time:.2f}s (serial sum {serial:.2f}s)")
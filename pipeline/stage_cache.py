@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEY_MARKER = '.stage_key'
+META_FILE = 'meta.json'
+
+
+def file_fingerprint(path, hash_contents=False):
+    """Identify an input file by size + mtime, or by a content hash."""
+    if hash_contents:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def code_version(code_paths):
+    """Hash of the source files implementing a stage."""
+    digest = hashlib.sha256()
+    for path in sorted(code_paths):
+        with open(os.path.join(PROJECT_ROOT, path), 'rb') as f:
+            digest.update(path.encode())
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage outputs.
+
+    A stage's key hashes its input file, its parameters and the source of the
+    code that implements it. Outputs are copied into ``cache_dir/<key>/`` and
+    the least recently used entries are evicted once the cache exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir="artifacts/cache", max_bytes=2 * 1024 ** 3, hash_contents=False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, stage, input_path, params, code_paths):
+        payload = json.dumps({
+            "stage": stage,
+            "input": file_fingerprint(input_path, self.hash_contents),
+            "params": params,
+            "code": code_version(code_paths),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _read_meta(self, key):
+        with open(os.path.join(self.entry_path(key), META_FILE)) as f:
+            return json.load(f)
+
+    def _write_meta(self, key, meta):
+        with open(os.path.join(self.entry_path(key), META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def contains(self, key):
+        return os.path.exists(os.path.join(self.entry_path(key), META_FILE))
+
+    @staticmethod
+    def _file_stats(output_dir, files):
+        stats = {}
+        for name in files:
+            path = os.path.join(output_dir, name)
+            if not os.path.exists(path):
+                return None
+            stat = os.stat(path)
+            stats[name] = [stat.st_size, stat.st_mtime_ns]
+        return stats
+
+    def is_current(self, output_dir, key, files):
+        """True if ``output_dir`` still holds the untouched outputs for ``key``."""
+        marker = os.path.join(output_dir, KEY_MARKER)
+        if not os.path.exists(marker):
+            return False
+        with open(marker) as f:
+            recorded = json.load(f)
+        return recorded["key"] == key and recorded["files"] == self._file_stats(output_dir, files)
+
+    def mark(self, output_dir, key, files):
+        with open(os.path.join(output_dir, KEY_MARKER), 'w') as f:
+            json.dump({"key": key, "files": self._file_stats(output_dir, files)}, f)
+
+    def store(self, key, stage, output_dir, files):
+        """Copy a stage's output files into the cache."""
+        entry = self.entry_path(key)
+        tmp_entry = entry + '.tmp'
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+        size = 0
+        for name in files:
+            shutil.copy2(os.path.join(output_dir, name), os.path.join(tmp_entry, name))
+            size += os.path.getsize(os.path.join(tmp_entry, name))
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        now = time.time()
+        self._write_meta(key, {"stage": stage, "files": list(files), "size": size,
+                               "created": now, "last_used": now})
+        self.mark(output_dir, key, files)
+        self.evict()
+
+    def restore(self, key, output_dir):
+        """Copy cached outputs back into ``output_dir``; returns False on a miss."""
+        if not self.contains(key):
+            return False
+        meta = self._read_meta(key)
+        if not self.is_current(output_dir, key, meta["files"]):
+            os.makedirs(output_dir, exist_ok=True)
+            for name in meta["files"]:
+                shutil.copy2(os.path.join(self.entry_path(key), name), os.path.join(output_dir, name))
+            self.mark(output_dir, key, meta["files"])
+        meta["last_used"] = time.time()
+        self._write_meta(key, meta)
+        return True
+
+    def entries(self):
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            if self.contains(key):
+                entries.append((key, self._read_meta(key)))
+        return entries
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in ``max_bytes``."""
+        entries = sorted(self.entries(), key=lambda entry: entry[1]["last_used"])
+        total = sum(meta["size"] for _, meta in entries)
+        evicted = []
+        while entries and total > self.max_bytes:
+            key, meta = entries.pop(0)
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            total -= meta["size"]
+            evicted.append(key)
+        return evicted
@@ -1,9 +1,20 @@
 import os
 import sys
+import time
 import subprocess
 
+try:
+    from pipeline.stage_cache import StageCache
+except ImportError:
+    # Running as a script: pipeline/ itself is on sys.path
+    from stage_cache import StageCache
+
 logger = None
 
+# Source files whose changes invalidate cached data processing outputs
+DATA_PROCESSING_CODE = ['src/data_processing.py', 'src/processed_store.py', 'src/feature_transformer.py',
+                        'src/feature_schema.py', 'src/drift.py', 'src/prediction_log.py']
+
 def setup_imports():
     """Setup imports for the pipeline"""
     global logger
@@ -33,7 +44,7 @@ def setup_imports():
         return None, None, None, None
 
 def run_data_processing_directly():
-    """Run data processing using subprocess"""
+    """Run data processing in a separate interpreter (opt-in isolation)"""
     try:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(current_dir)
@@ -41,7 +52,7 @@ def run_data_processing_directly():
         
         print("Running data processing...")
         
-        python_exe = r"C:/Users/Harshini/OneDrive/Documents/Desktop/mlops/smart-manufacturing/.venv/Scripts/python.exe"
+        python_exe = sys.executable
         env = os.environ.copy()
         env['PYTHONPATH'] = project_root
         
@@ -59,7 +70,7 @@ def run_data_processing_directly():
         return False
 
 def run_model_training_directly():
-    """Run model training using subprocess"""
+    """Run model training in a separate interpreter (opt-in isolation)"""
     try:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(current_dir)
@@ -67,7 +78,7 @@ def run_model_training_directly():
         
         print("Running model training...")
         
-        python_exe = r"C:/Users/Harshini/OneDrive/Documents/Desktop/mlops/smart-manufacturing/.venv/Scripts/python.exe"
+        python_exe = sys.executable
         env = os.environ.copy()
         env['PYTHONPATH'] = project_root
         
@@ -86,13 +97,26 @@ def run_model_training_directly():
         return False
 
 class TrainingPipeline:
-    def __init__(self, raw_data_path=None, processed_data_path=None, model_output_path=None):
+    def __init__(self, raw_data_path=None, processed_data_path=None, model_output_path=None, use_subprocess=False,
+                 use_cache=True, force=False, cache_dir="artifacts/cache", cache_max_bytes=2 * 1024 ** 3,
+                 test_size=0.2, random_state=42, tune=False):
         """
-        Initialize the training pipeline with default paths if not provided
+        Initialize the training pipeline with default paths if not provided.
+        Stages run in-process unless use_subprocess is set; unchanged data
+        processing is served from the stage cache unless force is set.
+        With tune set, training runs the successive-halving hyperparameter search.
         """
         self.raw_data_path = raw_data_path or "artifacts/raw/manufacturing_6G_dataset.csv"
         self.processed_data_path = processed_data_path or "artifacts/processed/"
         self.model_output_path = model_output_path or "artifacts/model/"
+        self.use_subprocess = use_subprocess
+        self.use_cache = use_cache
+        self.force = force
+        self.test_size = test_size
+        self.random_state = random_state
+        self.tune = tune
+        self.cache = StageCache(cache_dir, cache_max_bytes) if use_cache else None
+        self.stage_timings = {}
         
         print(" Training Pipeline initialized")
         print(f" Raw data path: {self.raw_data_path}")
@@ -118,29 +142,96 @@ class TrainingPipeline:
             print(f" Path validation failed: {e}")
             return False
 
+    def run_stage(self, name, func, *args):
+        """
+        Run one stage and record its wall time
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.stage_timings[name] = time.perf_counter() - start
+            print(f"⏱️  {name}: {self.stage_timings[name]:.2f}s")
+
+    def data_processing_key(self):
+        """
+        Cache key of the data processing stage: raw input, parameters and code version
+        """
+        DataProcessing, _, _, _ = setup_imports()
+        from src.data_processing import FEATURES
+        params = {"features": FEATURES, "test_size": self.test_size,
+                  "random_state": self.random_state, "data_format": "npy"}
+        return self.cache.key("data_processing", self.raw_data_path, params, DATA_PROCESSING_CODE)
+
+    def process_data(self):
+        """
+        Data processing stage, returning the in-memory train/test splits,
+        or None when cached outputs were restored instead
+        """
+        DataProcessing, _, _, _ = setup_imports()
+        from src.data_processing import PROCESSED_OUTPUTS, OPTIONAL_PROCESSED_OUTPUTS
+
+        key = None
+        if self.cache is not None:
+            key = self.data_processing_key()
+            if not self.force and self.cache.restore(key, self.processed_data_path):
+                print(f"♻️  Data processing unchanged, reusing cached outputs ({key[:12]})")
+                return None
+
+        processor = DataProcessing(self.raw_data_path, self.processed_data_path,
+                                   test_size=self.test_size, random_state=self.random_state)
+        processor.load_data()
+        processor.preprocess_data()
+        data = processor.split_and_scale() + (processor.w_train,)
+
+        if key is not None:
+            optional = [name for name in OPTIONAL_PROCESSED_OUTPUTS['npy']
+                        if os.path.exists(os.path.join(self.processed_data_path, name))]
+            self.cache.store(key, "data_processing", self.processed_data_path, PROCESSED_OUTPUTS['npy'] + optional)
+        return data
+
+    def train_model(self, data=None):
+        """
+        Model training stage; reuses in-memory splits when given
+        """
+        _, ModelTraining, _, _ = setup_imports()
+        trainer = ModelTraining(self.processed_data_path, self.model_output_path)
+        trainer.run(data, tune=self.tune)
+        return trainer
+
     def run(self):
         """
         Run the complete training pipeline
         """
         try:
+            self.stage_timings = {}
             print("\n" + "=" * 60)
             print("🚀 STARTING COMPLETE TRAINING PIPELINE")
             print("=" * 60)
             
             # Step 1: Validate paths
             print("\n📋 Step 1: Validating paths...")
-            if not self.validate_paths():
+            if not self.run_stage("validate_paths", self.validate_paths):
                 raise Exception("Path validation failed")
             
-            # Step 2: Data processing
-            print("\n🔄 Step 2: Running data processing...")
-            if not run_data_processing_directly():
-                raise Exception("Data processing failed")
-            
-            # Step 3: Model training
-            print("\n🤖 Step 3: Running model training...")
-            if not run_model_training_directly():
-                raise Exception("Model training failed")
+            if self.use_subprocess:
+                # Step 2: Data processing
+                print("\n🔄 Step 2: Running data processing (subprocess)...")
+                if not self.run_stage("data_processing", run_data_processing_directly):
+                    raise Exception("Data processing failed")
+                
+                # Step 3: Model training
+                print("\n🤖 Step 3: Running model training (subprocess)...")
+                if not self.run_stage("model_training", run_model_training_directly):
+                    raise Exception("Model training failed")
+            else:
+                # Step 2: Data processing
+                print("\n🔄 Step 2: Running data processing...")
+                data = self.run_stage("data_processing", self.process_data)
+                
+                # Step 3: Model training on the splits already in memory
+                print("\n🤖 Step 3: Running model training...")
+                self.run_stage("model_training", self.train_model, data)
             
             print("\n" + "=" * 60)
             print("🎉 TRAINING PIPELINE COMPLETED SUCCESSFULLY!")
@@ -148,16 +239,81 @@ class TrainingPipeline:
             
             print(f"\n📁 Processed data saved to: {self.processed_data_path}")
             print(f"🤖 Model saved to: {self.model_output_path}")
+            print("⏱️  Stage timings: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.stage_timings.items()))
             print("📋 Check logs for detailed results")
             
+            return True
+            
         except Exception as e:
             print(f"\n❌ TRAINING PIPELINE FAILED: {e}")
             return False
 
+    def run_incremental(self):
+        """
+        Retrain only on raw rows newer than the last watermark.
+        Falls back to a full run (which records the watermark) when no
+        training state exists yet.
+        """
+        try:
+            setup_imports()
+            from src.incremental_retraining import IncrementalRetraining
+
+            print("\n" + "=" * 60)
+            print("🔁 STARTING INCREMENTAL TRAINING PIPELINE")
+            print("=" * 60)
+
+            if not self.validate_paths():
+                raise Exception("Path validation failed")
+
+            retrainer = IncrementalRetraining(self.raw_data_path, self.processed_data_path, self.model_output_path)
+            if not retrainer.has_state():
+                print("\nℹ️  No training state found, running full pipeline first...")
+                if not self.run():
+                    raise Exception("Full training run failed")
+                retrainer.initialize_state()
+                print(f"📌 Watermark recorded: {retrainer.state['watermark']}")
+                return True
+
+            new_rows = retrainer.run()
+            if new_rows:
+                print(f"\n🎉 Model updated with {new_rows} new rows (watermark: {retrainer.state['watermark']})")
+            else:
+                print("\n✅ No new rows since the last watermark, model unchanged")
+            return True
+
+        except Exception as e:
+            print(f"\n❌ INCREMENTAL TRAINING PIPELINE FAILED: {e}")
+            return False
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the training pipeline")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only train on raw rows newer than the last watermark")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="run each stage in its own Python interpreter")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the stage cache and rerun every stage")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="disable the stage cache")
+    parser.add_argument("--tune", action="store_true",
+                        help="successive-halving hyperparameter search during model training")
+    parser.add_argument("--cache-max-bytes", type=int, default=2 * 1024 ** 3,
+                        help="evict least recently used cache entries above this size")
+    args = parser.parse_args()
+
     training_pipeline = TrainingPipeline(
         raw_data_path="artifacts/raw/manufacturing_6G_dataset.csv",
         processed_data_path="artifacts/processed/",
-        model_output_path="artifacts/model/"
+        model_output_path="artifacts/model/",
+        use_subprocess=args.subprocess,
+        use_cache=not args.no_cache,
+        force=args.force,
+        cache_max_bytes=args.cache_max_bytes,
+        tune=args.tune
     )
-    training_pipeline.run()
\ No newline at end of file
+    if args.incremental:
+        training_pipeline.run_incremental()
+    else:
+        training_pipeline.run()
\ No newline at end of file
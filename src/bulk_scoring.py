@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from src.logger import get_logger
+from src.exception import CustomException
+from src.data_processing import TARGET, RAW_DTYPES, SHARD_DIR, SHARD_MANIFEST
+from src.feature_transformer import FeatureTransformer, FEATURE_TRANSFORMER_FILE
+from src.processed_store import has_manifest, load_manifest
+from src.inference import InferenceEngine
+
+logger = get_logger(__name__)
+
+PASSTHROUGH_COLUMNS = ['Timestamp', 'Machine_ID']
+
+# Per-process scoring state, set once by the pool initializer
+_engine = None
+_transformer = None
+
+
+def load_categories(processed_data_path):
+    """Label-encoding vocabularies recorded by data processing."""
+    candidates = []
+    if has_manifest(processed_data_path):
+        candidates.append(load_manifest(processed_data_path).get("categories"))
+    shard_manifest = os.path.join(processed_data_path, SHARD_DIR, SHARD_MANIFEST)
+    if os.path.exists(shard_manifest):
+        with open(shard_manifest) as f:
+            candidates.append(json.load(f).get("categories"))
+    for categories in candidates:
+        if categories:
+            return categories
+    raise CustomException(f"No category vocabularies found in {processed_data_path}; "
+                          f"re-run data processing before bulk scoring", sys)
+
+
+def load_feature_transformer(processed_data_path):
+    """The transformer saved by data processing, or one built from the recorded vocabularies."""
+    path = os.path.join(processed_data_path, FEATURE_TRANSFORMER_FILE)
+    if os.path.exists(path):
+        return FeatureTransformer.load(path)
+    return FeatureTransformer(load_categories(processed_data_path))
+
+
+def read_chunks(input_path, chunksize):
+    """Yield DataFrame chunks from a CSV or Parquet file."""
+    if input_path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CustomException("Parquet input requires pyarrow (pip install pyarrow)", sys)
+        for batch in pq.ParquetFile(input_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(input_path, dtype=RAW_DTYPES, chunksize=chunksize)
+
+
+def score_chunk(chunk, engine, transformer):
+    """Derive features for one raw chunk and score it.
+
+    Rows with an unknown Operation_Mode, an unparseable timestamp or missing
+    values are kept in the output with an empty prediction.
+    """
+    X = transformer.transform(chunk)
+    valid = np.isfinite(X).all(axis=1)
+
+    labels = transformer.categories.get(TARGET) or [str(i) for i in range(len(engine.classes_))]
+    out = chunk[[col for col in PASSTHROUGH_COLUMNS if col in chunk.columns]].reset_index(drop=True)
+    classes = np.full(len(chunk), -1, dtype=np.int64)
+    proba = np.full((len(chunk), len(engine.classes_)), np.nan)
+    if valid.any():
+        classes[valid], proba[valid] = engine.predict(X[valid])
+
+    out['prediction'] = np.where(valid, np.asarray(labels, dtype=object)[np.maximum(classes, 0)], '')
+    out['class'] = classes
+    out['confidence'] = proba.max(axis=1)
+    for i, label in enumerate(labels):
+        out[f'proba_{label}'] = proba[:, i]
+    return out
+
+
+def _init_worker(model_path, scaler_path, transformer):
+    global _engine, _transformer
+    _engine = InferenceEngine(joblib.load(model_path), joblib.load(scaler_path))
+    _transformer = transformer
+
+
+def _score_in_worker(chunk):
+    return score_chunk(chunk, _engine, _transformer)
+
+
+class OutputWriter:
+    """Appends scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.parquet = output_path.endswith('.parquet')
+        self.writer = None
+        self.started = False
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    def write(self, frame):
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise CustomException("Parquet output requires pyarrow (pip install pyarrow)", sys)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.output_path, table.schema)
+            self.writer.write_table(table)
+        else:
+            frame.to_csv(self.output_path, mode='a' if self.started else 'w', header=not self.started, index=False)
+        self.started = True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class BulkScorer:
+    """Score a whole raw CSV/Parquet file in streaming chunks.
+
+    Chunks are scored by ``n_jobs`` worker processes, each loading the model
+    and scaler once, with at most ``2 * n_jobs`` chunks in flight so memory
+    stays bounded. Output rows keep the input order.
+    """
+
+    def __init__(self, input_path, output_path, model_path='artifacts/model/logistic_regression_model.pkl',
+                 scaler_path='artifacts/processed/scaler.pkl', processed_data_path='artifacts/processed/',
+                 chunksize=100000, n_jobs=None):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.processed_data_path = processed_data_path
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.stats = {}
+
+    def _scored_chunks(self, transformer):
+        chunks = read_chunks(self.input_path, self.chunksize)
+        if self.n_jobs == 1:
+            engine = InferenceEngine(joblib.load(self.model_path), joblib.load(self.scaler_path))
+            for chunk in chunks:
+                yield score_chunk(chunk, engine, transformer)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                 initargs=(self.model_path, self.scaler_path, transformer)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_score_in_worker, chunk))
+                if len(pending) >= 2 * self.n_jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def run(self):
+        try:
+            transformer = load_feature_transformer(self.processed_data_path)
+            writer = OutputWriter(self.output_path)
+            start = time.perf_counter()
+            rows = failed = 0
+            try:
+                for scored in self._scored_chunks(transformer):
+                    writer.write(scored)
+                    rows += len(scored)
+                    failed += int((scored['class'] < 0).sum())
+            finally:
+                writer.close()
+
+            seconds = time.perf_counter() - start
+            self.stats = {"rows": rows, "failed": failed, "seconds": seconds,
+                          "rows_per_sec": rows / seconds if seconds else float('nan')}
+            logger.info(f"Bulk scoring finished: {rows} rows ({failed} unscorable) in {seconds:.2f}s "
+                        f"({self.stats['rows_per_sec']:.0f} rows/s)")
+            print(f"Scored {rows} rows ({failed} unscorable) in {seconds:.2f}s "
+                  f"-> {self.stats['rows_per_sec']:.0f} rows/s, written to {self.output_path}")
+            return self.stats
+        except Exception as e:
+            logger.error(f"Error during bulk scoring: {e}")
+            raise CustomException(f"Error during bulk scoring: {e}", sys)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a raw CSV/Parquet file with the trained model")
+    parser.add_argument("input", help="raw .csv or .parquet file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--model", default="artifacts/model/logistic_regression_model.pkl")
+    parser.add_argument("--scaler", default="artifacts/processed/scaler.pkl")
+    parser.add_argument("--processed", default="artifacts/processed/")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    BulkScorer(args.input, args.output, model_path=args.model, scaler_path=args.scaler,
+               processed_data_path=args.processed, chunksize=args.chunksize, n_jobs=args.jobs).run()
@@ -1,21 +1,100 @@
 import pandas as pd
 import numpy as np
 import joblib
+import json
 import os
 import sys
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from src.logger import get_logger
 from src.exception import CustomException
+from src.processed_store import save_processed
+from src.feature_transformer import (FeatureTransformer, FEATURES, TIME_FEATURES, FEATURE_TRANSFORMER_FILE,
+                                     decompose_timestamps)
+from src.feature_schema import FeatureSchema, FEATURE_SCHEMA_FILE
+from src.drift import DriftReference, DRIFT_REFERENCE_FILE
+from src.prediction_log import read_prediction_logs, SAMPLE_WEIGHT_COLUMN
 
 logger = get_logger(__name__)
 
+TARGET = 'Efficiency_Status'
+CATEGORICAL_COLUMNS = ['Operation_Mode', 'Efficiency_Status']
+
+# Explicit dtypes for chunked reads so every chunk parses identically
+RAW_DTYPES = {
+    'Timestamp': 'str',
+    'Machine_ID': 'str',
+    'Operation_Mode': 'str',
+    'Temperature_C': 'float64',
+    'Vibration_Hz': 'float64',
+    'Power_Consumption_kW': 'float64',
+    'Network_Latency_ms': 'float64',
+    'Packet_Loss_%': 'float64',
+    'Quality_Control_Defect_Rate_%': 'float64',
+    'Production_Speed_units_per_hr': 'float64',
+    'Predictive_Maintenance_Score': 'float64',
+    'Error_Rate_%': 'float64',
+    'Efficiency_Status': 'str',
+}
+PROCESSED_OUTPUTS = {
+    'npy': ['X_train.npy', 'X_test.npy', 'y_train.npy', 'y_test.npy', 'manifest.json', 'scaler.pkl',
+            FEATURE_TRANSFORMER_FILE, FEATURE_SCHEMA_FILE, DRIFT_REFERENCE_FILE],
+    'pickle': ['X_train.pkl', 'X_test.pkl', 'y_train.pkl', 'y_test.pkl', 'scaler.pkl', FEATURE_TRANSFORMER_FILE,
+               FEATURE_SCHEMA_FILE, DRIFT_REFERENCE_FILE],
+}
+# Written only when the input carries per-row weights (prediction logs)
+OPTIONAL_PROCESSED_OUTPUTS = {'npy': ['w_train.npy'], 'pickle': ['w_train.pkl']}
+SHARD_DIR = 'shards'
+SHARD_MANIFEST = 'manifest.json'
+
+
+def derive_time_features(df):
+    """Replace ``Timestamp`` with Year/Month/Day/Hour columns."""
+    parts = decompose_timestamps(df['Timestamp'].to_numpy())
+    for j, col in enumerate(TIME_FEATURES):
+        df[col] = parts[:, j]
+    return df
+
+
+def encode_categories(df, categories):
+    """Encode categorical columns with fixed, sorted vocabularies.
+
+    Produces the same codes a ``LabelEncoder`` fitted on the full column
+    would, so chunks encoded separately stay consistent. Missing values get
+    -1, as ``FeatureTransformer.encode_modes`` gives them on the in-memory path.
+    """
+    for col, vocabulary in categories.items():
+        codes = pd.Categorical(df[col].astype(str), categories=vocabulary).codes
+        unknown = (codes < 0) & df[col].notna().to_numpy()
+        if unknown.any():
+            raise ValueError(f"Unknown {col} values: {sorted(set(df[col][unknown].astype(str)))}")
+        df[col] = codes.astype(np.int64)
+    return df
+
+
+def drop_unlabelled(df):
+    """Drop rows without an Efficiency_Status; they cannot be trained on."""
+    labelled = df[TARGET].notna()
+    if labelled.all():
+        return df
+    logger.warning(f"Skipping {int((~labelled).sum())} rows without {TARGET}")
+    return df[labelled].reset_index(drop=True)
+
+
 class DataProcessing:
-    def __init__(self, input_path, output_path):
+    def __init__(self, input_path, output_path, data_format='npy', test_size=0.2, random_state=42,
+                 outcomes_path=None):
         self.input_path = input_path
+        self.outcomes_path = outcomes_path
         self.output_path = output_path
+        self.data_format = data_format
+        self.test_size = test_size
+        self.random_state = random_state
         self.df = None
         self.features = None
+        self.w_train = None
+        self.categories = None
+        self.feature_transformer = None
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
 
@@ -23,9 +102,13 @@ class DataProcessing:
         logger.info(f"Output directory set at: {self.output_path}")
 
     def load_data(self):
-        """Load data from CSV file."""
+        """Load data from a CSV file, or from a prediction log directory written by the serving app."""
         try:
-            self.df = pd.read_csv(self.input_path)
+            if os.path.isdir(self.input_path):
+                self.df = self.load_prediction_logs()
+            else:
+                # Categories as text, as the streaming path reads them, so a missing value cannot turn codes into floats
+                self.df = pd.read_csv(self.input_path, dtype={col: 'str' for col in CATEGORICAL_COLUMNS})
             logger.info(f"Data loaded from {self.input_path}")
             logger.info(f"Data shape: {self.df.shape}")
             return self.df
@@ -33,16 +116,22 @@ class DataProcessing:
             logger.error(f"Error loading data: {e}")
             raise CustomException(f"Error loading data: {e}", sys)
 
+    def load_prediction_logs(self):
+        """Logged predictions that have an observed outcome; the served predictions are never used as labels."""
+        df = read_prediction_logs(self.input_path, outcomes=self.outcomes_path)
+        labelled = df[TARGET].notna()
+        if not labelled.any():
+            raise ValueError(f"No logged prediction in {self.input_path} has an observed {TARGET}; "
+                             "pass outcomes keyed by Prediction_ID")
+        logger.info(f"Training on {int(labelled.sum())} of {len(df)} logged predictions (rows without "
+                    f"an outcome are skipped)")
+        return df[labelled].reset_index(drop=True)
+
     def preprocess_data(self):
         try:
-            # Convert timestamp to datetime
-            self.df['Timestamp'] = pd.to_datetime(self.df['Timestamp'], errors='coerce')
-            
+            self.df = drop_unlabelled(self.df)
             # Extract time features before dropping timestamp
-            self.df["Year"] = self.df['Timestamp'].dt.year
-            self.df["Month"] = self.df['Timestamp'].dt.month
-            self.df["Day"] = self.df['Timestamp'].dt.day
-            self.df["Hour"] = self.df['Timestamp'].dt.hour
+            self.df = derive_time_features(self.df)
             
             # Drop timestamp and machine_id
             self.df.drop(columns=['Timestamp', 'Machine_ID'], inplace=True)
@@ -52,11 +141,16 @@ class DataProcessing:
             for col in categorical_cols:
                 self.df[col] = self.df[col].astype('category')
             
-            # Encode categorical variables
-            columns_to_encode = ['Operation_Mode', 'Efficiency_Status']
-            for col in columns_to_encode:
-                le = LabelEncoder()
-                self.df[col] = le.fit_transform(self.df[col])
+            # Operation_Mode goes through the feature transformer shared with serving
+            self.feature_transformer = FeatureTransformer().fit(self.df)
+            self.df['Operation_Mode'] = self.feature_transformer.encode_modes(self.df['Operation_Mode'].to_numpy())
+
+            # Encode the target
+            le = LabelEncoder()
+            self.df['Efficiency_Status'] = le.fit_transform(self.df['Efficiency_Status'])
+            self.categories = dict(self.feature_transformer.categories,
+                                   Efficiency_Status=[str(value) for value in le.classes_])
+            self.feature_transformer.categories = self.categories
 
             logger.info("Data preprocessing completed.")
             return self.df
@@ -66,24 +160,43 @@ class DataProcessing:
         
     def split_and_scale(self):
         try:
-            self.features = [
-                'Operation_Mode', 'Temperature_C', 'Vibration_Hz',
-                'Power_Consumption_kW', 'Network_Latency_ms', 'Packet_Loss_%',
-                'Quality_Control_Defect_Rate_%', 'Production_Speed_units_per_hr',
-                'Predictive_Maintenance_Score', 'Error_Rate_%', 'Year', 'Month', 'Day', 'Hour'
-            ]
+            self.features = list(FEATURES)
             X = self.df[self.features]
             y = self.df['Efficiency_Status']
             scaler = StandardScaler()
             X_scaled = scaler.fit_transform(X)
-            X_train, X_test, y_train, y_test = train_test_split(
-                X_scaled, y, test_size=0.2, random_state=42
-            )
-            joblib.dump(X_train, os.path.join(self.output_path, 'X_train.pkl'))
-            joblib.dump(X_test, os.path.join(self.output_path, 'X_test.pkl'))
-            joblib.dump(y_train, os.path.join(self.output_path, 'y_train.pkl'))
-            joblib.dump(y_test, os.path.join(self.output_path, 'y_test.pkl'))
+            # Rows kept by the prediction logger's backpressure sampling carry 1 / sample rate
+            arrays = [X_scaled, y]
+            if SAMPLE_WEIGHT_COLUMN in self.df:
+                arrays.append(self.df[SAMPLE_WEIGHT_COLUMN].to_numpy(dtype=np.float64))
+            splits = train_test_split(*arrays, test_size=self.test_size, random_state=self.random_state)
+            X_train, X_test, y_train, y_test = splits[:4]
+            w_train = splits[4] if len(splits) > 4 else None
+            self.w_train = w_train
+            # Splits of the other format from an earlier run would shadow (or be shadowed by) these
+            other = 'pickle' if self.data_format == 'npy' else 'npy'
+            for name in PROCESSED_OUTPUTS[other] + OPTIONAL_PROCESSED_OUTPUTS[other]:
+                stale_path = os.path.join(self.output_path, name)
+                if name not in PROCESSED_OUTPUTS[self.data_format] and os.path.exists(stale_path):
+                    os.remove(stale_path)
+            if self.data_format == 'npy':
+                save_processed(self.output_path, X_train, X_test, y_train, y_test, self.features,
+                               categories=self.categories, sample_weight=w_train)
+            else:
+                joblib.dump(X_train, os.path.join(self.output_path, 'X_train.pkl'))
+                joblib.dump(X_test, os.path.join(self.output_path, 'X_test.pkl'))
+                joblib.dump(y_train, os.path.join(self.output_path, 'y_train.pkl'))
+                joblib.dump(y_test, os.path.join(self.output_path, 'y_test.pkl'))
+                weight_path = os.path.join(self.output_path, 'w_train.pkl')
+                if w_train is not None:
+                    joblib.dump(w_train, weight_path)
+                elif os.path.exists(weight_path):
+                    os.remove(weight_path)
             joblib.dump(scaler, os.path.join(self.output_path, 'scaler.pkl'))
+            if self.feature_transformer is not None:
+                self.feature_transformer.save(os.path.join(self.output_path, FEATURE_TRANSFORMER_FILE))
+            FeatureSchema.from_data(X, self.categories).save(os.path.join(self.output_path, FEATURE_SCHEMA_FILE))
+            DriftReference.from_sample(X).update(X).save(os.path.join(self.output_path, DRIFT_REFERENCE_FILE))
             
             logger.info("Data split into train and test sets and scaling applied.")
             return X_train, X_test, y_train, y_test
@@ -98,18 +211,124 @@ class DataProcessing:
         self.split_and_scale()
         logger.info("Data processing pipeline completed successfully.")
 
-if __name__ == "__main__":
-    processor = DataProcessing(
-        input_path='artifacts/raw/manufacturing_6G_dataset.csv',
-        output_path='artifacts/processed/'
-    )
-    processor.run()
+    def collect_categories(self, chunksize):
+        """First pass: collect the sorted vocabulary of each categorical column."""
+        try:
+            values = {col: set() for col in CATEGORICAL_COLUMNS}
+            reader = pd.read_csv(self.input_path, usecols=CATEGORICAL_COLUMNS,
+                                 dtype={col: 'str' for col in CATEGORICAL_COLUMNS}, chunksize=chunksize)
+            for chunk in reader:
+                for col in CATEGORICAL_COLUMNS:
+                    values[col].update(chunk[col].dropna().unique())
+            categories = {col: sorted(values[col]) for col in CATEGORICAL_COLUMNS}
+            logger.info(f"Categories collected: {categories}")
+            return categories
+        except Exception as e:
+            logger.error(f"Error collecting categories: {e}")
+            raise CustomException(f"Error collecting categories: {e}", sys)
 
+    def process_chunk(self, chunk, categories):
+        """Derive features for one raw chunk and return (X, y) arrays."""
+        chunk = derive_time_features(drop_unlabelled(chunk))
+        chunk = encode_categories(chunk, categories)
+        X = chunk[FEATURES].to_numpy(dtype=np.float64)
+        y = chunk[TARGET].to_numpy(dtype=np.int64)
+        return X, y
 
+    def run_streaming(self, chunksize=100000, test_size=None, random_state=None):
+        """Process the raw CSV in chunks with bounded memory.
 
+        Each chunk is feature-engineered and encoded on its own, the scaler is
+        fitted with ``partial_fit`` and rows are randomly assigned to train or
+        test shards under ``<output_path>/shards/``. A final pass scales the
+        shards in place with the fully fitted scaler. ``test_size`` and
+        ``random_state`` default to the processor's own.
+        """
+        test_size = self.test_size if test_size is None else test_size
+        random_state = self.random_state if random_state is None else random_state
+        try:
+            categories = self.collect_categories(chunksize)
+            shard_path = os.path.join(self.output_path, SHARD_DIR)
+            os.makedirs(shard_path, exist_ok=True)
 
+            scaler = StandardScaler()
+            rng = np.random.RandomState(random_state)
+            shards = []
+            minimum = np.full(len(FEATURES), np.inf)
+            maximum = np.full(len(FEATURES), -np.inf)
+            # Drift bins come from the first chunk; every chunk is counted into them
+            drift_reference = None
+            reader = pd.read_csv(self.input_path, dtype=RAW_DTYPES, chunksize=chunksize)
+            for chunk_index, chunk in enumerate(reader):
+                X, y = self.process_chunk(chunk, categories)
+                scaler.partial_fit(X)
+                minimum = np.fmin(minimum, np.nanmin(X, axis=0))
+                maximum = np.fmax(maximum, np.nanmax(X, axis=0))
+                if drift_reference is None:
+                    drift_reference = DriftReference.from_sample(X)
+                drift_reference.update(X)
 
+                is_test = rng.rand(len(X)) < test_size
+                for split, mask in (('train', ~is_test), ('test', is_test)):
+                    if not mask.any():
+                        continue
+                    name = f"{split}-{chunk_index:05d}"
+                    np.save(os.path.join(shard_path, f"{name}-X.npy"), X[mask])
+                    np.save(os.path.join(shard_path, f"{name}-y.npy"), y[mask])
+                    shards.append({"split": split, "X": f"{name}-X.npy", "y": f"{name}-y.npy",
+                                   "rows": int(mask.sum())})
+                logger.info(f"Processed chunk {chunk_index} ({len(X)} rows)")
 
+            for shard in shards:
+                X_path = os.path.join(shard_path, shard["X"])
+                np.save(X_path, scaler.transform(np.load(X_path)))
 
+            manifest = {
+                "features": FEATURES,
+                "target": TARGET,
+                "dtype": "float64",
+                "categories": categories,
+                "rows": {split: sum(s["rows"] for s in shards if s["split"] == split) for split in ('train', 'test')},
+                "shards": shards,
+            }
+            with open(os.path.join(shard_path, SHARD_MANIFEST), "w") as f:
+                json.dump(manifest, f, indent=2)
+            joblib.dump(scaler, os.path.join(self.output_path, 'scaler.pkl'))
+            self.feature_transformer = FeatureTransformer(categories)
+            self.feature_transformer.save(os.path.join(self.output_path, FEATURE_TRANSFORMER_FILE))
+            FeatureSchema.from_bounds(minimum, maximum, categories).save(
+                os.path.join(self.output_path, FEATURE_SCHEMA_FILE))
+            if drift_reference is not None:
+                drift_reference.save(os.path.join(self.output_path, DRIFT_REFERENCE_FILE))
 
+            self.scaler = scaler
+            logger.info(f"Streaming processing completed: {manifest['rows']} rows in {len(shards)} shards")
+            return manifest
+        except Exception as e:
+            logger.error(f"Error in streaming data processing: {e}")
+            raise CustomException(f"Error in streaming data processing: {e}", sys)
+
+if __name__ == "__main__":
+    import argparse
 
+    parser = argparse.ArgumentParser(description="Process the raw manufacturing dataset")
+    parser.add_argument("--input", default='artifacts/raw/manufacturing_6G_dataset.csv',
+                        help="raw CSV file, or a prediction log directory (artifacts/prediction_logs)")
+    parser.add_argument("--outcomes", default=None,
+                        help="CSV of Prediction_ID,Efficiency_Status observed outcomes for a prediction log input")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the CSV in chunks of this many rows and write shards")
+    parser.add_argument("--format", choices=["npy", "pickle"], default="npy",
+                        help="on-disk format of the processed train/test splits")
+    args = parser.parse_args()
+
+    processor = DataProcessing(
+        input_path=args.input,
+        outcomes_path=args.outcomes,
+        output_path='artifacts/processed/',
+        data_format=args.format
+    )
+    if args.chunksize:
+        processor.run_streaming(chunksize=args.chunksize)
+    else:
+        processor.run()
@@ -0,0 +1,288 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+from src.feature_transformer import FEATURES, TIME_FEATURES
+
+logger = get_logger(__name__)
+
+DRIFT_REFERENCE_FILE = 'drift_reference.json'
+# Calendar fields drift by definition, so only sensor readings and the mode are monitored
+DRIFT_FEATURES = [name for name in FEATURES if name not in TIME_FEATURES]
+DRIFT_BINS = 10
+# Conventional PSI thresholds: below 0.1 stable, above 0.25 a significant shift
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+_EPSILON = 1e-6
+
+
+def bin_edges(values, bins=DRIFT_BINS):
+    """Interior bin edges: midpoints for discrete columns, quantiles otherwise."""
+    values = values[np.isfinite(values)]
+    distinct = np.unique(values)
+    if len(distinct) <= bins:
+        return (distinct[:-1] + distinct[1:]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+
+
+def population_stability_index(expected, actual):
+    """PSI between two count histograms over the same bins."""
+    p = np.maximum(expected / max(expected.sum(), 1), _EPSILON)
+    q = np.maximum(actual / max(actual.sum(), 1), _EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def binned_ks(expected, actual):
+    """Kolmogorov-Smirnov statistic evaluated at the bin edges."""
+    p = np.cumsum(expected) / max(expected.sum(), 1)
+    q = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(p - q)))
+
+
+class DriftReference:
+    """Per-feature histograms of the training data, on bins fixed from a sample of it.
+
+    Every monitored feature's bins are laid out in one flat count array, so a
+    whole feature matrix is binned with one ``np.bincount``.
+    """
+
+    def __init__(self, edges, counts=None):
+        self.edges = {name: np.asarray(edges[name], dtype=np.float64) for name in DRIFT_FEATURES}
+        self._columns = [FEATURES.index(name) for name in DRIFT_FEATURES]
+        sizes = [len(self.edges[name]) + 1 for name in DRIFT_FEATURES]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.counts = np.zeros(self.offsets[-1]) if counts is None else np.asarray(counts, dtype=np.float64)
+
+    @classmethod
+    def from_sample(cls, X, bins=DRIFT_BINS):
+        """Bins from an unscaled feature matrix (all rows, or the first chunk when streaming)."""
+        X = np.asarray(X, dtype=np.float64)
+        return cls({name: bin_edges(X[:, FEATURES.index(name)], bins) for name in DRIFT_FEATURES})
+
+    @property
+    def rows(self):
+        return int(self.counts[:self.offsets[1]].sum())
+
+    def histogram(self, X):
+        """Flat per-feature bin counts of a feature matrix; non-finite values are skipped."""
+        X = np.asarray(X, dtype=np.float64)
+        indices = []
+        for j, (name, column) in enumerate(zip(DRIFT_FEATURES, self._columns)):
+            values = X[:, column]
+            values = values[np.isfinite(values)]
+            indices.append(np.searchsorted(self.edges[name], values, side='right') + self.offsets[j])
+        return np.bincount(np.concatenate(indices), minlength=len(self.counts)).astype(np.float64)
+
+    def update(self, X):
+        self.counts += self.histogram(X)
+        return self
+
+    def digest(self):
+        """Short content hash; workers only sum live counts taken against the same reference."""
+        content = np.concatenate([self.counts] + [self.edges[name] for name in DRIFT_FEATURES])
+        return hashlib.sha1(content.tobytes()).hexdigest()[:12]
+
+    def feature_counts(self, counts, j):
+        return counts[self.offsets[j]:self.offsets[j + 1]]
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "features": {name: {"edges": self.edges[name].tolist(),
+                                    "counts": self.feature_counts(self.counts, j).tolist()}
+                             for j, name in enumerate(DRIFT_FEATURES)},
+            }, f, indent=2)
+        logger.info(f"Drift reference saved to {path} ({self.rows} rows)")
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                features = json.load(f)["features"]
+            edges = {name: features[name]["edges"] for name in DRIFT_FEATURES}
+            counts = np.concatenate([features[name]["counts"] for name in DRIFT_FEATURES])
+            return cls(edges, counts)
+        except Exception as e:
+            logger.error(f"Error loading drift reference: {e}")
+            raise CustomException(f"Error loading drift reference: {e}", sys)
+
+
+class DriftMonitor:
+    """Live feature histograms compared with the training reference off the request path.
+
+    ``observe`` only appends the scored matrix to a queue bounded by
+    ``max_pending_rows`` (batches are dropped and counted when it is full). A background thread bins the queued
+    rows into fixed-size, exponentially decayed histograms and recomputes PSI
+    and KS for every feature each ``interval_seconds``; ``report`` returns the
+    latest result without computing anything.
+
+    Each process has its own monitor. With ``shared_dir`` every update also
+    writes this process's decayed counts to ``drift-<reference>-<pid>.npy``
+    there, and ``report`` sums the files of all workers on the same reference,
+    so ``/drift`` covers the whole server rather than the worker that answers.
+    """
+
+    def __init__(self, reference, interval_seconds=60.0, half_life_seconds=3600.0, min_rows=100,
+                 max_pending_rows=200000, shared_dir=None):
+        self.interval = interval_seconds
+        self.half_life = half_life_seconds
+        self.min_rows = min_rows
+        self.max_pending_rows = max_pending_rows
+        self.shared_dir = shared_dir
+
+        self._pending = deque()
+        # Approximate under concurrent observers, which is all the bound needs
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.dropped = 0
+        self.set_reference(reference)
+
+    def set_reference(self, reference):
+        """Compare against a new reference (e.g. after a model reload); live counts restart."""
+        with self._lock:
+            if self.shared_dir:
+                self._remove_shared()
+            self.reference = reference
+            self._digest = reference.digest()
+            self.live = np.zeros_like(reference.counts)
+            self._pending.clear()
+            self._pending_rows = 0
+            self._updated_at = time.time()
+            self._report = self._build_report(self.live, self._updated_at, self.dropped)
+
+    def observe(self, X):
+        if self._pending_rows >= self.max_pending_rows:
+            self.dropped += 1
+            return
+        self._pending_rows += len(X)
+        self._pending.append(X)
+
+    def update(self):
+        """Bin the queued rows, apply the decay and recompute the statistics."""
+        with self._lock:
+            now = time.time()
+            self.live *= 0.5 ** ((now - self._updated_at) / self.half_life)
+            self._updated_at = now
+            batches = []
+            while self._pending:
+                batches.append(self._pending.popleft())
+            self._pending_rows = 0
+            # One binning pass over everything queued; most batches are single rows
+            if batches:
+                self.live += self.reference.histogram(np.concatenate(batches))
+            if self.shared_dir:
+                self._write_shared()
+            self._report = self._build_report(self.live, self._updated_at, self.dropped)
+            return self._report
+
+    def _shared_path(self, pid, digest=None):
+        return os.path.join(self.shared_dir, f"drift-{digest or self._digest}-{pid}.npy")
+
+    def _write_shared(self):
+        """Publish this process's counts as [updated_at, dropped, counts...]."""
+        try:
+            os.makedirs(self.shared_dir, exist_ok=True)
+            path = self._shared_path(os.getpid())
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.concatenate([[self._updated_at, self.dropped], self.live]))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error writing shared drift counts: {e}")
+
+    def _remove_shared(self):
+        digest = getattr(self, '_digest', None)
+        if digest is not None:
+            try:
+                os.remove(self._shared_path(os.getpid(), digest))
+            except OSError:
+                pass
+
+    def shared_report(self):
+        """Report over the decayed counts of every worker that has published against this reference."""
+        with self._lock:
+            prefix, now = f"drift-{self._digest}-", time.time()
+            live, dropped, workers = np.zeros_like(self.reference.counts), 0, 0
+            try:
+                names = os.listdir(self.shared_dir)
+            except OSError:
+                names = []
+            for name in names:
+                if not (name.startswith(prefix) and name.endswith('.npy')):
+                    continue
+                try:
+                    values = np.load(os.path.join(self.shared_dir, name))
+                except (OSError, ValueError):
+                    continue
+                if len(values) != len(live) + 2:
+                    continue
+                live += values[2:] * 0.5 ** (max(now - values[0], 0.0) / self.half_life)
+                dropped += int(values[1])
+                workers += 1
+            if not workers:
+                return self._report
+            return self._build_report(live, now, dropped, workers)
+
+    def _build_report(self, live, updated_at, dropped, workers=1):
+        reference = self.reference
+        window_rows = float(live[:reference.offsets[1]].sum())
+        features, drifted = {}, []
+        for j, name in enumerate(DRIFT_FEATURES):
+            expected = reference.feature_counts(reference.counts, j)
+            actual = reference.feature_counts(live, j)
+            psi = population_stability_index(expected, actual)
+            if window_rows < self.min_rows:
+                status = "insufficient_data"
+            elif psi >= PSI_SIGNIFICANT:
+                status = "significant"
+                drifted.append(name)
+            elif psi >= PSI_MODERATE:
+                status = "moderate"
+            else:
+                status = "stable"
+            features[name] = {"psi": psi, "ks": binned_ks(expected, actual), "status": status}
+        return {
+            "reference_rows": reference.rows,
+            "window_rows": window_rows,
+            "half_life_seconds": self.half_life,
+            "updated_at": updated_at,
+            "dropped_batches": dropped,
+            "workers": workers,
+            "drifted": drifted,
+            "features": features,
+        }
+
+    def report(self):
+        if self.shared_dir:
+            return self.shared_report()
+        return self._report
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.update()
+                except Exception as e:
+                    logger.error(f"Error updating drift statistics: {e}")
+
+        self._thread = threading.Thread(target=run, name="drift-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Drift monitor started (interval {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
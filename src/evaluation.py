@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+METRICS_FILE = 'metrics.json'
+
+
+def confusion_counts(y_true, y_pred, labels):
+    """Confusion matrix in a single ``bincount`` pass; rows are true labels."""
+    labels = np.asarray(labels)
+    n = len(labels)
+    true_idx = np.searchsorted(labels, y_true)
+    pred_idx = np.searchsorted(labels, y_pred)
+    return np.bincount(true_idx * n + pred_idx, minlength=n * n).reshape(n, n)
+
+
+def metrics_from_confusion(cm):
+    """Accuracy and macro/weighted precision, recall and F1 from confusion matrices.
+
+    ``cm`` may be a single ``(n, n)`` matrix or a stack ``(..., n, n)``, so all
+    bootstrap resamples are scored at once.
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    total = support.sum(axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        denom = precision + recall
+        f1 = np.where(denom > 0, 2 * precision * recall / denom, 0.0)
+        weights = support / total[..., None]
+        accuracy = tp.sum(axis=-1) / total
+
+    return {
+        "accuracy": accuracy,
+        "precision_weighted": (precision * weights).sum(axis=-1),
+        "recall_weighted": (recall * weights).sum(axis=-1),
+        "f1_weighted": (f1 * weights).sum(axis=-1),
+        "precision_macro": precision.mean(axis=-1),
+        "recall_macro": recall.mean(axis=-1),
+        "f1_macro": f1.mean(axis=-1),
+    }, {"precision": precision, "recall": recall, "f1": f1, "support": support}
+
+
+class Evaluator:
+    """Accumulates one confusion matrix and derives every metric from it.
+
+    Batches or test shards are fed through ``update`` so the test set never
+    has to be in memory at once. Bootstrap confidence intervals resample the
+    accumulated confusion matrix: a row-level bootstrap of N rows is a
+    multinomial draw over its cells, so thousands of resamples cost
+    O(resamples x classes^2) instead of re-predicting anything.
+    """
+
+    def __init__(self, labels):
+        self.labels = np.asarray(labels)
+        self.cm = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+
+    def update(self, y_true, y_pred):
+        self.cm += confusion_counts(y_true, y_pred, self.labels)
+        return self
+
+    def evaluate_batches(self, clf, batches, n_jobs=1):
+        """Predict and accumulate ``(X, y)`` batches, ``n_jobs`` at a time."""
+        def score(batch):
+            X, y = batch
+            return confusion_counts(y, clf.predict(X), self.labels)
+
+        if n_jobs == 1:
+            for batch in batches:
+                self.cm += score(batch)
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                for cm in pool.map(score, batches):
+                    self.cm += cm
+        return self
+
+    @property
+    def n_samples(self):
+        return int(self.cm.sum())
+
+    def metrics(self):
+        overall, per_class = metrics_from_confusion(self.cm)
+        return ({name: float(value) for name, value in overall.items()},
+                {name: values.tolist() for name, values in per_class.items()})
+
+    def bootstrap(self, n_resamples=1000, confidence=0.95, random_state=42):
+        """Percentile confidence interval for every overall metric."""
+        if self.n_samples == 0:
+            return {}
+        rng = np.random.default_rng(random_state)
+        resampled = rng.multinomial(self.n_samples, self.cm.ravel() / self.n_samples, size=n_resamples)
+        overall, _ = metrics_from_confusion(resampled.reshape(n_resamples, *self.cm.shape))
+        tail = (1 - confidence) / 2 * 100
+        return {name: [float(bound) for bound in np.nanpercentile(values, [tail, 100 - tail])]
+                for name, values in overall.items()}
+
+    def report(self, n_resamples=1000, confidence=0.95, random_state=42):
+        overall, per_class = self.metrics()
+        return {
+            "n_samples": self.n_samples,
+            "labels": self.labels.tolist(),
+            "metrics": overall,
+            "per_class": per_class,
+            "confusion_matrix": self.cm.tolist(),
+            "confidence": confidence,
+            "n_resamples": n_resamples,
+            "confidence_intervals": self.bootstrap(n_resamples, confidence, random_state),
+        }
+
+
+def format_report(report):
+    """Plain-text per-class table in the style of sklearn's classification report."""
+    lines = [f"{'':>12} {'precision':>10} {'recall':>10} {'f1-score':>10} {'support':>10}"]
+    per_class = report["per_class"]
+    for i, label in enumerate(report["labels"]):
+        lines.append(f"{label!s:>12} {per_class['precision'][i]:>10.2f} {per_class['recall'][i]:>10.2f} "
+                     f"{per_class['f1'][i]:>10.2f} {int(per_class['support'][i]):>10}")
+    metrics = report["metrics"]
+    lines.append(f"{'accuracy':>12} {'':>10} {'':>10} {metrics['accuracy']:>10.2f} {report['n_samples']:>10}")
+    lines.append(f"{'macro avg':>12} {metrics['precision_macro']:>10.2f} {metrics['recall_macro']:>10.2f} "
+                 f"{metrics['f1_macro']:>10.2f} {report['n_samples']:>10}")
+    lines.append(f"{'weighted avg':>12} {metrics['precision_weighted']:>10.2f} {metrics['recall_weighted']:>10.2f} "
+                 f"{metrics['f1_weighted']:>10.2f} {report['n_samples']:>10}")
+    return "\n".join(lines)
+
+
+def save_metrics(report, output_path, model_name=None):
+    """Write ``metrics.json`` next to the model so retrain jobs can compare without re-scoring."""
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        path = os.path.join(output_path, METRICS_FILE)
+        payload = dict(report, model=model_name, created=time.time())
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"Metrics written to {path}")
+        return path
+    except Exception as e:
+        logger.error(f"Error writing metrics: {e}")
+        raise CustomException(f"Error writing metrics: {e}", sys)
+
+
+def load_metrics(output_path):
+    with open(os.path.join(output_path, METRICS_FILE)) as f:
+        return json.load(f)
@@ -0,0 +1,127 @@
+import sys
+import json
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+from src.feature_transformer import FEATURES, MODE_COLUMN
+
+logger = get_logger(__name__)
+
+FEATURE_SCHEMA_FILE = 'feature_schema.json'
+# Numeric ranges are the training min/max widened by this fraction of the span
+RANGE_MARGIN = 0.1
+# Calendar fields have fixed bounds, so serving is not limited to the training period
+TIME_BOUNDS = {'Year': (1970, 2100), 'Month': (1, 12), 'Day': (1, 31), 'Hour': (0, 23)}
+
+
+class FeatureSchema:
+    """Allowed values of every model feature, compiled for whole-batch validation.
+
+    Each feature has a dtype (``float``, ``integer`` or ``category``) and a
+    closed range. Numeric ranges come from the training data (widened by
+    ``RANGE_MARGIN``), calendar fields have fixed bounds and ``Operation_Mode``
+    must be one of the training codes. ``validate`` checks a feature matrix
+    in a single NumPy pass and only builds error messages for rejected rows.
+    """
+
+    def __init__(self, fields, range_margin=RANGE_MARGIN):
+        self.fields = [dict(field) for field in fields]
+        self.range_margin = range_margin
+        self._compile()
+
+    def _compile(self):
+        names = [field["name"] for field in self.fields]
+        if names != FEATURES:
+            raise CustomException(f"Feature schema does not match the model features: {names}", sys)
+        self.lower = np.array([field["min"] for field in self.fields], dtype=np.float64)
+        self.upper = np.array([field["max"] for field in self.fields], dtype=np.float64)
+        self.integer = np.array([field["dtype"] in ("integer", "category") for field in self.fields])
+        self.category = np.array([field["dtype"] == "category" for field in self.fields])
+
+    @classmethod
+    def from_data(cls, X, categories=None, range_margin=RANGE_MARGIN):
+        """Schema for an unscaled (n, len(FEATURES)) training matrix."""
+        X = np.asarray(X, dtype=np.float64)
+        return cls.from_bounds(np.nanmin(X, axis=0), np.nanmax(X, axis=0), categories, range_margin)
+
+    @classmethod
+    def from_bounds(cls, minimum, maximum, categories=None, range_margin=RANGE_MARGIN):
+        """Schema from per-feature training minima and maxima (e.g. accumulated over chunks)."""
+        modes = (categories or {}).get(MODE_COLUMN)
+        fields = []
+        for name, low, high in zip(FEATURES, minimum, maximum):
+            if name == MODE_COLUMN:
+                count = len(modes) if modes else int(high) + 1
+                field = {"name": name, "dtype": "category", "min": 0, "max": count - 1}
+                if modes:
+                    field["labels"] = list(modes)
+            elif name in TIME_BOUNDS:
+                low, high = TIME_BOUNDS[name]
+                field = {"name": name, "dtype": "integer", "min": low, "max": high}
+            else:
+                pad = range_margin * (float(high) - float(low))
+                field = {"name": name, "dtype": "float", "min": float(low) - pad, "max": float(high) + pad}
+            fields.append(field)
+        return cls(fields, range_margin)
+
+    def bounds(self):
+        """Per-feature minima and maxima before widening, the inverse of ``from_bounds``."""
+        pad = self.range_margin * (self.upper - self.lower) / (1 + 2 * self.range_margin)
+        return np.where(self.integer, self.lower, self.lower + pad), np.where(self.integer, self.upper, self.upper - pad)
+
+    def extended(self, X):
+        """Schema whose numeric ranges also cover an unscaled feature matrix; codes are unchanged."""
+        X = np.asarray(X, dtype=np.float64)
+        minimum, maximum = self.bounds()
+        labels = self.fields[FEATURES.index(MODE_COLUMN)].get("labels")
+        return FeatureSchema.from_bounds(np.fmin(minimum, np.nanmin(X, axis=0)), np.fmax(maximum, np.nanmax(X, axis=0)),
+                                         {MODE_COLUMN: labels} if labels else None, self.range_margin)
+
+    def field_error(self, j, value):
+        field = self.fields[j]
+        if not np.isfinite(value):
+            return "must be a finite number"
+        if self.category[j]:
+            return f"unknown code {value:g}"
+        if self.integer[j] and value != np.floor(value):
+            return "must be an integer"
+        if value < self.lower[j]:
+            return f"below minimum {field['min']:g}"
+        return f"above maximum {field['max']:g}"
+
+    def validate(self, X):
+        """Check every row of a feature matrix.
+
+        Returns (row_indices, errors): the rows that pass, and for each rejected
+        row ``{"index", "error", "fields"}`` with the reason for every bad field.
+        """
+        X = np.asarray(X)
+        with np.errstate(invalid='ignore'):
+            invalid = ~np.isfinite(X) | (X < self.lower) | (X > self.upper)
+            invalid |= self.integer & (X != np.floor(X))
+        bad = invalid.any(axis=1)
+
+        errors = []
+        for i in np.flatnonzero(bad):
+            fields = {self.fields[j]["name"]: self.field_error(j, X[i, j]) for j in np.flatnonzero(invalid[i])}
+            message = "Invalid features: " + "; ".join(f"{name} {reason}" for name, reason in fields.items())
+            errors.append({"index": int(i), "error": message, "fields": fields})
+        return np.flatnonzero(~bad).tolist(), errors
+
+    def to_dict(self):
+        return {"range_margin": self.range_margin, "features": self.fields}
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        logger.info(f"Feature schema saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                schema = json.load(f)
+            return cls(schema["features"], schema.get("range_margin", RANGE_MARGIN))
+        except Exception as e:
+            logger.error(f"Error loading feature schema: {e}")
+            raise CustomException(f"Error loading feature schema: {e}", sys)
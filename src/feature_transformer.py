@@ -0,0 +1,348 @@
+import os
+import sys
+import joblib
+import warnings
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+FEATURES = [
+    'Operation_Mode', 'Temperature_C', 'Vibration_Hz',
+    'Power_Consumption_kW', 'Network_Latency_ms', 'Packet_Loss_%',
+    'Quality_Control_Defect_Rate_%', 'Production_Speed_units_per_hr',
+    'Predictive_Maintenance_Score', 'Error_Rate_%', 'Year', 'Month', 'Day', 'Hour'
+]
+TIME_FEATURES = ['Year', 'Month', 'Day', 'Hour']
+MODE_COLUMN = 'Operation_Mode'
+TIMESTAMP_COLUMN = 'Timestamp'
+FEATURE_TRANSFORMER_FILE = 'feature_transformer.pkl'
+# Binary requests: little-endian float32 rows in FEATURES order, modes as integer codes
+BINARY_MIMETYPES = ('application/x-float32', 'application/octet-stream')
+BINARY_DTYPE = np.dtype('<f4')
+
+_TIME_INDEX = [FEATURES.index(name) for name in TIME_FEATURES]
+_MODE_INDEX = FEATURES.index(MODE_COLUMN)
+
+# Distinct hours kept by the serving-side timestamp cache
+TIMESTAMP_CACHE_SIZE = int(os.environ.get('TIMESTAMP_CACHE_SIZE', 4096))
+# Characters of "YYYY-MM-DD HH" that determine every time feature
+_ISO_HOUR_WIDTH = 13
+_ISO_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12]
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def decompose_datetime64(values):
+    """Year/Month/Day/Hour of a datetime64 array in one pass, NaN for NaT."""
+    values = np.asarray(values, dtype='datetime64[s]')
+    months = values.astype('datetime64[M]')
+    days = values.astype('datetime64[D]')
+    parts = np.column_stack([
+        values.astype('datetime64[Y]').astype(np.int64) + 1970,
+        months.astype(np.int64) % 12 + 1,
+        (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+        (values - days).astype('timedelta64[h]').astype(np.int64),
+    ]).astype(np.float64)
+    parts[np.isnat(values)] = np.nan
+    return parts
+
+
+def parse_iso_hours(values):
+    """Fast path for fixed-format ISO strings ("YYYY-MM-DD HH..." or "YYYY-MM-DDTHH...").
+
+    Reads the digits straight from the code points of a fixed-width string
+    array. Returns (parts, ok); rows that are not ISO-shaped or not a valid
+    calendar date are left for the slower parser. Minutes and seconds do not
+    affect any feature and are not inspected.
+    """
+    n = len(values)
+    try:
+        strings = np.asarray(values, dtype=f'U{_ISO_HOUR_WIDTH}')
+    except (TypeError, ValueError):
+        return np.full((n, len(TIME_FEATURES)), np.nan), np.zeros(n, dtype=bool)
+
+    chars = strings.view(np.uint32).reshape(n, _ISO_HOUR_WIDTH)
+    ok = (chars < 128).all(axis=1)
+    chars = chars.astype(np.uint8)
+    # Non-digits wrap around to values above 9
+    digits = chars[:, _ISO_DIGITS] - np.uint8(ord('0'))
+    ok &= (digits <= 9).all(axis=1)
+    ok &= (chars[:, 4] == ord('-')) & (chars[:, 7] == ord('-'))
+    ok &= (chars[:, 10] == ord(' ')) | (chars[:, 10] == ord('T'))
+
+    digits = digits.astype(np.int16)
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    hour = digits[:, 8] * 10 + digits[:, 9]
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (hour <= 23)
+
+    # Reject impossible dates such as Feb 30
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    ok &= day <= _DAYS_IN_MONTH[np.clip(month - 1, 0, 11)] + (leap & (month == 2))
+
+    parts = np.column_stack([year, month, day, hour]).astype(np.float64)
+    parts[~ok] = np.nan
+    return parts, ok
+
+
+def _parse_with_pandas(values):
+    with warnings.catch_warnings():
+        # Mixed or unusual formats fall back to per-element parsing; that is expected here
+        warnings.simplefilter('ignore', UserWarning)
+        timestamps = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce')
+    if getattr(timestamps.dt, 'tz', None) is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return decompose_datetime64(timestamps.to_numpy(dtype='datetime64[ns]'))
+
+
+def object_column(values):
+    """1-D object array holding each element as is, even when elements are lists or arrays."""
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def decompose_timestamps(values):
+    """Year/Month/Day/Hour of each timestamp as an (n, 4) float array, NaN if unparseable.
+
+    datetime64 input is decomposed directly; strings take the ISO fast path
+    and only the rows it cannot read are handed to ``pd.to_datetime``.
+    """
+    try:
+        values = np.asarray(values)
+    except ValueError:
+        values = object_column(values)
+    if values.ndim != 1:
+        # Array-valued elements (e.g. a JSON list) would add a dimension; parsing leaves them NaN
+        values = object_column(list(values))
+    if values.dtype.kind == 'M':
+        return decompose_datetime64(values)
+    values = values.astype(object)
+    parts, ok = parse_iso_hours(values)
+    if not ok.all():
+        parts[~ok] = _parse_with_pandas(values[~ok])
+    return parts
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _decompose_hour(key):
+    return tuple(decompose_timestamps([key])[0])
+
+
+def decompose_timestamp_cached(value):
+    """Year/Month/Day/Hour of one request timestamp through an LRU cache.
+
+    ISO strings are keyed on their hour-truncated prefix, since readings
+    cluster in time and the features do not depend on minutes or seconds.
+    """
+    if isinstance(value, str):
+        if len(value) >= _ISO_HOUR_WIDTH and value[10] in ' T':
+            value = f"{value[:10]} {value[11:_ISO_HOUR_WIDTH]}"
+        return _decompose_hour(value)
+    return tuple(decompose_timestamps([value])[0])
+
+
+def timestamp_cache_info():
+    info = _decompose_hour.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+def binary_body_error(body):
+    """Why a binary request body cannot be decoded, or None if it can."""
+    row_bytes = BINARY_DTYPE.itemsize * len(FEATURES)
+    if not body or len(body) % row_bytes:
+        return (f"Binary body must be a non-empty multiple of {row_bytes} bytes "
+                f"({len(FEATURES)} little-endian float32 per row)")
+    return None
+
+
+def decode_feature_matrix(body):
+    """(n, len(FEATURES)) float32 view over a binary request body; the bytes are not copied."""
+    error = binary_body_error(body)
+    if error is not None:
+        raise ValueError(error)
+    return np.frombuffer(body, dtype=BINARY_DTYPE).reshape(-1, len(FEATURES))
+
+
+def encode_feature_matrix(X):
+    """Binary request body for a feature matrix (client side of ``decode_feature_matrix``)."""
+    return np.ascontiguousarray(X, dtype=BINARY_DTYPE).tobytes()
+
+
+def _scalar_float(value):
+    if np.ndim(value) != 0:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_float(values):
+    """Convert a column to float64; returns (floats, ok) where ok marks finite numeric values.
+
+    Elements that are not numeric scalars (strings that do not parse, lists,
+    objects) become NaN, so they fail ``ok`` instead of raising.
+    """
+    try:
+        floats = np.asarray(values, dtype=np.float64)
+        if floats.ndim != 1:
+            raise ValueError("array-valued element")
+    except (TypeError, ValueError):
+        floats = np.array([_scalar_float(value) for value in values], dtype=np.float64)
+    return floats, np.isfinite(floats)
+
+
+class FeatureTransformer:
+    """Raw record fields -> model feature matrix, shared by training and serving.
+
+    Accepts either a raw ``Timestamp`` or pre-split Year/Month/Day/Hour, and
+    either the raw ``Operation_Mode`` string or its integer code. Modes are
+    encoded through a lookup table over the sorted training vocabulary (the
+    codes a ``LabelEncoder`` would give), and every column is converted in one
+    vectorized pass.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = dict(categories or {})
+        self._build_lookup()
+
+    def _build_lookup(self):
+        vocabulary = self.categories.get(MODE_COLUMN)
+        self._mode_index = pd.Index(vocabulary) if vocabulary else None
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_lookup()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_mode_index', None)
+        return state
+
+    def fit(self, df):
+        """Learn the sorted Operation_Mode vocabulary."""
+        self.categories[MODE_COLUMN] = sorted(df[MODE_COLUMN].dropna().astype(str).unique())
+        self._build_lookup()
+        return self
+
+    def encode_modes(self, values):
+        """Integer mode codes; -1 for values outside the vocabulary."""
+        values = pd.Series(values, dtype=object)
+        floats, numeric = to_float(values)
+        if self._mode_index is None:
+            return np.where(numeric, floats, -1).astype(np.int64)
+
+        codes = self._mode_index.get_indexer(values.astype(str))
+        # Already-encoded integer codes are accepted as well
+        legacy = (codes < 0) & numeric
+        legacy &= (floats == np.round(floats)) & (floats >= 0) & (floats < len(self._mode_index))
+        codes[legacy] = floats[legacy].astype(np.int64)
+        return codes.astype(np.int64)
+
+    def transform(self, df):
+        """Feature matrix for a DataFrame; unusable values (e.g. unknown modes) become NaN."""
+        try:
+            X = np.empty((len(df), len(FEATURES)), dtype=np.float64)
+            for j, name in enumerate(FEATURES):
+                if name == MODE_COLUMN or name in TIME_FEATURES:
+                    continue
+                X[:, j] = to_float(df[name].to_numpy())[0]
+
+            if all(name in df.columns for name in TIME_FEATURES):
+                X[:, _TIME_INDEX] = df[TIME_FEATURES].to_numpy(dtype=np.float64)
+            else:
+                X[:, _TIME_INDEX] = decompose_timestamps(df[TIMESTAMP_COLUMN].to_numpy())
+
+            codes = self.encode_modes(df[MODE_COLUMN].to_numpy())
+            X[:, _MODE_INDEX] = np.where(codes >= 0, codes, np.nan)
+            return X
+        except Exception as e:
+            logger.error(f"Error transforming features: {e}")
+            raise CustomException(f"Error transforming features: {e}", sys)
+
+    def transform_records(self, records):
+        """Feature matrix for a list of request records.
+
+        Returns (matrix, row_indices, errors): one matrix row per valid record,
+        ``row_indices`` mapping rows back to ``records`` and a per-row error for
+        every record that could not be encoded.
+        """
+        n = len(records)
+        X = np.empty((n, len(FEATURES)), dtype=np.float64)
+        problems = [None] * n
+        missing = [[] for _ in range(n)]
+
+        has_parts = np.array([all(name in record for name in TIME_FEATURES) for record in records], dtype=bool)
+        has_timestamp = np.array([TIMESTAMP_COLUMN in record for record in records], dtype=bool) & ~has_parts
+
+        for j, name in enumerate(FEATURES):
+            if name in TIME_FEATURES:
+                continue
+            present = np.array([name in record for record in records], dtype=bool)
+            column = [record.get(name) for record in records]
+            if name == MODE_COLUMN:
+                codes = self.encode_modes(column)
+                X[:, j], ok = codes, codes >= 0
+                message = "Unknown Operation_Mode"
+            else:
+                X[:, j], ok = to_float(column)
+                message = "Feature values must be numeric"
+            for i in np.flatnonzero(~present):
+                missing[i].append(name)
+            for i in np.flatnonzero(present & ~ok):
+                problems[i] = problems[i] or message
+
+        if has_parts.any():
+            rows = np.flatnonzero(has_parts)
+            valid = np.ones(len(rows), dtype=bool)
+            for name, j in zip(TIME_FEATURES, _TIME_INDEX):
+                X[rows, j], ok = to_float([records[i][name] for i in rows])
+                valid &= ok
+            for i in rows[~valid]:
+                problems[i] = problems[i] or "Feature values must be numeric"
+        if has_timestamp.any():
+            rows = np.flatnonzero(has_timestamp)
+            parts = np.array([decompose_timestamp_cached(records[i][TIMESTAMP_COLUMN]) for i in rows],
+                             dtype=np.float64).reshape(-1, len(TIME_FEATURES))
+            X[np.ix_(rows, _TIME_INDEX)] = parts
+            for i in rows[np.isnan(parts).any(axis=1)]:
+                problems[i] = problems[i] or "Invalid Timestamp"
+        for i in np.flatnonzero(~has_parts & ~has_timestamp):
+            missing[i].extend(name for name in TIME_FEATURES if name not in records[i])
+
+        errors, row_indices = [], []
+        for i in range(n):
+            if missing[i]:
+                errors.append({"index": i, "error": f"Missing features: {', '.join(missing[i])}"})
+            elif problems[i]:
+                errors.append({"index": i, "error": problems[i]})
+            else:
+                row_indices.append(i)
+        return X[row_indices], row_indices, errors
+
+    def check_matrix(self, X):
+        """Validate an already-encoded feature matrix; returns (row_indices, errors) like ``transform_records``."""
+        finite = np.isfinite(X).all(axis=1)
+        modes = X[:, _MODE_INDEX]
+        known = (modes == np.round(modes)) & (modes >= 0)
+        if self._mode_index is not None:
+            known &= modes < len(self._mode_index)
+
+        errors = [{"index": int(i), "error": "Feature values must be numeric"} for i in np.flatnonzero(~finite)]
+        errors += [{"index": int(i), "error": "Unknown Operation_Mode"} for i in np.flatnonzero(finite & ~known)]
+        errors.sort(key=lambda error: error["index"])
+        return np.flatnonzero(finite & known).tolist(), errors
+
+    def save(self, path):
+        joblib.dump(self, path)
+        logger.info(f"Feature transformer saved to {path}")
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
@@ -0,0 +1,187 @@
+import os
+import sys
+import copy
+import json
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import log_loss
+from src.logger import get_logger
+from src.exception import CustomException
+from src.evaluation import Evaluator, save_metrics
+from src.data_processing import SHARD_DIR, SHARD_MANIFEST, TARGET
+
+logger = get_logger(__name__)
+
+
+class IncrementalModelTraining:
+    """Out-of-core training on the shards written by ``DataProcessing.run_streaming``.
+
+    Mini-batches are streamed through a bounded shuffle buffer into a
+    logistic-loss ``SGDClassifier`` via ``partial_fit``. The last train shard
+    is held out for early stopping. The model is saved under the same name as
+    ``ModelTraining`` so ``application.py`` serves it unchanged.
+    """
+
+    def __init__(self, processed_data_path, model_output_path, epochs=5, batch_size=1024,
+                 shuffle_buffer_size=100000, patience=2, tol=1e-4, alpha=1e-4, random_state=42):
+        self.processed_data_path = processed_data_path
+        self.model_output_path = model_output_path
+        self.shard_path = os.path.join(processed_data_path, SHARD_DIR)
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.patience = patience
+        self.tol = tol
+        self.alpha = alpha
+        self.random_state = random_state
+        self.clf = None
+        self.manifest = None
+        self.classes = None
+        self.train_shards, self.validation_shards, self.test_shards = [], [], []
+        self.history = []
+
+        os.makedirs(self.model_output_path, exist_ok=True)
+        logger.info(f"Model output directory set at: {self.model_output_path}")
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.shard_path, SHARD_MANIFEST)) as f:
+                self.manifest = json.load(f)
+
+            train = [s for s in self.manifest["shards"] if s["split"] == "train"]
+            self.test_shards = [s for s in self.manifest["shards"] if s["split"] == "test"]
+            if len(train) > 1:
+                self.train_shards, self.validation_shards = train[:-1], train[-1:]
+            else:
+                self.train_shards, self.validation_shards = train, []
+                logger.info("Only one train shard available; early stopping disabled.")
+
+            self.classes = np.arange(len(self.manifest["categories"][TARGET]))
+            logger.info(f"Shard manifest loaded: {len(self.train_shards)} train, "
+                        f"{len(self.validation_shards)} validation, {len(self.test_shards)} test shards")
+        except Exception as e:
+            logger.error(f"Error loading shard manifest: {e}")
+            raise CustomException(f"Error loading shard manifest: {e}", sys)
+
+    def read_shard(self, shard):
+        X = np.load(os.path.join(self.shard_path, shard["X"]), mmap_mode='r')
+        y = np.load(os.path.join(self.shard_path, shard["y"]), mmap_mode='r')
+        return X, y
+
+    def iter_batches(self, shards, rng):
+        """Yield shuffled mini-batches, holding at most ``shuffle_buffer_size`` rows."""
+        buffer_X, buffer_y, buffered = [], [], 0
+
+        def drain():
+            X, y = np.vstack(buffer_X), np.concatenate(buffer_y)
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                yield X[batch], y[batch]
+
+        for index in rng.permutation(len(shards)):
+            X, y = self.read_shard(shards[index])
+            for start in range(0, len(X), self.shuffle_buffer_size):
+                X_part = np.asarray(X[start:start + self.shuffle_buffer_size])
+                y_part = np.asarray(y[start:start + self.shuffle_buffer_size])
+                buffer_X.append(X_part)
+                buffer_y.append(y_part)
+                buffered += len(X_part)
+                if buffered >= self.shuffle_buffer_size:
+                    yield from drain()
+                    buffer_X, buffer_y, buffered = [], [], 0
+        if buffered:
+            yield from drain()
+
+    def validation_loss(self):
+        total, rows = 0.0, 0
+        for shard in self.validation_shards:
+            X, y = self.read_shard(shard)
+            proba = self.clf.predict_proba(X)
+            total += log_loss(y, proba, labels=self.classes) * len(y)
+            rows += len(y)
+        return total / rows
+
+    def train_model(self):
+        try:
+            rng = np.random.RandomState(self.random_state)
+            self.clf = SGDClassifier(loss='log_loss', alpha=self.alpha, random_state=self.random_state)
+            best_loss, best_clf, stale_epochs = np.inf, None, 0
+
+            for epoch in range(1, self.epochs + 1):
+                for X_batch, y_batch in self.iter_batches(self.train_shards, rng):
+                    self.clf.partial_fit(X_batch, y_batch, classes=self.classes)
+
+                if not self.validation_shards:
+                    self.history.append({"epoch": epoch})
+                    continue
+
+                loss = self.validation_loss()
+                self.history.append({"epoch": epoch, "validation_log_loss": loss})
+                logger.info(f"Epoch {epoch}: validation log loss {loss:.5f}")
+
+                if loss < best_loss - self.tol:
+                    best_loss, best_clf, stale_epochs = loss, copy.deepcopy(self.clf), 0
+                else:
+                    stale_epochs += 1
+                    if stale_epochs >= self.patience:
+                        logger.info(f"Early stopping after epoch {epoch}")
+                        break
+
+            if best_clf is not None:
+                self.clf = best_clf
+
+            joblib.dump(self.clf, os.path.join(self.model_output_path, 'logistic_regression_model.pkl'))
+            logger.info("Incremental model trained and saved successfully.")
+        except Exception as e:
+            logger.error(f"Error during incremental model training: {e}")
+            raise CustomException(f"Error during incremental model training: {e}", sys)
+
+    def evaluate_model(self, n_jobs=4):
+        """Stream the test shards through one confusion-matrix accumulation."""
+        try:
+            evaluator = Evaluator(self.classes).evaluate_batches(
+                self.clf, (self.read_shard(shard) for shard in self.test_shards), n_jobs=n_jobs
+            )
+            report = evaluator.report()
+            accuracy, cm = report["metrics"]["accuracy"], evaluator.cm
+            low, high = report["confidence_intervals"].get("accuracy", [float('nan')] * 2)
+            logger.info(f"Accuracy: {accuracy}")
+            logger.info(f"Confusion Matrix:\n{cm}")
+
+            print(f"\n=== INCREMENTAL MODEL EVALUATION RESULTS ===")
+            print(f"Accuracy: {accuracy:.4f} (95% CI {low:.4f}-{high:.4f})")
+            print(f"\nConfusion Matrix:\n{cm}")
+            print("=" * 35)
+
+            save_metrics(report, self.model_output_path, type(self.clf).__name__)
+            return accuracy, cm
+        except Exception as e:
+            logger.error(f"Error during incremental model evaluation: {e}")
+            raise CustomException(f"Error during incremental model evaluation: {e}", sys)
+
+    def run(self):
+        self.load_manifest()
+        self.train_model()
+        self.evaluate_model()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train on processed shards with SGD partial_fit")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--shuffle-buffer-size", type=int, default=100000)
+    parser.add_argument("--patience", type=int, default=2)
+    args = parser.parse_args()
+
+    trainer = IncrementalModelTraining(
+        processed_data_path='artifacts/processed/',
+        model_output_path='artifacts/model/',
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        shuffle_buffer_size=args.shuffle_buffer_size,
+        patience=args.patience
+    )
+    trainer.run()
@@ -0,0 +1,121 @@
+import sys
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+
+def fold_scaler(coef, intercept, mean, scale):
+    """Fold a StandardScaler into linear model weights.
+
+    ``coef @ ((x - mean) / scale) + intercept`` equals
+    ``(coef / scale) @ x + (intercept - (coef / scale) @ mean)``, so the
+    scaling step disappears from the serving path.
+    """
+    coef = np.asarray(coef, dtype=np.float64)
+    intercept = np.asarray(intercept, dtype=np.float64)
+    mean = np.zeros(coef.shape[1]) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(coef.shape[1]) if scale is None else np.asarray(scale, dtype=np.float64)
+
+    folded_coef = coef / scale
+    folded_intercept = intercept - folded_coef @ mean
+    return folded_coef, folded_intercept
+
+
+def is_linear_probabilistic(model):
+    """Models whose predict_proba is a link function of ``coef_ @ x + intercept_``."""
+    if isinstance(model, LogisticRegression):
+        return True
+    return isinstance(model, SGDClassifier) and model.loss == "log_loss"
+
+
+def probability_link(model):
+    """Return how a linear model turns decision scores into probabilities."""
+    if not isinstance(model, LogisticRegression):
+        return "ovr"
+    classes = np.asarray(model.classes_)
+    multi_class = getattr(model, "multi_class", "auto")
+    if multi_class in ("ovr", "warn"):
+        return "ovr"
+    if multi_class == "auto" and (classes.size <= 2 or model.solver == "liblinear"):
+        return "ovr"
+    return "softmax"
+
+
+class InferenceEngine:
+    """Single-pass scaler + classifier inference.
+
+    For a ``StandardScaler`` followed by a ``LogisticRegression`` (or a
+    logistic-loss ``SGDClassifier``) the scaler is folded into the
+    coefficients at load time and both the class and the probabilities come
+    from one matmul. Any other model/scaler pair falls back
+    to ``scaler.transform`` + ``model.predict_proba`` and derives the class
+    from the probabilities, so the decision function is still computed once.
+    """
+
+    def __init__(self, model, scaler):
+        try:
+            self.model = model
+            self.scaler = scaler
+            self.classes_ = np.asarray(model.classes_)
+            self.fused = is_linear_probabilistic(model) and isinstance(scaler, StandardScaler)
+
+            if self.fused:
+                coef, intercept = fold_scaler(
+                    model.coef_, model.intercept_,
+                    scaler.mean_ if scaler.with_mean else None,
+                    scaler.scale_ if scaler.with_std else None
+                )
+                self.coef_t = np.ascontiguousarray(coef.T)
+                self.intercept = intercept
+                self.link = probability_link(model)
+                logger.info(f"Inference engine fused scaler into model ({self.link} link)")
+            else:
+                logger.info("Inference engine using sklearn fallback path")
+        except Exception as e:
+            logger.error(f"Error building inference engine: {e}")
+            raise CustomException(f"Error building inference engine: {e}", sys)
+
+    def decision_function(self, X):
+        """Raw decision scores on unscaled input."""
+        return np.asarray(X, dtype=np.float64) @ self.coef_t + self.intercept
+
+    def _scores_to_proba(self, scores):
+        if self.link == "softmax":
+            if scores.shape[1] == 1:
+                scores = np.hstack([-scores, scores])
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            scores /= scores.sum(axis=1, keepdims=True)
+            return scores
+
+        # One-vs-rest: logistic per class, then normalise across classes
+        proba = 1.0 / (1.0 + np.exp(-scores))
+        if proba.shape[1] == 1:
+            return np.hstack([1.0 - proba, proba])
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict_proba(self, X):
+        return self.predict(X)[1]
+
+    def scale(self, X):
+        """Model input for ``predict_scaled``; a no-op when the scaler is folded in."""
+        if self.fused:
+            return X
+        return self.scaler.transform(X)
+
+    def predict_scaled(self, X):
+        """(classes, probabilities) for the output of ``scale``."""
+        if self.fused:
+            proba = self._scores_to_proba(self.decision_function(X))
+        else:
+            proba = np.asarray(self.model.predict_proba(X))
+        return self.classes_[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        """Return (classes, probabilities) for a 2D array of unscaled features."""
+        return self.predict_scaled(self.scale(X))
@@ -0,0 +1,243 @@
+import os
+import sys
+import json
+import mmap
+import shutil
+import tempfile
+import threading
+import itertools
+from bisect import bisect_left
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+DEFAULT_METRICS_DIR = os.path.join(tempfile.gettempdir(), 'serving-metrics')
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Concurrent threads per worker that get a private row before rows are shared
+THREAD_SLOTS = 64
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """Monotonic counter, optionally split by one label with a fixed set of values."""
+
+    kind = 'counter'
+
+    def __init__(self, registry, offset, name, documentation, label=None, values=(None,)):
+        self.registry = registry
+        self.offset = offset
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.values = tuple(values)
+        self._index = {value: offset + i for i, value in enumerate(self.values)}
+        self.size = len(self.values)
+
+    def inc(self, value=None, amount=1):
+        cells, row = self.registry.cells()
+        cells[row + self._index[value]] += amount
+
+    def samples(self, totals):
+        for i, value in enumerate(self.values):
+            yield self.name + '_total', self._labels(value), totals[self.offset + i]
+
+    def _labels(self, value, **extra):
+        labels = {} if self.label is None else {self.label: value}
+        labels.update(extra)
+        return labels
+
+
+class Histogram(Counter):
+    """Cumulative-bucket histogram; each label value stores its bucket counts and sum."""
+
+    kind = 'histogram'
+
+    def __init__(self, registry, offset, name, documentation, buckets, label=None, values=(None,)):
+        super().__init__(registry, offset, name, documentation, label, values)
+        self.buckets = tuple(buckets)
+        # Bucket counts, +Inf bucket and sum per label value
+        width = len(self.buckets) + 2
+        self._index = {value: offset + i * width for i, value in enumerate(self.values)}
+        self.size = width * len(self.values)
+
+    def observe(self, amount, value=None):
+        cells, row = self.registry.cells()
+        base = row + self._index[value]
+        cells[base + bisect_left(self.buckets, amount)] += 1
+        cells[base + len(self.buckets) + 1] += amount
+
+    def samples(self, totals):
+        n = len(self.buckets)
+        for value in self.values:
+            base = self._index[value]
+            counts = np.cumsum(totals[base:base + n + 1])
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield self.name + '_bucket', self._labels(value, le=le), count
+            yield self.name + '_sum', self._labels(value), totals[base + n + 1]
+            yield self.name + '_count', self._labels(value), counts[-1]
+
+
+def format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """Prometheus metrics shared by every worker process of one server.
+
+    Each process writes its values to its own memory-mapped file in
+    ``metrics_dir``, and each thread to its own row of that file, so
+    recording a value is a plain in-memory add with no lock and no system
+    call. ``render()`` (in whichever worker serves ``/metrics``) sums the
+    files of all workers, including ones that have exited, so counters stay
+    monotonic across worker restarts. Clear the directory when the server
+    starts (see ``gunicorn.conf.py``).
+    """
+
+    def __init__(self, metrics_dir=DEFAULT_METRICS_DIR, slots=THREAD_SLOTS):
+        self.metrics_dir = metrics_dir
+        self.slots = slots
+        self.metrics = []
+        self.size = 0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._cells = None
+        self._next_slot = itertools.count()
+        self._info = {}
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _register(self, metric_class, *args, **kwargs):
+        if self._cells is not None:
+            raise CustomException("Metrics must be defined before the first value is recorded", sys)
+        metric = metric_class(self, self.size, *args, **kwargs)
+        self.metrics.append(metric)
+        self.size += metric.size
+        return metric
+
+    def counter(self, name, documentation, label=None, values=(None,)):
+        return self._register(Counter, name, documentation, label, values)
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS, label=None, values=(None,)):
+        return self._register(Histogram, name, documentation, buckets, label, values)
+
+    def _after_fork(self):
+        # The child must not keep adding to its parent's file
+        self._generation += 1
+        self._lock = threading.Lock()
+        self._cells = None
+        self._next_slot = itertools.count()
+
+    def _path(self, pid, suffix='.bin'):
+        return os.path.join(self.metrics_dir, f'worker-{pid}{suffix}')
+
+    def _open(self):
+        with self._lock:
+            if self._cells is None:
+                try:
+                    os.makedirs(self.metrics_dir, exist_ok=True)
+                    length = self.slots * self.size * 8
+                    with open(self._path(os.getpid()), 'a+b') as f:
+                        if os.fstat(f.fileno()).st_size < length:
+                            f.truncate(length)
+                        self._mmap = mmap.mmap(f.fileno(), length)
+                    self._cells = memoryview(self._mmap).cast('d')
+                    self._write_info()
+                except Exception as e:
+                    logger.error(f"Error opening metrics file: {e}")
+                    raise CustomException(f"Error opening metrics file: {e}", sys)
+            return self._cells
+
+    def cells(self):
+        """This process's value array and the start of the calling thread's row."""
+        try:
+            generation, cells, row = self._local.state
+            if generation == self._generation:
+                return cells, row
+        except AttributeError:
+            pass
+        cells = self._open()
+        row = (next(self._next_slot) % self.slots) * self.size
+        self._local.state = (self._generation, cells, row)
+        return cells, row
+
+    def set_info(self, **info):
+        """Per-process labels (e.g. the serving model version), reported as an info gauge."""
+        self._info.update(info)
+        if self._cells is not None:
+            self._write_info()
+
+    def _write_info(self):
+        path = self._path(os.getpid(), '.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self._info, f)
+        os.replace(path + '.tmp', path)
+
+    def collect(self):
+        """Sum of every value over all threads of all worker files, and the info of live workers."""
+        self.cells()
+        totals = np.zeros(self.size)
+        live_info = []
+        for name in os.listdir(self.metrics_dir):
+            path = os.path.join(self.metrics_dir, name)
+            if name.endswith('.bin'):
+                values = np.fromfile(path, dtype=np.float64)
+                values = values[:len(values) // self.size * self.size]
+                totals += values.reshape(-1, self.size).sum(axis=0)
+            elif name.endswith('.json') and pid_alive(int(name[len('worker-'):-len('.json')])):
+                try:
+                    with open(path) as f:
+                        live_info.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return totals, live_info
+
+    def render(self):
+        """Prometheus text exposition of the aggregated metrics."""
+        totals, live_info = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples(totals):
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+
+        lines.append('# HELP serving_workers Worker processes with metrics')
+        lines.append('# TYPE serving_workers gauge')
+        lines.append(f'serving_workers {len(live_info)}')
+        versions = {}
+        for info in live_info:
+            if info.get('model_version'):
+                versions[info['model_version']] = versions.get(info['model_version'], 0) + 1
+        lines.append('# HELP model_version_info Workers serving each model version')
+        lines.append('# TYPE model_version_info gauge')
+        for version, workers in sorted(versions.items()):
+            lines.append(f'model_version_info{format_labels({"version": version})} {workers}')
+        return '\n'.join(lines) + '\n'
+
+
+def clear_metrics_dir(metrics_dir=DEFAULT_METRICS_DIR):
+    """Remove the metric files of a previous server run."""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
@@ -0,0 +1,118 @@
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import Future
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+
+class MicroBatcher:
+    """Dynamic batching of concurrent single-row predictions.
+
+    Rows submitted from request threads are queued; a background thread
+    gathers everything that arrives within ``max_wait_ms`` (or until
+    ``max_batch_size`` rows are waiting), runs ``predict_fn`` once on the
+    stacked matrix and hands each caller its own row of the result.
+
+    ``predict_fn`` takes a 2D array and returns ``(classes, probabilities)``.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=2.0, max_queue_size=10000):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue(maxsize=max_queue_size)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._max_queue_depth = 0
+        self._histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Micro-batcher started (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+
+    def submit(self, row):
+        """Queue one feature row and return a Future for (class, probabilities)."""
+        if not self._running:
+            raise CustomException("Micro-batcher is closed", sys)
+        future = Future()
+        self.queue.put((np.asarray(row, dtype=np.float64).ravel(), future))
+        return future
+
+    def predict(self, row, timeout=None):
+        """Blocking single-row prediction through the batching queue."""
+        return self.submit(row).result(timeout=timeout)
+
+    def _collect(self):
+        try:
+            first = self.queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _record(self, batch_size, queue_depth):
+        bucket = np.searchsorted(BATCH_SIZE_BUCKETS, batch_size)
+        with self._lock:
+            self._requests += batch_size
+            self._batches += 1
+            self._histogram[bucket] += 1
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth + batch_size)
+
+    def _run(self):
+        while self._running or not self.queue.empty():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            self._record(len(batch), self.queue.qsize())
+            rows, futures = zip(*batch)
+            try:
+                pred_classes, pred_probas = self.predict_fn(np.vstack(rows))
+            except Exception as e:
+                logger.error(f"Error during micro-batch prediction: {e}")
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for future, pred_class, pred_proba in zip(futures, pred_classes, pred_probas):
+                future.set_result((pred_class, pred_proba))
+
+    def stats(self):
+        """Queue depth and batch size metrics."""
+        with self._lock:
+            histogram = {f"le_{bound}": count for bound, count in zip(BATCH_SIZE_BUCKETS, self._histogram)}
+            histogram["le_inf"] = self._histogram[-1]
+            return {
+                "queue_depth": self.queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "mean_batch_size": self._requests / self._batches if self._batches else 0.0,
+                "batch_size_histogram": histogram,
+            }
+
+    def close(self, timeout=1.0):
+        """Stop accepting rows and drain the queue."""
+        self._running = False
+        self._thread.join(timeout=timeout)
+        logger.info("Micro-batcher stopped")
@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import tempfile
+import joblib
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+from src.inference import InferenceEngine
+from src.feature_transformer import FeatureTransformer
+from src.feature_schema import FeatureSchema
+from src.drift import DriftReference
+from src.shared_artifacts import DEFAULT_SNAPSHOT_DIR, snapshot_artifacts, load_shared
+
+logger = get_logger(__name__)
+
+# Outside the snapshot directory so pruning snapshots never counts or removes it
+DEFAULT_RELOAD_TRIGGER_FILE = os.path.join(tempfile.gettempdir(), 'model-reload.trigger')
+
+
+def artifact_fingerprint(paths):
+    """Size + mtime of every existing artifact; changes whenever one is rewritten."""
+    fingerprint = []
+    for path in paths:
+        if path and os.path.exists(path):
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def artifact_version(paths):
+    """Short content hash identifying a model + scaler pair across workers."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelBundle:
+    """A model, its scaler, feature transformer, feature schema and drift reference, loaded and validated together."""
+
+    def __init__(self, model, scaler, feature_transformer, version, fingerprint, feature_schema=None,
+                 drift_reference=None):
+        self.model = model
+        self.scaler = scaler
+        self.feature_transformer = feature_transformer
+        self.feature_schema = feature_schema
+        self.drift_reference = drift_reference
+        self.engine = InferenceEngine(model, scaler)
+        self.version = version
+        self.fingerprint = fingerprint
+        self.loaded_at = time.time()
+
+
+def smoke_test(bundle):
+    """Predict one row at the training mean and check the output is a probability vector."""
+    mean = getattr(bundle.scaler, 'mean_', None)
+    row = np.zeros((1, bundle.model.n_features_in_)) if mean is None else np.asarray(mean).reshape(1, -1)
+    classes, probas = bundle.engine.predict(row)
+    probas = np.asarray(probas)
+    if probas.shape != (1, len(bundle.model.classes_)) or not np.isfinite(probas).all():
+        raise ValueError(f"Smoke prediction returned probabilities of shape {probas.shape}")
+    if not np.isclose(probas.sum(), 1.0, atol=1e-6):
+        raise ValueError(f"Smoke prediction probabilities sum to {probas.sum()}")
+    return classes[0], probas[0]
+
+
+class ModelRegistry:
+    """Loads serving artifacts and hot-swaps them when they change on disk.
+
+    New artifacts are loaded and smoke-tested off the request path; only a
+    bundle that passes is published, by a single reference assignment, so
+    in-flight requests keep the bundle they started with. Changes are picked
+    up by ``reload()`` (e.g. from an admin endpoint) or by a polling watcher
+    that waits for the files to stop changing before loading them.
+
+    ``request_reload()`` also rewrites ``trigger_path``; every registry
+    watching the same trigger file (one per worker process) reloads on its
+    next watcher tick, so an on-demand reload reaches all workers, not just
+    the one that received the request.
+
+    With ``shared=True`` the artifacts are copied to an immutable per-version
+    snapshot and their arrays memory-mapped from it, so every worker process
+    serving that version shares one copy of the parameters in the page cache.
+    """
+
+    def __init__(self, model_path, scaler_path, feature_transformer_path=None, on_swap=None,
+                 shared=False, snapshot_dir=DEFAULT_SNAPSHOT_DIR, feature_schema_path=None,
+                 drift_reference_path=None, trigger_path=None):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.feature_transformer_path = feature_transformer_path
+        self.feature_schema_path = feature_schema_path
+        self.drift_reference_path = drift_reference_path
+        self.trigger_path = trigger_path
+        self.on_swap = on_swap
+        self.shared = shared
+        self.snapshot_dir = snapshot_dir
+        self.current = None
+
+        self._lock = threading.Lock()
+        self._pending = None
+        self._failed = None
+        self._watcher = None
+        self._stop = threading.Event()
+        self.reloads = 0
+        self.last_error = None
+        # Requests already in the trigger file when this process starts are not replayed
+        self._trigger_seen = self.read_trigger()
+
+    @property
+    def paths(self):
+        return [self.model_path, self.scaler_path, self.feature_transformer_path, self.feature_schema_path,
+                self.drift_reference_path]
+
+    @property
+    def version(self):
+        return self.current.version if self.current is not None else None
+
+    def load_bundle(self):
+        try:
+            fingerprint = artifact_fingerprint(self.paths)
+            version = artifact_version(self.paths)
+            if self.shared:
+                model_path, scaler_path, transformer_path, schema_path, reference_path = snapshot_artifacts(
+                    self.paths, version, self.snapshot_dir)
+                load = load_shared
+            else:
+                model_path, scaler_path, transformer_path, schema_path, reference_path = self.paths
+                load = joblib.load
+            model = load(model_path)
+            scaler = load(scaler_path)
+            if transformer_path and os.path.exists(transformer_path):
+                feature_transformer = FeatureTransformer.load(transformer_path)
+            else:
+                feature_transformer = FeatureTransformer()
+            # Without a schema only finite values and known mode codes are enforced
+            feature_schema = FeatureSchema.load(schema_path) if schema_path and os.path.exists(schema_path) else None
+            drift_reference = None
+            if reference_path and os.path.exists(reference_path):
+                drift_reference = DriftReference.load(reference_path)
+            bundle = ModelBundle(model, scaler, feature_transformer, version, fingerprint, feature_schema,
+                                 drift_reference)
+            smoke_test(bundle)
+            return bundle
+        except Exception as e:
+            logger.error(f"Error loading model artifacts: {e}")
+            raise CustomException(f"Error loading model artifacts: {e}", sys)
+
+    def reload(self, force=False):
+        """Load, validate and publish the artifacts; returns True if a new bundle was swapped in.
+
+        A failed load keeps the current bundle serving and is reported in ``last_error``.
+        """
+        with self._lock:
+            if not force and self.current is not None and \
+                    artifact_fingerprint(self.paths) == self.current.fingerprint:
+                return False
+            try:
+                bundle = self.load_bundle()
+            except CustomException as e:
+                self.last_error = str(e)
+                self._failed = artifact_fingerprint(self.paths)
+                raise
+
+            previous = self.version
+            self.current = bundle
+            if previous is not None:
+                self.reloads += 1
+            self.last_error = None
+            if self.on_swap is not None:
+                self.on_swap(bundle)
+            logger.info(f"Model version {bundle.version} now serving (previous: {previous})")
+            return True
+
+    def read_trigger(self):
+        """Contents of the trigger file, or None if there is none."""
+        if not self.trigger_path:
+            return None
+        try:
+            with open(self.trigger_path) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def request_reload(self, force=False):
+        """Reload in this process and signal every other watcher of ``trigger_path`` to do the same."""
+        if self.trigger_path:
+            request = json.dumps({"requested_at": time.time(), "pid": os.getpid(), "force": bool(force)})
+            os.makedirs(os.path.dirname(os.path.abspath(self.trigger_path)), exist_ok=True)
+            tmp_path = f"{self.trigger_path}.tmp-{os.getpid()}"
+            with open(tmp_path, "w") as f:
+                f.write(request)
+            os.replace(tmp_path, self.trigger_path)
+            self._trigger_seen = request
+        return self.reload(force=force)
+
+    def check_trigger(self):
+        """Reload if another process wrote a new request to the trigger file."""
+        request = self.read_trigger()
+        if request is None or request == self._trigger_seen:
+            return False
+        self._trigger_seen = request
+        try:
+            force = json.loads(request).get("force", False)
+        except ValueError:
+            force = False
+        logger.info(f"Reload requested through {self.trigger_path}")
+        try:
+            return self.reload(force=force)
+        except CustomException:
+            return False
+
+    def check_for_changes(self):
+        """One watcher tick: reload once a changed fingerprint has been stable for a full interval."""
+        if self.check_trigger():
+            return True
+        fingerprint = artifact_fingerprint(self.paths)
+        if self.current is not None and fingerprint == self.current.fingerprint:
+            self._pending = None
+            return False
+        if fingerprint == self._failed:
+            return False
+        if fingerprint != self._pending:
+            # Still being written, or just changed: look again next tick
+            self._pending = fingerprint
+            return False
+        try:
+            return self.reload()
+        except CustomException:
+            return False
+
+    def start_watching(self, interval_seconds):
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval_seconds):
+                self.check_for_changes()
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching model artifacts every {interval_seconds}s")
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def stats(self):
+        current = self.current
+        return {
+            "version": self.version,
+            "model_path": self.model_path,
+            "shared": self.shared,
+            "loaded_at": current.loaded_at if current is not None else None,
+            "reloads": self.reloads,
+            "watching": self._watcher is not None,
+            "trigger_path": self.trigger_path,
+            "last_error": self.last_error,
+        }
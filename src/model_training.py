@@ -1,30 +1,57 @@
 import os
 import sys
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
 from src.logger import get_logger
 from src.exception import CustomException
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, recall_score, precision_score, f1_score
+from src.processed_store import has_manifest, load_processed, load_sample_weight
+from src.evaluation import Evaluator, format_report, save_metrics
 
 logger = get_logger(__name__)
 
+C_VALUES = [0.01, 0.1, 1.0, 10.0, 100.0]
+CLASS_WEIGHTS = [None, 'balanced']
+
+# One grid per solver so only valid solver/penalty pairs are tried
+DEFAULT_PARAM_GRID = [
+    {'solver': ['lbfgs'], 'penalty': ['l2'], 'C': C_VALUES, 'class_weight': CLASS_WEIGHTS},
+    {'solver': ['saga'], 'penalty': ['l1', 'l2'], 'C': C_VALUES, 'class_weight': CLASS_WEIGHTS},
+    {'solver': ['liblinear'], 'penalty': ['l1', 'l2'], 'C': C_VALUES, 'class_weight': CLASS_WEIGHTS},
+]
+
+TRIAL_COLUMNS = ['iter', 'n_resources', 'params', 'mean_fit_time', 'mean_score_time',
+                 'mean_test_score', 'std_test_score', 'rank_test_score']
+
 class ModelTraining:
     def __init__(self, processed_data_path, model_output_path):
         self.processed_data_path = processed_data_path
         self.model_output_path = model_output_path
         self.clf = None
         self.X_train, self.X_test, self.y_train, self.y_test = None, None, None, None
+        # Per-row weights of the train split (e.g. inverse sampling rates of logged predictions)
+        self.w_train = None
 
         os.makedirs(self.model_output_path, exist_ok=True)
         logger.info(f"Model output directory set at: {self.model_output_path}")
 
     def load_processed_data(self):
         try:
+            if has_manifest(self.processed_data_path):
+                # Memory-mapped .npy splits: nothing is read until it is used
+                self.X_train, self.X_test, self.y_train, self.y_test = load_processed(self.processed_data_path)
+                self.w_train = load_sample_weight(self.processed_data_path)
+                logger.info("Processed data opened from memory-mapped splits.")
+                return
             self.X_train = joblib.load(os.path.join(self.processed_data_path, 'X_train.pkl'))
             self.X_test = joblib.load(os.path.join(self.processed_data_path, 'X_test.pkl'))
             self.y_train = joblib.load(os.path.join(self.processed_data_path, 'y_train.pkl'))
             self.y_test = joblib.load(os.path.join(self.processed_data_path, 'y_test.pkl'))
+            weight_path = os.path.join(self.processed_data_path, 'w_train.pkl')
+            self.w_train = joblib.load(weight_path) if os.path.exists(weight_path) else None
             logger.info("Processed data loaded successfully.")
         except Exception as e:
             logger.error(f"Error loading processed data: {e}")
@@ -33,7 +60,7 @@ class ModelTraining:
     def train_model(self):
         try:
             self.clf = LogisticRegression(random_state=42, max_iter=1000)
-            self.clf.fit(self.X_train, self.y_train)
+            self.clf.fit(self.X_train, self.y_train, sample_weight=self.w_train)
 
             joblib.dump(self.clf, os.path.join(self.model_output_path, 'logistic_regression_model.pkl'))
             logger.info("Model trained and saved successfully.")
@@ -41,49 +68,97 @@ class ModelTraining:
             logger.error(f"Error during model training: {e}")
             raise CustomException(f"Error during model training: {e}", sys)
     
-    def evaluate_model(self):
-            try:
-                y_pred = self.clf.predict(self.X_test)
-                accuracy = accuracy_score(self.y_test, y_pred)
-                precision = precision_score(self.y_test, y_pred, average='weighted')
-                recall = recall_score(self.y_test, y_pred, average='weighted')
-                f1 = f1_score(self.y_test, y_pred, average='weighted')
-                report = classification_report(self.y_test, y_pred)
-                cm = confusion_matrix(self.y_test, y_pred)
-
-                logger.info(f"Accuracy: {accuracy}")
-                logger.info(f"Precision: {precision}")
-                logger.info(f"Recall: {recall}")
-                logger.info(f"F1 Score: {f1}")
-                logger.info(f"Classification Report:\n{report}")
-                logger.info(f"Confusion Matrix:\n{cm}")
-
-                # Also print to console
-                print(f"\n=== MODEL EVALUATION RESULTS ===")
-                print(f"Accuracy: {accuracy:.4f}")
-                print(f"Precision: {precision:.4f}")
-                print(f"Recall: {recall:.4f}")
-                print(f"F1 Score: {f1:.4f}")
-                print(f"\nClassification Report:\n{report}")
-                print(f"\nConfusion Matrix:\n{cm}")
-                print("=" * 35)
-
-                logger.info("Model evaluation completed successfully.")
-            except Exception as e:
-                logger.error(f"Error during model evaluation: {e}")
-                raise CustomException(f"Error during model evaluation: {e}", sys)
-    
-    def run(self):
-        self.load_processed_data()
-        self.train_model()
+    def tune_model(self, param_grid=None, factor=3, cv=3, scoring='f1_weighted', n_jobs=-1, min_resources='exhaust'):
+        """Successive-halving search over C, penalty, solver and class weights.
+
+        Every configuration starts on a small sample of the training rows; only
+        the best 1/``factor`` advance to the next, ``factor`` times larger,
+        budget. Trials run in parallel on all cores and are written to
+        ``tuning_results.csv``; the refitted best model is saved as usual.
+        """
+        try:
+            search = HalvingGridSearchCV(
+                LogisticRegression(random_state=42, max_iter=1000),
+                param_grid or DEFAULT_PARAM_GRID,
+                resource='n_samples',
+                factor=factor,
+                min_resources=min_resources,
+                cv=cv,
+                scoring=scoring,
+                n_jobs=n_jobs,
+                random_state=42,
+                error_score=float('nan'),
+            )
+            search.fit(self.X_train, self.y_train, sample_weight=self.w_train)
+
+            results = pd.DataFrame(search.cv_results_)[TRIAL_COLUMNS].sort_values(['iter', 'rank_test_score'])
+            results.to_csv(os.path.join(self.model_output_path, 'tuning_results.csv'), index=False)
+
+            self.clf = search.best_estimator_
+            joblib.dump(self.clf, os.path.join(self.model_output_path, 'logistic_regression_model.pkl'))
+            logger.info(f"Tuning finished: {len(results)} trials over {search.n_iterations_} rounds, "
+                        f"best {search.best_params_} ({scoring}={search.best_score_:.4f})")
+            return results
+        except Exception as e:
+            logger.error(f"Error during hyperparameter tuning: {e}")
+            raise CustomException(f"Error during hyperparameter tuning: {e}", sys)
+
+    def evaluate_model(self, n_resamples=1000, confidence=0.95):
+        """Score the test split once and derive every metric from its confusion matrix."""
+        try:
+            labels = np.union1d(self.clf.classes_, np.unique(self.y_test))
+            evaluator = Evaluator(labels).update(self.y_test, self.clf.predict(self.X_test))
+            report = evaluator.report(n_resamples=n_resamples, confidence=confidence)
+            metrics, intervals = report["metrics"], report["confidence_intervals"]
+            cm = evaluator.cm
+
+            logger.info(f"Accuracy: {metrics['accuracy']}")
+            logger.info(f"Precision: {metrics['precision_weighted']}")
+            logger.info(f"Recall: {metrics['recall_weighted']}")
+            logger.info(f"F1 Score: {metrics['f1_weighted']}")
+            logger.info(f"Classification Report:\n{format_report(report)}")
+            logger.info(f"Confusion Matrix:\n{cm}")
+
+            # Also print to console
+            print(f"\n=== MODEL EVALUATION RESULTS ===")
+            for label, name in [("Accuracy", "accuracy"), ("Precision", "precision_weighted"),
+                                ("Recall", "recall_weighted"), ("F1 Score", "f1_weighted")]:
+                low, high = intervals[name]
+                print(f"{label}: {metrics[name]:.4f} ({confidence:.0%} CI {low:.4f}-{high:.4f})")
+            print(f"\nClassification Report:\n{format_report(report)}")
+            print(f"\nConfusion Matrix:\n{cm}")
+            print("=" * 35)
+
+            save_metrics(report, self.model_output_path, type(self.clf).__name__)
+            logger.info("Model evaluation completed successfully.")
+            return report
+        except Exception as e:
+            logger.error(f"Error during model evaluation: {e}")
+            raise CustomException(f"Error during model evaluation: {e}", sys)
+
+    def run(self, data=None, tune=False):
+        """Train and evaluate; ``data`` = (X_train, X_test, y_train, y_test[, w_train]) skips the disk round-trip."""
+        if data is None:
+            self.load_processed_data()
+        else:
+            self.X_train, self.X_test, self.y_train, self.y_test = data[:4]
+            self.w_train = data[4] if len(data) > 4 else None
+        if tune:
+            self.tune_model()
+        else:
+            self.train_model()
         self.evaluate_model()
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the efficiency model")
+    parser.add_argument("--tune", action="store_true",
+                        help="successive-halving hyperparameter search instead of the default model")
+    args = parser.parse_args()
+
     trainer = ModelTraining(
         processed_data_path='artifacts/processed/',
         model_output_path='artifacts/model/'
     )
-    trainer.run()
-     
-
-        
+    trainer.run(tune=args.tune)
@@ -0,0 +1,130 @@
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PredictionCache:
+    """LRU + TTL cache of predictions keyed on the quantized feature vector.
+
+    Features are rounded to multiples of ``quantum`` before hashing, so
+    telemetry frames that are resent unchanged (or differ only below the
+    quantum) reuse the first prediction. Entries expire after ``ttl_seconds``
+    and the least recently used are evicted above ``max_entries``. Every
+    entry belongs to a model version; binding a new version clears the cache.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=300.0, quantum=1e-3):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.quantum = quantum
+        self.version = None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def key(self, row):
+        return np.round(np.asarray(row, dtype=np.float64) / self.quantum).astype(np.int64).tobytes()
+
+    def bind(self, version):
+        """Drop every entry if ``version`` differs from the cached model version."""
+        with self._lock:
+            if version != self.version:
+                if self._entries:
+                    logger.info(f"Model changed, dropping {len(self._entries)} cached predictions")
+                    self._invalidations += 1
+                self._entries.clear()
+                self.version = version
+
+    def _get_locked(self, key, now):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            del self._entries[key]
+            self._expirations += 1
+        self._misses += 1
+        return None
+
+    def _put_locked(self, key, value, now):
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            return self._get_locked(key, time.monotonic())
+
+    def put(self, key, value, version=None):
+        """Store ``value``; dropped if computed for a ``version`` that is no longer bound."""
+        return self.put_many([key], [value], version)
+
+    def get_many(self, keys):
+        """Cached values (None on a miss) for ``keys`` and the version they belong to, under one lock."""
+        with self._lock:
+            now = time.monotonic()
+            return [self._get_locked(key, now) for key in keys], self.version
+
+    def put_many(self, keys, values, version=None):
+        """Store a batch of values under one lock; dropped if ``version`` is no longer bound."""
+        with self._lock:
+            if version is not None and version != self.version:
+                return False
+            now = time.monotonic()
+            for key, value in zip(keys, values):
+                self._put_locked(key, value, now)
+            return True
+
+    def predict(self, X, predict_fn):
+        """(classes, probabilities) for ``X``, calling ``predict_fn`` once on the cache misses only.
+
+        The bound version is captured with the lookup; if the model is swapped
+        while ``predict_fn`` runs, its results are returned but not cached.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        keys = [self.key(row) for row in X]
+        cached, version = self.get_many(keys)
+        missing = [i for i, value in enumerate(cached) if value is None]
+
+        if missing:
+            classes, probas = predict_fn(X[missing])
+            for i, pred_class, pred_proba in zip(missing, classes, probas):
+                cached[i] = (pred_class, np.array(pred_proba, dtype=np.float64))
+            self.put_many([keys[i] for i in missing], [cached[i] for i in missing], version)
+
+        classes = np.array([value[0] for value in cached])
+        probas = np.array([value[1] for value in cached], dtype=np.float64).reshape(len(X), -1)
+        return classes, probas
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "quantum": self.quantum,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
@@ -0,0 +1,279 @@
+import os
+import sys
+import glob
+import json
+import time
+import uuid
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.exception import CustomException
+from src.feature_transformer import FEATURES, TIME_FEATURES, MODE_COLUMN
+
+logger = get_logger(__name__)
+
+DEFAULT_PREDICTION_LOG_DIR = 'artifacts/prediction_logs'
+TARGET_COLUMN = 'Efficiency_Status'
+# Per-row key assigned when the request arrives and returned to the client; outcomes are joined on it
+PREDICTION_ID_COLUMN = 'Prediction_ID'
+SAMPLE_WEIGHT_COLUMN = 'Sample_Weight'
+# Sampling starts once the buffer is this full and reaches zero when it is full
+SAMPLING_THRESHOLD = 0.5
+_SENSOR_FEATURES = [name for name in FEATURES if name != MODE_COLUMN and name not in TIME_FEATURES]
+_BLOCK_PATTERN = os.path.join('date=*', 'hour=*', 'part-*.npz')
+
+
+def new_request_id():
+    return uuid.uuid4().hex
+
+
+def prediction_ids(request_id, row_indices):
+    """IDs of the rows of one request: ``<request id>-<position in the request>``."""
+    return [f"{request_id}-{index}" for index in row_indices]
+
+
+def partition_dir(log_dir, timestamp):
+    """Hourly (UTC) partition directory of a log timestamp."""
+    utc = time.gmtime(timestamp)
+    return os.path.join(log_dir, time.strftime('date=%Y-%m-%d', utc), time.strftime('hour=%H', utc))
+
+
+class PredictionLogger:
+    """Append-only log of served feature rows and predictions.
+
+    ``log`` runs on the request path and only appends references to a ring
+    buffer bounded by ``capacity_rows``. A background thread drains the buffer
+    every ``flush_interval`` seconds and writes each hourly partition's rows
+    as one compressed ``.npz`` block. When the writer falls behind and the
+    buffer passes ``SAMPLING_THRESHOLD`` of its capacity, incoming rows are
+    sampled with a rate falling linearly to zero; every row records the rate
+    it was kept at, and training reweights rows by its inverse. Each row also
+    keeps the prediction ID returned to the client, its Machine_ID and the
+    timestamp it was sent with, so observed outcomes can be reported against it.
+    """
+
+    def __init__(self, log_dir=DEFAULT_PREDICTION_LOG_DIR, capacity_rows=100000, flush_interval=1.0, seed=None):
+        self.log_dir = log_dir
+        self.capacity_rows = capacity_rows
+        self.flush_interval = flush_interval
+
+        self._buffer = deque()
+        # Approximate under concurrent loggers, which is all the bound needs
+        self._buffered_rows = 0
+        self._rng = np.random.default_rng(seed)
+        self._categories = {}
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._sequence = 0
+        self.logged_rows = 0
+        self.sampled_out_rows = 0
+        self.written_rows = 0
+        self.blocks = 0
+        self.last_error = None
+
+    def set_categories(self, version, categories):
+        """Vocabularies of the model version being served, stored with its rows."""
+        self._categories[version] = json.dumps(categories or {})
+
+    def sample_rate(self):
+        fill = self._buffered_rows / self.capacity_rows
+        if fill < SAMPLING_THRESHOLD:
+            return 1.0
+        return max(0.0, (1.0 - fill) / (1.0 - SAMPLING_THRESHOLD))
+
+    def log(self, X, classes, probas, version=None, ids=None, machine_ids=None, timestamps=None):
+        """Buffer the rows of one scored request; arrays are converted by the writer.
+
+        ``ids``, ``machine_ids`` and ``timestamps`` are per-row; IDs are
+        generated if not given, the others default to empty.
+        """
+        n = len(X)
+        if ids is None:
+            ids = prediction_ids(new_request_id(), range(n))
+        rate = self.sample_rate()
+        if rate < 1.0:
+            keep = self._rng.random(n) < rate
+            if not keep.all():
+                self.sampled_out_rows += n - int(keep.sum())
+                if not keep.any():
+                    return
+                X = np.asarray(X)[keep]
+                classes = np.asarray(classes)[keep]
+                probas = np.asarray(probas)[keep]
+                ids = np.asarray(ids)[keep]
+                machine_ids = None if machine_ids is None else np.asarray(machine_ids, dtype=object)[keep]
+                timestamps = None if timestamps is None else np.asarray(timestamps, dtype=object)[keep]
+                n = len(X)
+        self._buffered_rows += n
+        self.logged_rows += n
+        self._buffer.append((time.time(), rate, version, X, classes, probas, ids, machine_ids, timestamps))
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of rows written."""
+        with self._write_lock:
+            entries = []
+            while self._buffer:
+                entries.append(self._buffer.popleft())
+            self._buffered_rows = 0
+            if not entries:
+                return 0
+            groups = {}
+            for entry in entries:
+                key = (partition_dir(self.log_dir, entry[0]), entry[2])
+                groups.setdefault(key, []).append(entry)
+            written = 0
+            for (directory, version), group in groups.items():
+                written += self._write_block(directory, version, group)
+            self.written_rows += written
+            return written
+
+    def _write_block(self, directory, version, entries):
+        X = np.concatenate([np.asarray(entry[3], dtype=np.float64).reshape(-1, len(FEATURES))
+                            for entry in entries])
+        sizes = [len(entry[3]) for entry in entries]
+        block = {
+            "X": X,
+            "predicted_class": np.concatenate([np.asarray(entry[4], dtype=np.int64).reshape(-1)
+                                               for entry in entries]),
+            "probabilities": np.concatenate([np.asarray(entry[5], dtype=np.float32).reshape(size, -1)
+                                             for entry, size in zip(entries, sizes)]),
+            "logged_at": np.repeat([entry[0] for entry in entries], sizes),
+            "sample_rate": np.repeat(np.array([entry[1] for entry in entries], dtype=np.float32), sizes),
+            "prediction_id": np.concatenate([np.asarray(entry[6], dtype=str).reshape(-1) for entry in entries]),
+            "machine_id": _text_column(entries, 7, sizes),
+            "timestamp": _text_column(entries, 8, sizes),
+            "model_version": np.array(version or ""),
+            "categories": np.array(self._categories.get(version, "{}")),
+        }
+        os.makedirs(directory, exist_ok=True)
+        self._sequence += 1
+        name = f"part-{int(entries[0][0] * 1000)}-{os.getpid()}-{self._sequence:06d}"
+        # Written under a temporary name, so readers only ever see complete blocks
+        tmp_path = os.path.join(directory, f".{name}.tmp.npz")
+        np.savez_compressed(tmp_path, **block)
+        os.replace(tmp_path, os.path.join(directory, f"{name}.npz"))
+        self.blocks += 1
+        return len(X)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.flush_interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Error writing prediction log: {e}")
+
+        self._thread = threading.Thread(target=run, name="prediction-logger", daemon=True)
+        self._thread.start()
+        logger.info(f"Prediction logger writing to {self.log_dir}")
+
+    def stop(self):
+        """Stop the writer thread and write what is still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def stats(self):
+        return {
+            "log_dir": self.log_dir,
+            "buffered_rows": self._buffered_rows,
+            "sample_rate": self.sample_rate(),
+            "logged_rows": self.logged_rows,
+            "sampled_out_rows": self.sampled_out_rows,
+            "written_rows": self.written_rows,
+            "blocks": self.blocks,
+            "last_error": self.last_error,
+        }
+
+
+def list_blocks(log_dir, start=None, end=None):
+    """Block files of the hourly partitions between ``start`` and ``end`` (inclusive, UTC)."""
+    start_dir = partition_dir(log_dir, pd.Timestamp(start).timestamp()) if start is not None else None
+    end_dir = partition_dir(log_dir, pd.Timestamp(end).timestamp()) if end is not None else None
+    paths = []
+    for path in sorted(glob.glob(os.path.join(log_dir, _BLOCK_PATTERN))):
+        directory = os.path.dirname(path)
+        if (start_dir is None or directory >= start_dir) and (end_dir is None or directory <= end_dir):
+            paths.append(path)
+    return paths
+
+
+def read_prediction_logs(log_dir, start=None, end=None, outcomes=None):
+    """Logged rows in the raw dataset layout.
+
+    Operation modes and predicted classes are decoded with the vocabularies of
+    the model version that served them; ``Timestamp`` is the one sent with the
+    request (rebuilt from the time features if there was none). The served prediction is ``Predicted_Status``, never the
+    label: ``Efficiency_Status`` is empty unless ``outcomes`` (a CSV path or
+    DataFrame with ``Prediction_ID`` and ``Efficiency_Status``) supplies the
+    observed outcome. ``Sample_Weight`` (1 / sample rate) and ``Model_Version``
+    are added for reweighting and filtering.
+    """
+    try:
+        frames = []
+        for path in list_blocks(log_dir, start, end):
+            with np.load(path) as block:
+                X = block["X"]
+                categories = json.loads(str(block["categories"]))
+                frame = pd.DataFrame(X[:, [FEATURES.index(name) for name in _SENSOR_FEATURES]],
+                                     columns=_SENSOR_FEATURES)
+                parts = X[:, [FEATURES.index(name) for name in TIME_FEATURES]].astype(np.int64)
+                # Binary requests carry only the time features, so their timestamp is rebuilt to the hour
+                rebuilt = [f"{y:04d}-{m:02d}-{d:02d} {h:02d}:00:00" for y, m, d, h in parts]
+                sent = block["timestamp"].tolist()
+                frame.insert(0, 'Timestamp', [stamp or hour for stamp, hour in zip(sent, rebuilt)])
+                frame.insert(1, 'Machine_ID', block["machine_id"].tolist())
+                frame.insert(2, MODE_COLUMN, _decode(X[:, FEATURES.index(MODE_COLUMN)].astype(np.int64),
+                                                     categories.get(MODE_COLUMN)))
+                frame[TARGET_COLUMN] = None
+                frame['Predicted_Status'] = _decode(block["predicted_class"], categories.get(TARGET_COLUMN))
+                frame.insert(0, PREDICTION_ID_COLUMN, block["prediction_id"].tolist())
+                frame[SAMPLE_WEIGHT_COLUMN] = 1.0 / block["sample_rate"].astype(np.float64)
+                frame['Model_Version'] = str(block["model_version"])
+                frames.append(frame)
+        if not frames:
+            raise ValueError(f"No prediction log blocks found in {log_dir}")
+        df = pd.concat(frames, ignore_index=True)
+        if outcomes is not None:
+            df = attach_outcomes(df, outcomes)
+        logger.info(f"Read {len(df)} logged predictions from {len(frames)} blocks in {log_dir} "
+                    f"({int(df[TARGET_COLUMN].notna().sum())} with outcomes)")
+        return df
+    except Exception as e:
+        logger.error(f"Error reading prediction logs: {e}")
+        raise CustomException(f"Error reading prediction logs: {e}", sys)
+
+
+def attach_outcomes(df, outcomes):
+    """Fill ``Efficiency_Status`` from observed outcomes keyed by ``Prediction_ID``."""
+    if not isinstance(outcomes, pd.DataFrame):
+        outcomes = pd.read_csv(outcomes, dtype={PREDICTION_ID_COLUMN: 'str', TARGET_COLUMN: 'str'})
+    labels = outcomes.drop_duplicates(PREDICTION_ID_COLUMN, keep='last').set_index(PREDICTION_ID_COLUMN)
+    df[TARGET_COLUMN] = df[PREDICTION_ID_COLUMN].map(labels[TARGET_COLUMN])
+    return df
+
+
+def _text_column(entries, field, sizes):
+    """One string per row of a per-entry field; entries without it give empty strings."""
+    values = []
+    for entry, size in zip(entries, sizes):
+        column = entry[field]
+        values.extend([""] * size if column is None else ["" if value is None else str(value) for value in column])
+    return np.array(values, dtype=str)
+
+
+def _decode(codes, vocabulary):
+    """Category names for integer codes; the codes themselves without a vocabulary."""
+    if not vocabulary:
+        return codes.astype(str)
+    return np.asarray(vocabulary, dtype=object)[codes]
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import numpy as np
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+SPLITS = ('train', 'test')
+
+
+def manifest_path(path):
+    return os.path.join(path, MANIFEST_FILE)
+
+
+def has_manifest(path):
+    """True if ``path`` holds splits written by :func:`save_processed`."""
+    return os.path.exists(manifest_path(path))
+
+
+def save_processed(output_path, X_train, X_test, y_train, y_test, features, target='Efficiency_Status',
+                   categories=None, sample_weight=None):
+    """Write train/test splits as ``.npy`` files plus a JSON manifest.
+
+    Feature matrices are stored column-major so a single feature is one
+    contiguous block of the file; ``load_processed`` can then hand out
+    zero-copy memory-mapped views of whole splits or of single columns.
+    ``categories`` records the label-encoding vocabularies for scoring raw data
+    and ``sample_weight`` optional per-row weights of the train split.
+    """
+    try:
+        os.makedirs(output_path, exist_ok=True)
+        splits = {}
+        for split, X, y in (('train', X_train, y_train), ('test', X_test, y_test)):
+            X = np.asfortranarray(X, dtype=np.float64)
+            y = np.ascontiguousarray(y, dtype=np.int64)
+            np.save(os.path.join(output_path, f"X_{split}.npy"), X)
+            np.save(os.path.join(output_path, f"y_{split}.npy"), y)
+            splits[split] = {
+                "X": f"X_{split}.npy",
+                "y": f"y_{split}.npy",
+                "rows": int(X.shape[0]),
+                "X_dtype": str(X.dtype),
+                "y_dtype": str(y.dtype),
+                "order": "F",
+            }
+        weight_path = os.path.join(output_path, "w_train.npy")
+        if sample_weight is not None:
+            np.save(weight_path, np.asarray(sample_weight, dtype=np.float64))
+            splits['train']["sample_weight"] = "w_train.npy"
+        elif os.path.exists(weight_path):
+            os.remove(weight_path)
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "features": list(features),
+            "target": target,
+            "categories": categories,
+            "splits": splits,
+        }
+        with open(manifest_path(output_path), "w") as f:
+            json.dump(manifest, f, indent=2)
+        logger.info(f"Processed splits saved to {output_path} ({splits['train']['rows']} train, {splits['test']['rows']} test rows)")
+        return manifest
+    except Exception as e:
+        logger.error(f"Error saving processed data: {e}")
+        raise CustomException(f"Error saving processed data: {e}", sys)
+
+
+def load_manifest(path):
+    with open(manifest_path(path)) as f:
+        return json.load(f)
+
+
+def load_split(path, split, columns=None, rows=None, mmap_mode='r'):
+    """Open one split as (X, y) memory-mapped arrays.
+
+    ``columns`` is a list of feature names to keep and ``rows`` a slice;
+    without them the returned arrays are views of the files on disk.
+    """
+    try:
+        manifest = load_manifest(path)
+        entry = manifest["splits"][split]
+        X = np.load(os.path.join(path, entry["X"]), mmap_mode=mmap_mode)
+        y = np.load(os.path.join(path, entry["y"]), mmap_mode=mmap_mode)
+
+        if rows is not None:
+            X, y = X[rows], y[rows]
+        if columns is not None:
+            indices = [manifest["features"].index(column) for column in columns]
+            if indices == list(range(indices[0], indices[0] + len(indices))):
+                X = X[:, indices[0]:indices[0] + len(indices)]
+            else:
+                X = X[:, indices]
+        return X, y
+    except Exception as e:
+        logger.error(f"Error loading processed split '{split}': {e}")
+        raise CustomException(f"Error loading processed split '{split}': {e}", sys)
+
+
+def load_sample_weight(path, split='train'):
+    """Per-row weights of a split, or None if it was saved without them."""
+    entry = load_manifest(path)["splits"][split]
+    if "sample_weight" not in entry:
+        return None
+    return np.load(os.path.join(path, entry["sample_weight"]))
+
+
+def load_processed(path, columns=None, rows=None, mmap_mode='r'):
+    """Open all splits and return (X_train, X_test, y_train, y_test)."""
+    X_train, y_train = load_split(path, 'train', columns, rows, mmap_mode)
+    X_test, y_test = load_split(path, 'test', columns, rows, mmap_mode)
+    return X_train, X_test, y_train, y_test
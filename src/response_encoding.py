@@ -0,0 +1,101 @@
+import json
+import numpy as np
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+RESPONSE_FORMATS = ('rows', 'columnar')
+
+
+def _to_builtin(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """JSON bytes for a response body; NumPy arrays and scalars are serialized directly."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_to_builtin, separators=(',', ':')).encode('utf-8')
+
+
+def _as_matrix(probas, n_rows, n_classes):
+    probas = np.asarray(probas, dtype=np.float64)
+    return probas.reshape(n_rows, -1) if n_rows else np.empty((0, n_classes))
+
+
+class ResponseEncoder:
+    """Prediction response bodies built from the model's output arrays.
+
+    Class names, confidences and probabilities are converted once per batch
+    with NumPy instead of per value. ``rows`` gives the usual one object per
+    prediction; ``columnar`` gives one array per field, which skips building
+    a dict per row and is much smaller for large batches. With
+    ``prediction_ids`` every prediction carries the ID its outcome is
+    reported against (see ``src/prediction_log.py``).
+    """
+
+    def __init__(self, labels):
+        self.labels = dict(labels)
+        self.names = [self.labels[i] for i in sorted(self.labels)]
+
+    def single(self, pred_class, pred_proba, prediction_id=None):
+        probas = np.asarray(pred_proba, dtype=np.float64).tolist()
+        pred_class = int(pred_class)
+        body = {
+            "prediction": self.labels.get(pred_class, "Unknown"),
+            "confidence": max(probas),
+            "class": pred_class,
+            "probabilities": dict(zip(self.names, probas)),
+        }
+        if prediction_id is not None:
+            body["prediction_id"] = prediction_id
+        return body
+
+    def rows(self, row_indices, classes, probas, prediction_ids=None):
+        classes = np.asarray(classes).tolist()
+        probas = _as_matrix(probas, len(classes), len(self.names))
+        confidences = probas.max(axis=1, initial=0.0).tolist()
+        names = self.names
+        rows = [
+            {
+                "prediction": self.labels.get(pred_class, "Unknown"),
+                "confidence": confidence,
+                "class": pred_class,
+                "probabilities": dict(zip(names, proba)),
+                "index": index,
+            }
+            for index, pred_class, confidence, proba in zip(row_indices, classes, confidences, probas.tolist())
+        ]
+        if prediction_ids is not None:
+            for row, prediction_id in zip(rows, prediction_ids):
+                row["prediction_id"] = prediction_id
+        return rows
+
+    def columnar(self, row_indices, classes, probas, prediction_ids=None):
+        classes = np.asarray(classes, dtype=np.int64)
+        probas = _as_matrix(probas, len(classes), len(self.names))
+        by_class = np.ascontiguousarray(probas.T)
+        body = {
+            "index": np.asarray(row_indices, dtype=np.int64),
+            "class": classes,
+            "prediction": [self.labels.get(pred_class, "Unknown") for pred_class in classes.tolist()],
+            "confidence": probas.max(axis=1, initial=0.0),
+            "probabilities": {name: by_class[j] for j, name in enumerate(self.names[:len(by_class)])},
+        }
+        if prediction_ids is not None:
+            body["prediction_id"] = list(prediction_ids)
+        return body
+
+    def results(self, row_indices, classes, probas, response_format='rows', prediction_ids=None):
+        if response_format == 'columnar':
+            return self.columnar(row_indices, classes, probas, prediction_ids)
+        return self.rows(row_indices, classes, probas, prediction_ids)
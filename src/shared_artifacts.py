@@ -0,0 +1,57 @@
+import os
+import sys
+import shutil
+import tempfile
+import joblib
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'model-serving')
+KEEP_SNAPSHOTS = 2
+
+
+def snapshot_artifacts(paths, version, snapshot_dir=DEFAULT_SNAPSHOT_DIR, keep=KEEP_SNAPSHOTS):
+    """Copy artifacts into an immutable ``<snapshot_dir>/<version>/`` directory.
+
+    Every worker serving the same version maps the same snapshot files, so
+    the page cache holds one copy of the parameters however many workers run.
+    Snapshots are never modified in place: retraining that rewrites the
+    source files cannot truncate pages a worker has mapped. Returns the
+    snapshot path of each artifact (None for missing ones).
+    """
+    try:
+        target = os.path.join(snapshot_dir, version)
+        if not os.path.isdir(target):
+            os.makedirs(snapshot_dir, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=snapshot_dir)
+            for path in paths:
+                if path and os.path.exists(path):
+                    shutil.copy2(path, os.path.join(staging, os.path.basename(path)))
+            try:
+                os.rename(staging, target)
+                logger.info(f"Artifacts snapshotted to {target}")
+            except OSError:
+                # Another worker published the same version first
+                shutil.rmtree(staging, ignore_errors=True)
+        prune_snapshots(snapshot_dir, keep)
+        return [os.path.join(target, os.path.basename(path)) if path and os.path.exists(path) else None
+                for path in paths]
+    except Exception as e:
+        logger.error(f"Error snapshotting artifacts: {e}")
+        raise CustomException(f"Error snapshotting artifacts: {e}", sys)
+
+
+def prune_snapshots(snapshot_dir, keep=KEEP_SNAPSHOTS):
+    """Remove all but the ``keep`` newest snapshots; mapped files stay valid until unmapped."""
+    snapshots = [os.path.join(snapshot_dir, name) for name in os.listdir(snapshot_dir)
+                 if not name.startswith('.') and os.path.isdir(os.path.join(snapshot_dir, name))]
+    snapshots.sort(key=os.path.getmtime, reverse=True)
+    for path in snapshots[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_shared(path):
+    """Unpickle an artifact with its numpy arrays memory-mapped read-only from the file."""
+    return joblib.load(path, mmap_mode='r')
@@ -1,6 +1,7 @@
 import pytest
 import json
 import numpy as np
+import pandas as pd
 from unittest.mock import patch, MagicMock
 
 import sys
@@ -8,6 +9,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from application import app
+from src.feature_transformer import FeatureTransformer
 
 
 @pytest.fixture
@@ -65,7 +67,7 @@ class TestApplication:
         """Test successful prediction"""
         # Mock model and scaler
         mock_scaler.transform.return_value = np.array([[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]])
-        mock_model.predict.return_value = np.array([1])
+        mock_model.classes_ = np.array([0, 1, 2])
         mock_model.predict_proba.return_value = np.array([[0.1, 0.8, 0.1]])
         
         response = client.post('/predict', 
@@ -81,6 +83,8 @@ class TestApplication:
         assert 'probabilities' in data
         assert data['prediction'] == 'Medium Efficiency'
         assert data['class'] == 1
+        # The class comes from predict_proba, not a second predict pass
+        mock_model.predict.assert_not_called()
 
     @patch('application.model', None)
     @patch('application.scaler', None)
@@ -113,7 +117,7 @@ class TestApplication:
         """Test POST request to index endpoint"""
         # Mock model and scaler
         mock_scaler.transform.return_value = np.array([[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]])
-        mock_model.predict.return_value = np.array([2])
+        mock_model.classes_ = np.array([0, 1, 2])
         mock_model.predict_proba.return_value = np.array([[0.1, 0.2, 0.7]])
         
         response = client.post('/', 
@@ -148,11 +152,13 @@ class TestApplication:
     def test_label_mapping(self, mock_scaler, mock_model, client, sample_prediction_data):
         """Test that label mapping works correctly"""
         mock_scaler.transform.return_value = np.array([[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]])
+        mock_model.classes_ = np.array([0, 1, 2])
         
-        # Test each class
+        # Test each class; the class is derived from the highest probability
         for class_id, expected_label in [(0, 'Low Efficiency'), (1, 'Medium Efficiency'), (2, 'High Efficiency')]:
-            mock_model.predict.return_value = np.array([class_id])
-            mock_model.predict_proba.return_value = np.array([[0.1, 0.1, 0.8]])
+            pred_proba = np.full(3, 0.1)
+            pred_proba[class_id] = 0.8
+            mock_model.predict_proba.return_value = pred_proba.reshape(1, -1)
             
             response = client.post('/predict', 
                                  data=json.dumps(sample_prediction_data),
@@ -169,4 +175,512 @@ class TestApplication:
                              data=sample_prediction_data)  # No JSON content type
         
         # Should handle gracefully or return appropriate error
-        assert response.status_code in [400, 500]
\ No newline at end of file
+        assert response.status_code in [400, 500]
+
+class TestBatchPrediction:
+    """Test suite for the /predict/batch endpoint"""
+
+    @staticmethod
+    def configure_mocks(mock_scaler, mock_model):
+        mock_scaler.transform.side_effect = lambda X: X
+        mock_model.classes_ = np.array([0, 1, 2])
+        mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.8, 0.1], (len(X), 1))
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_json_array(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test a JSON array batch is scored in a single pass"""
+        self.configure_mocks(mock_scaler, mock_model)
+
+        response = client.post('/predict/batch',
+                               data=json.dumps([sample_prediction_data] * 3),
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['count'] == 3
+        assert data['succeeded'] == 3
+        assert data['errors'] == []
+        assert [result['index'] for result in data['results']] == [0, 1, 2]
+        assert data['results'][0]['prediction'] == 'Medium Efficiency'
+        assert mock_scaler.transform.call_count == 1
+        assert mock_scaler.transform.call_args[0][0].shape == (3, 14)
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_ndjson_with_bad_rows(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test per-row errors for invalid NDJSON lines and records"""
+        self.configure_mocks(mock_scaler, mock_model)
+        missing = dict(sample_prediction_data)
+        del missing['Temperature_C']
+        non_numeric = dict(sample_prediction_data, Vibration_Hz='high')
+        body = "\n".join([
+            json.dumps(sample_prediction_data),
+            '{not json',
+            json.dumps(missing),
+            json.dumps(non_numeric),
+            json.dumps(sample_prediction_data),
+        ])
+
+        response = client.post('/predict/batch', data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['count'] == 5
+        assert [result['index'] for result in data['results']] == [0, 4]
+        assert [error['index'] for error in data['errors']] == [1, 2, 3]
+        assert 'Temperature_C' in data['errors'][1]['error']
+
+    @patch('application.MAX_BATCH_SIZE', 2)
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_too_large(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test that batches above the configured maximum are rejected"""
+        response = client.post('/predict/batch',
+                               data=json.dumps([sample_prediction_data] * 3),
+                               content_type='application/json')
+
+        assert response.status_code == 413
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_invalid_payload(self, mock_scaler, mock_model, client):
+        """Test that a non-list payload is rejected"""
+        response = client.post('/predict/batch',
+                               data=json.dumps({'invalid': 'data'}),
+                               content_type='application/json')
+
+        assert response.status_code == 400
+
+
+class TestResponseFormats:
+    """Test batch response shapes and the validation error path"""
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_columnar_batch(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test ?format=columnar returns one array per field"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        records = [sample_prediction_data, {'Temperature_C': 1.0}, sample_prediction_data]
+
+        response = client.post('/predict/batch?format=columnar', data=json.dumps(records),
+                               content_type='application/json')
+        rows = json.loads(client.post('/predict/batch', data=json.dumps(records),
+                                      content_type='application/json').data)
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['errors'] == rows['errors']
+        assert data['results']['index'] == [result['index'] for result in rows['results']]
+        assert data['results']['prediction'] == [result['prediction'] for result in rows['results']]
+        assert data['results']['probabilities']['Medium Efficiency'] == [0.8, 0.8]
+
+    def test_unknown_response_format(self, client, sample_prediction_data):
+        response = client.post('/predict/batch?format=xml', data=json.dumps([sample_prediction_data]),
+                               content_type='application/json')
+        assert response.status_code == 400
+
+    @patch('application.logging')
+    def test_invalid_input_rejected_before_model(self, mock_logging, client):
+        """Test invalid input is answered without raising or logging at error level"""
+        with patch('application.predict_row') as mock_predict:
+            response = client.post('/predict', data='not json', content_type='application/json')
+
+        assert response.status_code == 400
+        assert json.loads(response.data) == {'error': 'Record must be a JSON object'}
+        mock_predict.assert_not_called()
+        mock_logging.error.assert_not_called()
+
+
+class TestSchemaValidation:
+    """Test requests are checked against the training feature schema"""
+
+    @pytest.fixture
+    def schema(self, sample_prediction_data):
+        from src.feature_schema import FeatureSchema
+        from src.feature_transformer import FEATURES
+        row = np.array([sample_prediction_data[name] for name in FEATURES], dtype=float)
+        return FeatureSchema.from_bounds(row - 1, row + 1, {'Operation_Mode': ['Active', 'Idle']})
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_rejects_out_of_range_rows(self, mock_scaler, mock_model, client, schema,
+                                             sample_prediction_data):
+        """Test bad rows get per-field errors while the rest of the batch is scored"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        hot = dict(sample_prediction_data, Temperature_C=500.0, Hour=30)
+        records = [sample_prediction_data, hot, {'Temperature_C': 1.0}, sample_prediction_data]
+
+        with patch('application.feature_schema', schema):
+            response = client.post('/predict/batch', data=json.dumps(records), content_type='application/json')
+
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert [result['index'] for result in data['results']] == [0, 3]
+        assert [error['index'] for error in data['errors']] == [1, 2]
+        assert set(data['errors'][0]['fields']) == {'Temperature_C', 'Hour'}
+        assert data['errors'][0]['fields']['Hour'] == 'above maximum 23'
+        assert mock_scaler.transform.call_args[0][0].shape == (2, 14)
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_single_prediction_rejected(self, mock_scaler, mock_model, client, schema, sample_prediction_data):
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+
+        with patch('application.feature_schema', schema):
+            response = client.post('/predict', data=json.dumps(dict(sample_prediction_data, Operation_Mode=5)),
+                                   content_type='application/json')
+
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'Invalid features: Operation_Mode unknown code 5'
+        mock_model.predict_proba.assert_not_called()
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_array_valued_fields_rejected(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test list-valued features and timestamps get a 400 / per-row error instead of a server error"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        listed = dict(sample_prediction_data, Temperature_C=[1, 2])
+        stamped = {key: value for key, value in sample_prediction_data.items()
+                   if key not in ('Year', 'Month', 'Day', 'Hour')}
+        stamped['Timestamp'] = [1, 2]
+
+        for record in (listed, stamped):
+            predict = client.post('/predict', data=json.dumps(record), content_type='application/json')
+            index = client.post('/', data=json.dumps(record), content_type='application/json')
+            assert predict.status_code == 400
+            assert predict.content_type == 'application/json'
+            assert index.status_code == 400
+            assert json.loads(index.data) == {'error': 'Invalid input data'}
+        assert json.loads(client.post('/predict', data=json.dumps(stamped),
+                                      content_type='application/json').data)['error'] == 'Invalid Timestamp'
+
+        response = client.post('/predict/batch', data=json.dumps([sample_prediction_data, listed, stamped]),
+                               content_type='application/json')
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert [result['index'] for result in data['results']] == [0]
+        assert data['errors'] == [{'index': 1, 'error': 'Feature values must be numeric'},
+                                  {'index': 2, 'error': 'Invalid Timestamp'}]
+
+
+class TestBinaryPrediction:
+    """Test float32 binary request bodies"""
+
+    @staticmethod
+    def encode(record, rows=1):
+        from src.feature_transformer import FEATURES, encode_feature_matrix
+        return encode_feature_matrix([[record[name] for name in FEATURES]] * rows)
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_binary_single_prediction(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test a single float32 row matches the JSON response"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+
+        response = client.post('/predict', data=self.encode(sample_prediction_data),
+                               content_type='application/x-float32')
+        scaled = mock_scaler.transform.call_args[0][0]
+        expected = client.post('/predict', data=json.dumps(sample_prediction_data),
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        data, expected = json.loads(response.data), json.loads(expected.data)
+        # Every request gets its own prediction ID
+        assert data.pop('prediction_id') != expected.pop('prediction_id')
+        assert data == expected
+        assert scaled.dtype == np.float32 and scaled.shape == (1, 14)
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_binary_batch(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test a float32 batch reports invalid rows without failing the batch"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        from src.feature_transformer import decode_feature_matrix, encode_feature_matrix
+        X = decode_feature_matrix(self.encode(sample_prediction_data, rows=3)).copy()
+        X[1, 2] = np.inf
+
+        response = client.post('/predict/batch', data=encode_feature_matrix(X),
+                               content_type='application/x-float32')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert (data['count'], data['succeeded'], data['failed']) == (3, 2, 1)
+        assert [result['index'] for result in data['results']] == [0, 2]
+        assert data['errors'] == [{'index': 1, 'error': 'Feature values must be numeric'}]
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_binary_body_errors(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test truncated bodies and multi-row /predict bodies are rejected"""
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+
+        truncated = client.post('/predict/batch', data=self.encode(sample_prediction_data)[:-1],
+                                content_type='application/x-float32')
+        two_rows = client.post('/predict', data=self.encode(sample_prediction_data, rows=2),
+                               content_type='application/x-float32')
+
+        assert truncated.status_code == 400
+        assert 'multiple of 56 bytes' in json.loads(truncated.data)['error']
+        assert two_rows.status_code == 400
+
+
+class TestRawFeaturePrediction:
+    """Test raw Timestamp and Operation_Mode inputs through the feature transformer"""
+
+    @patch('application.feature_transformer', FeatureTransformer({'Operation_Mode': ['Active', 'Idle']}))
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predict_raw_fields(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test raw and pre-encoded records produce the same feature row"""
+        mock_scaler.transform.side_effect = lambda X: X
+        mock_model.classes_ = np.array([0, 1, 2])
+        mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.2, 0.7], (len(X), 1))
+        raw = {key: value for key, value in sample_prediction_data.items()
+               if key not in ('Year', 'Month', 'Day', 'Hour')}
+        raw.update(Operation_Mode='Idle', Timestamp='2024-01-01 12:30:00')
+
+        response = client.post('/predict/batch',
+                               data=json.dumps([raw, sample_prediction_data, dict(raw, Operation_Mode='Turbo')]),
+                               content_type='application/json')
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [result['index'] for result in data['results']] == [0, 1]
+        assert data['errors'] == [{'index': 2, 'error': 'Unknown Operation_Mode'}]
+        rows = mock_scaler.transform.call_args[0][0]
+        np.testing.assert_array_equal(rows[0], rows[1])
+
+
+class TestPredictionCacheIntegration:
+    """Test /predict answered from the prediction cache"""
+
+    @patch('application.PREDICTION_CACHE', True)
+    @patch('application.prediction_cache', None)
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_repeated_request_hits_cache(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test identical frames are scored once and the cache resets on a model change"""
+        import application
+
+        mock_scaler.transform.side_effect = lambda X: X
+        mock_model.classes_ = np.array([0, 1, 2])
+        mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.2, 0.7], (len(X), 1))
+
+        for _ in range(3):
+            response = client.post('/predict', data=json.dumps(sample_prediction_data),
+                                   content_type='application/json')
+            assert response.status_code == 200
+            assert json.loads(response.data)['class'] == 2
+
+        assert mock_model.predict_proba.call_count == 1
+        stats = json.loads(client.get('/health').data)['prediction_cache']
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+
+        new_model = MagicMock(classes_=np.array([0, 1, 2]))
+        new_model.predict_proba.side_effect = lambda X: np.tile([0.8, 0.1, 0.1], (len(X), 1))
+        with patch('application.model', new_model):
+            response = client.post('/predict', data=json.dumps(sample_prediction_data),
+                                   content_type='application/json')
+        assert json.loads(response.data)['class'] == 0
+        assert application.prediction_cache.stats()['invalidations'] == 1
+
+
+class TestModelReload:
+    """Test the admin reload endpoint and version reporting"""
+
+    def test_reload_requires_token(self, client):
+        with patch('application.ADMIN_TOKEN', None):
+            assert client.post('/admin/reload').status_code == 403
+        with patch('application.ADMIN_TOKEN', 'secret'):
+            response = client.post('/admin/reload', headers={'X-Admin-Token': 'wrong'})
+            assert response.status_code == 403
+
+    @patch('application.ADMIN_TOKEN', 'secret')
+    def test_reload_swaps_model(self, client, temp_dir):
+        """Test a reload publishes the new bundle to the request path"""
+        import application
+        from src.model_registry import ModelRegistry
+        from tests.test_model_registry import write_artifacts
+
+        model_path = os.path.join(temp_dir, 'model.pkl')
+        scaler_path = os.path.join(temp_dir, 'scaler.pkl')
+        write_artifacts(model_path, scaler_path, n_features=14)
+        registry = ModelRegistry(model_path, scaler_path, on_swap=application.publish_bundle)
+
+        saved = (application.model, application.scaler, application.feature_transformer, application.engine)
+        try:
+            with patch('application.registry', registry):
+                response = client.post('/admin/reload', headers={'X-Admin-Token': 'secret'})
+                assert response.status_code == 200
+                data = json.loads(response.data)
+                assert data['reloaded'] is True
+                assert application.get_engine() is registry.current.engine
+
+                health = json.loads(client.get('/health').data)
+                assert health['model_version'] == data['version']
+        finally:
+            application.model, application.scaler, application.feature_transformer, application.engine = saved
+
+
+class TestMicroBatchingIntegration:
+    """Test /predict routed through the micro-batcher"""
+
+    @patch('application.MICRO_BATCHING', True)
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predict_through_batcher(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test the single-request contract is unchanged with batching enabled"""
+        import application
+
+        mock_scaler.transform.side_effect = lambda X: X
+        mock_model.classes_ = np.array([0, 1, 2])
+        mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.2, 0.7], (len(X), 1))
+
+        try:
+            response = client.post('/predict',
+                                   data=json.dumps(sample_prediction_data),
+                                   content_type='application/json')
+            health = json.loads(client.get('/health').data)
+        finally:
+            application.batcher.close()
+            application.batcher = None
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['prediction'] == 'High Efficiency'
+        assert data['class'] == 2
+        assert health['micro_batching']['requests'] == 1
+
+
+class TestMetricsEndpoint:
+    """Test the Prometheus /metrics endpoint"""
+
+    @staticmethod
+    def scrape(client):
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        samples = {}
+        for line in response.data.decode().splitlines():
+            if line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_prediction_metrics(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test requests, errors, rows and stage timings are counted"""
+        mock_scaler.transform.side_effect = lambda X: X
+        mock_model.classes_ = np.array([0, 1, 2])
+        mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.2, 0.7], (len(X), 1))
+
+        before = self.scrape(client)
+        client.post('/predict', data=json.dumps(sample_prediction_data), content_type='application/json')
+        client.post('/predict', data=json.dumps({'Temperature_C': 1.0}), content_type='application/json')
+        client.post('/predict/batch', data=json.dumps([sample_prediction_data] * 3),
+                    content_type='application/json')
+        after = self.scrape(client)
+
+        def delta(name):
+            return after[name] - before.get(name, 0)
+
+        assert delta('prediction_requests_total{endpoint="predict"}') == 2
+        assert delta('prediction_errors_total{endpoint="predict"}') == 1
+        assert delta('prediction_requests_total{endpoint="predict_batch"}') == 1
+        assert delta('prediction_rows_total') == 4
+        assert delta('prediction_batch_rows_count') == 1
+        assert delta('prediction_batch_rows_sum') == 3
+        for stage in ('parse', 'scale', 'model', 'serialize'):
+            assert delta(f'prediction_stage_seconds_count{{stage="{stage}"}}') == 2
+        assert 'serving_workers' in after
+
+
+class TestDriftEndpoint:
+    """Test the /drift endpoint"""
+
+    def test_drift_disabled(self, client):
+        with patch('application.drift_monitor', None):
+            response = client.get('/drift')
+        assert response.status_code == 404
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_scored_rows_are_monitored(self, mock_scaler, mock_model, client, sample_prediction_data):
+        """Test valid rows reach the monitor and only the background update changes the report"""
+        from src.drift import DriftReference, DriftMonitor
+        from src.feature_transformer import FEATURES
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        X = np.array([[sample_prediction_data[name] for name in FEATURES]] * 10, dtype=np.float64)
+        monitor = DriftMonitor(DriftReference.from_sample(X).update(X), interval_seconds=3600)
+
+        with patch('application.drift_monitor', monitor):
+            client.post('/predict', data=json.dumps(sample_prediction_data), content_type='application/json')
+            client.post('/predict/batch', data=json.dumps([sample_prediction_data, {'Temperature_C': 'hot'}] * 2),
+                        content_type='application/json')
+            before = json.loads(client.get('/drift').data)
+            monitor.update()
+            response = client.get('/drift')
+            monitor.stop()
+
+        assert before['window_rows'] == 0
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['reference_rows'] == 10
+        assert data['window_rows'] == pytest.approx(3, rel=1e-3)
+        assert data['features']['Temperature_C']['psi'] == pytest.approx(0.0)
+
+
+class TestPredictionLogging:
+    """Test served predictions are written to the prediction log"""
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predictions_logged(self, mock_scaler, mock_model, client, sample_prediction_data, temp_dir):
+        from src.prediction_log import PredictionLogger, read_prediction_logs
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        prediction_logger = PredictionLogger(temp_dir, flush_interval=3600)
+
+        with patch('application.prediction_logger', prediction_logger):
+            client.post('/predict', data=json.dumps(sample_prediction_data), content_type='application/json')
+            client.post('/predict/batch', data=json.dumps([sample_prediction_data, {'Temperature_C': 'hot'}] * 2),
+                        content_type='application/json')
+            health = json.loads(client.get('/health').data)
+            prediction_logger.stop()
+
+        assert health['prediction_log']['logged_rows'] == 3
+        df = read_prediction_logs(temp_dir)
+        assert len(df) == 3
+        assert list(df['Predicted_Status']) == ['1', '1', '1']
+        assert df['Efficiency_Status'].isna().all()
+        assert df['Temperature_C'].tolist() == [75.5] * 3
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_outcomes_reported_by_returned_id(self, mock_scaler, mock_model, client, sample_prediction_data,
+                                              temp_dir):
+        """Test the prediction_id in the response is the key the logged row is labelled by"""
+        from src.prediction_log import PredictionLogger, read_prediction_logs
+        TestBatchPrediction.configure_mocks(mock_scaler, mock_model)
+        prediction_logger = PredictionLogger(temp_dir, flush_interval=3600)
+        record = {name: value for name, value in sample_prediction_data.items()
+                  if name not in ('Year', 'Month', 'Day', 'Hour')}
+        record.update(Machine_ID='M-7', Timestamp='2024-01-01 12:34:56')
+
+        with patch('application.prediction_logger', prediction_logger):
+            single = json.loads(client.post('/predict', data=json.dumps(record),
+                                            content_type='application/json').data)
+            batch = json.loads(client.post('/predict/batch', data=json.dumps([{}, record]),
+                                           content_type='application/json').data)
+            prediction_logger.stop()
+
+        returned = [single['prediction_id'], batch['results'][0]['prediction_id']]
+        assert batch['results'][0]['index'] == 1 and returned[1].endswith('-1')
+        outcomes = pd.DataFrame({'Prediction_ID': returned, 'Efficiency_Status': ['Low', 'High']})
+        df = read_prediction_logs(temp_dir, outcomes=outcomes)
+        assert df['Prediction_ID'].tolist() == returned
+        assert df['Efficiency_Status'].tolist() == ['Low', 'High']
+        assert df['Machine_ID'].tolist() == ['M-7', 'M-7']
+        assert df['Timestamp'].tolist() == ['2024-01-01 12:34:56'] * 2
@@ -0,0 +1,230 @@
+import pytest
+import asyncio
+import json
+import threading
+import numpy as np
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from asgi_application import AsyncPredictionApp
+
+
+def call(app, method, path, body=b"", content_type="application/json", query=b"", raw=False):
+    """Drive the ASGI app for one request and return (status, json body), or (status, headers, bytes) if ``raw``"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"content-type", content_type.encode())],
+        "query_string": query,
+    }
+    asyncio.run(app(scope, receive, send))
+    if raw:
+        return sent[0]["status"], dict(sent[0]["headers"]), sent[1]["body"]
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def scrape(app):
+    """Prometheus samples from the ASGI /metrics route"""
+    status, headers, body = call(app, "GET", "/metrics", raw=True)
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"text/plain")
+    samples = {}
+    for line in body.decode().splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+@pytest.fixture
+def flask_client():
+    import application
+    application.app.config['TESTING'] = True
+    with application.app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def asgi_app():
+    app = AsyncPredictionApp(inference_threads=2, max_pending=4)
+    yield app
+    app.executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def sample_record():
+    return {
+        'Operation_Mode': 1, 'Temperature_C': 75.5, 'Vibration_Hz': 2.8,
+        'Power_Consumption_kW': 5.2, 'Network_Latency_ms': 15.3, 'Packet_Loss_%': 1.2,
+        'Quality_Control_Defect_Rate_%': 3.5, 'Production_Speed_units_per_hr': 350.0,
+        'Predictive_Maintenance_Score': 0.85, 'Error_Rate_%': 5.2,
+        'Year': 2024, 'Month': 1, 'Day': 1, 'Hour': 12
+    }
+
+
+def configure_mocks(mock_scaler, mock_model):
+    mock_scaler.transform.side_effect = lambda X: X
+    mock_model.classes_ = np.array([0, 1, 2])
+    mock_model.predict_proba.side_effect = lambda X: np.tile([0.1, 0.8, 0.1], (len(X), 1))
+
+
+class TestAsyncPredictionApp:
+    """Test suite for the ASGI serving mode"""
+
+    def test_health(self, asgi_app):
+        """Test the health route matches the Flask contract"""
+        status, data = call(asgi_app, "GET", "/health")
+
+        assert status == 200
+        assert 'model_loaded' in data
+        assert 'scaler_loaded' in data
+
+    def test_unknown_route(self, asgi_app):
+        """Test unknown routes return 404"""
+        status, _ = call(asgi_app, "GET", "/nope")
+
+        assert status == 404
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predict(self, mock_scaler, mock_model, asgi_app, sample_record):
+        """Test single prediction offloaded to the executor"""
+        configure_mocks(mock_scaler, mock_model)
+
+        status, data = call(asgi_app, "POST", "/predict", json.dumps(sample_record).encode())
+
+        assert status == 200
+        assert data['prediction'] == 'Medium Efficiency'
+        assert data['class'] == 1
+        assert set(data['probabilities']) == {'Low Efficiency', 'Medium Efficiency', 'High Efficiency'}
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predict_batch_ndjson(self, mock_scaler, mock_model, asgi_app, sample_record):
+        """Test batch prediction with newline-delimited JSON"""
+        configure_mocks(mock_scaler, mock_model)
+        body = "\n".join([json.dumps(sample_record), json.dumps({'Temperature_C': 1})]).encode()
+
+        status, data = call(asgi_app, "POST", "/predict/batch", body, "application/x-ndjson")
+
+        assert status == 200
+        assert data['succeeded'] == 1
+        assert data['errors'][0]['index'] == 1
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_batch_parsed_off_event_loop(self, mock_scaler, mock_model, asgi_app, sample_record):
+        """Test batch parsing runs on an inference thread together with scoring"""
+        import application
+        configure_mocks(mock_scaler, mock_model)
+        parse_threads = []
+        parse = application.parse_batch_records
+
+        def recording_parse(*args):
+            parse_threads.append(threading.current_thread().name)
+            return parse(*args)
+
+        with patch('application.parse_batch_records', side_effect=recording_parse):
+            status, data = call(asgi_app, "POST", "/predict/batch", json.dumps([sample_record] * 2).encode())
+
+        assert status == 200
+        assert data['succeeded'] == 2
+        assert parse_threads and parse_threads[0].startswith("inference")
+
+    @patch('application.model', None)
+    @patch('application.scaler', None)
+    def test_predict_model_not_loaded(self, asgi_app, sample_record):
+        """Test prediction when model is not loaded"""
+        status, data = call(asgi_app, "POST", "/predict", json.dumps(sample_record).encode())
+
+        assert status == 500
+        assert data['error'] == 'Model not loaded'
+
+    @pytest.mark.parametrize("path,body,content_type,query", [
+        ("/predict", b"not json", "application/json", b""),
+        ("/predict", json.dumps({'Temperature_C': [1, 2]}).encode(), "application/json", b""),
+        ("/predict", b"\x00" * 5, "application/octet-stream", b""),
+        ("/predict/batch", b"{}", "application/json", b""),
+        ("/predict/batch", b"[]", "application/json", b"format=xml"),
+    ])
+    def test_rejections_match_flask(self, flask_client, asgi_app, path, body, content_type, query):
+        """Test invalid requests get the same status and error body as the Flask app, and are counted"""
+        name = 'prediction_errors_total{endpoint="%s"}' % ('predict' if path == '/predict' else 'predict_batch')
+        before = scrape(asgi_app)
+
+        status, data = call(asgi_app, "POST", path, body, content_type, query)
+        flask_response = flask_client.post(f"{path}?{query.decode()}", data=body, content_type=content_type)
+
+        assert status == flask_response.status_code == 400
+        assert data == json.loads(flask_response.data)
+        assert set(data) == {'error'}
+        assert scrape(asgi_app)[name] - before.get(name, 0) == 2
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_predict_batch_columnar(self, mock_scaler, mock_model, flask_client, asgi_app, sample_record):
+        """Test ?format=columnar returns the same body as the Flask app"""
+        configure_mocks(mock_scaler, mock_model)
+        body = json.dumps([sample_record, sample_record]).encode()
+
+        status, data = call(asgi_app, "POST", "/predict/batch", body, query=b"format=columnar")
+
+        expected = json.loads(flask_client.post('/predict/batch?format=columnar', data=body,
+                                                content_type='application/json').data)
+        assert status == 200
+        assert len(set(data['results'].pop('prediction_id'))) == 2
+        expected['results'].pop('prediction_id')
+        assert data == expected
+        assert data['results']['index'] == [0, 1]
+
+    @patch('application.model')
+    @patch('application.scaler')
+    def test_metrics(self, mock_scaler, mock_model, asgi_app, sample_record):
+        """Test requests and stage timings are recorded and exposed on /metrics"""
+        configure_mocks(mock_scaler, mock_model)
+        before = scrape(asgi_app)
+
+        call(asgi_app, "POST", "/predict", json.dumps(sample_record).encode())
+        call(asgi_app, "POST", "/predict/batch", json.dumps([sample_record] * 3).encode())
+        after = scrape(asgi_app)
+
+        def delta(name):
+            return after[name] - before.get(name, 0)
+
+        assert delta('prediction_requests_total{endpoint="predict"}') == 1
+        assert delta('prediction_requests_total{endpoint="predict_batch"}') == 1
+        assert delta('prediction_rows_total') == 4
+        assert delta('prediction_batch_rows_sum') == 3
+        for stage in ('parse', 'serialize'):
+            assert delta('prediction_stage_seconds_count{stage="%s"}' % stage) == 2
+
+    def test_lifespan_starts_model_watcher(self, asgi_app):
+        """Test startup runs the per-process background threads, including the artifact watcher"""
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        with patch('application.start_model_watcher') as start_watcher, \
+                patch('application.start_drift_monitor'), patch('application.start_prediction_logger'):
+            asyncio.run(asgi_app({"type": "lifespan"}, receive, send))
+
+        start_watcher.assert_called_once()
+        assert [message["type"] for message in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+import joblib
+import os
+from sklearn.linear_model import LogisticRegression
+
+from src.data_processing import DataProcessing, FEATURES
+from src.processed_store import load_processed
+from src.inference import InferenceEngine
+from src.bulk_scoring import BulkScorer, load_categories, load_feature_transformer, score_chunk
+from src.exception import CustomException
+
+
+@pytest.fixture
+def trained_artifacts(sample_csv_file, temp_dir):
+    """Processed data, scaler and a fitted model built from the sample CSV"""
+    processed_path = os.path.join(temp_dir, 'processed')
+    model_path = os.path.join(temp_dir, 'model', 'model.pkl')
+    DataProcessing(sample_csv_file, processed_path).run()
+
+    X_train, _, y_train, _ = load_processed(processed_path)
+    os.makedirs(os.path.dirname(model_path))
+    joblib.dump(LogisticRegression(max_iter=1000).fit(X_train, y_train), model_path)
+    return processed_path, model_path
+
+
+class TestBulkScoring:
+    """Test suite for the bulk scoring CLI"""
+
+    def scorer(self, sample_csv_file, trained_artifacts, output_path, **kwargs):
+        processed_path, model_path = trained_artifacts
+        return BulkScorer(sample_csv_file, output_path, model_path=model_path,
+                          scaler_path=os.path.join(processed_path, 'scaler.pkl'),
+                          processed_data_path=processed_path, **kwargs)
+
+    def test_categories_recorded_in_manifest(self, trained_artifacts):
+        categories = load_categories(trained_artifacts[0])
+        assert categories['Operation_Mode'] == ['0', '1']
+        assert categories['Efficiency_Status'] == ['0', '1', '2']
+
+    def test_missing_categories(self, temp_dir):
+        with pytest.raises(CustomException):
+            load_categories(temp_dir)
+
+    def test_matches_processed_features(self, sample_csv_file, trained_artifacts, temp_dir):
+        """Scoring raw rows gives the same classes as scoring the processed matrix"""
+        processed_path, model_path = trained_artifacts
+        output_path = os.path.join(temp_dir, 'scores.csv')
+        stats = self.scorer(sample_csv_file, trained_artifacts, output_path, chunksize=30, n_jobs=1).run()
+
+        scores = pd.read_csv(output_path)
+        assert stats['rows'] == len(scores) == 100
+        assert stats['failed'] == 0
+        assert stats['rows_per_sec'] > 0
+
+        processor = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'check'))
+        processor.load_data()
+        X = processor.preprocess_data()[FEATURES]
+        engine = InferenceEngine(joblib.load(model_path), joblib.load(os.path.join(processed_path, 'scaler.pkl')))
+        classes, proba = engine.predict(X.to_numpy(dtype=np.float64))
+        np.testing.assert_array_equal(scores['class'], classes)
+        np.testing.assert_allclose(scores[['proba_0', 'proba_1', 'proba_2']], proba)
+
+    def test_parallel_matches_serial(self, sample_csv_file, trained_artifacts, temp_dir):
+        serial_path = os.path.join(temp_dir, 'serial.csv')
+        parallel_path = os.path.join(temp_dir, 'parallel.csv')
+        self.scorer(sample_csv_file, trained_artifacts, serial_path, chunksize=25, n_jobs=1).run()
+        self.scorer(sample_csv_file, trained_artifacts, parallel_path, chunksize=25, n_jobs=2).run()
+        pd.testing.assert_frame_equal(pd.read_csv(serial_path), pd.read_csv(parallel_path))
+
+    def test_unknown_mode_is_not_scored(self, trained_artifacts, sample_data):
+        processed_path, model_path = trained_artifacts
+        engine = InferenceEngine(joblib.load(model_path), joblib.load(os.path.join(processed_path, 'scaler.pkl')))
+        chunk = sample_data.head(3).astype({'Operation_Mode': str, 'Timestamp': str})
+        chunk.loc[1, 'Operation_Mode'] = 'Overdrive'
+
+        scored = score_chunk(chunk, engine, load_feature_transformer(processed_path))
+        assert list(scored['class'] >= 0) == [True, False, True]
+        assert scored.loc[1, 'prediction'] == ''
+        assert np.isnan(scored.loc[1, 'confidence'])
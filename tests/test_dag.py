@@ -0,0 +1,133 @@
+import pytest
+import json
+import os
+import time
+
+from pipeline.dag import Stage, DagScheduler
+
+
+def sleep_stage(seconds, value=None):
+    time.sleep(seconds)
+    return value
+
+
+def failing_stage():
+    raise ValueError("boom")
+
+
+class TestDagScheduler:
+    """Test suite for the DAG stage scheduler"""
+
+    def test_dependencies_from_artifacts(self):
+        """Test edges are derived from produced and consumed artifacts"""
+        stages = [
+            Stage("a", sleep_stage, outputs=["out/a"], kwargs={"seconds": 0}),
+            Stage("b", sleep_stage, inputs=["out/a"], outputs=["out/b"], kwargs={"seconds": 0}),
+            Stage("c", sleep_stage, inputs=["out/a", "raw.csv"], outputs=["out/c"], kwargs={"seconds": 0}),
+            Stage("d", sleep_stage, inputs=["out/b", "out/c"], kwargs={"seconds": 0}),
+        ]
+        scheduler = DagScheduler(stages, executor="thread")
+
+        assert scheduler.dependencies == {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+        assert scheduler.order == ["a", "b", "c", "d"]
+
+    def test_cycle_detection(self):
+        """Test cyclic artifact dependencies are rejected"""
+        stages = [
+            Stage("a", sleep_stage, inputs=["b.out"], outputs=["a.out"]),
+            Stage("b", sleep_stage, inputs=["a.out"], outputs=["b.out"]),
+        ]
+        with pytest.raises(Exception):
+            DagScheduler(stages)
+
+    def test_independent_stages_run_concurrently(self):
+        """Test independent stages overlap in a process pool"""
+        stages = [
+            Stage("first", sleep_stage, outputs=["x"], kwargs={"seconds": 0.05, "value": 1}),
+            Stage("left", sleep_stage, inputs=["x"], outputs=["l"], kwargs={"seconds": 0.4, "value": 2}),
+            Stage("right", sleep_stage, inputs=["x"], outputs=["r"], kwargs={"seconds": 0.4, "value": 3}),
+        ]
+        scheduler = DagScheduler(stages, max_workers=2)
+
+        results = scheduler.run()
+
+        assert results == {"first": 1, "left": 2, "right": 3}
+        assert scheduler.timings["left"]["start"] >= scheduler.timings["first"]["end"]
+        assert scheduler.timings["left"]["start"] < scheduler.timings["right"]["end"]
+        assert scheduler.wall_time < 0.8 + 0.05 + 0.3
+
+    def test_queued_stage_timed_from_worker_start(self):
+        """Test a stage waiting for a free worker is not charged for the wait"""
+        stages = [
+            Stage("a", sleep_stage, outputs=["a"], kwargs={"seconds": 0.2}),
+            Stage("b", sleep_stage, outputs=["b"], kwargs={"seconds": 0.01}),
+        ]
+        scheduler = DagScheduler(stages, max_workers=1, executor="thread")
+        scheduler.run()
+
+        assert scheduler.timings["b"]["start"] >= scheduler.timings["a"]["end"]
+        assert scheduler.timings["b"]["duration"] < 0.1
+
+    def test_critical_path(self):
+        """Test the critical path follows the longest dependent chain"""
+        stages = [
+            Stage("a", sleep_stage, outputs=["a"], kwargs={"seconds": 0.01}),
+            Stage("slow", sleep_stage, inputs=["a"], outputs=["s"], kwargs={"seconds": 0.2}),
+            Stage("fast", sleep_stage, inputs=["a"], outputs=["f"], kwargs={"seconds": 0.01}),
+            Stage("end", sleep_stage, inputs=["s", "f"], kwargs={"seconds": 0.01}),
+        ]
+        scheduler = DagScheduler(stages, executor="thread")
+        scheduler.run()
+
+        path, total = scheduler.critical_path()
+
+        assert path == ["a", "slow", "end"]
+        assert total >= 0.22
+
+    def test_failure_propagates(self):
+        """Test a failing stage stops the run"""
+        stages = [
+            Stage("ok", sleep_stage, outputs=["ok"], kwargs={"seconds": 0}),
+            Stage("bad", failing_stage, inputs=["ok"]),
+        ]
+        with pytest.raises(Exception, match="bad"):
+            DagScheduler(stages, executor="thread").run()
+
+
+class TestCandidatePipeline:
+    """Test the parallel candidate training pipeline"""
+
+    def test_run_selects_best_candidate(self, sample_csv_file, temp_dir):
+        """Test every candidate is trained and the best one is selected"""
+        from pipeline.candidate_pipeline import CandidatePipeline
+
+        model_path = os.path.join(temp_dir, 'model')
+        pipeline = CandidatePipeline(sample_csv_file, os.path.join(temp_dir, 'processed'), model_path,
+                                     candidates=["logistic_regression", "random_forest"], max_workers=2)
+
+        best = pipeline.run()
+
+        with open(os.path.join(model_path, 'selection.json')) as f:
+            selection = json.load(f)
+        assert selection['best'] == best['model']
+        assert {c['model'] for c in selection['candidates']} == {"logistic_regression", "random_forest"}
+        # Selection never looks at the test split
+        assert best['validation']['f1'] == max(c['validation']['f1'] for c in selection['candidates'])
+        assert set(best['test']) == {'accuracy', 'f1'}
+        assert os.path.exists(os.path.join(model_path, 'best_model.pkl'))
+        assert pipeline.scheduler.critical_path()[0][0] == 'process_data'
+
+    def test_selection_ignores_test_metrics(self, temp_dir):
+        """Test the winner is picked on validation scores even when the test split disagrees"""
+        from pipeline.candidate_pipeline import select_model_stage
+
+        candidates_path = os.path.join(temp_dir, 'candidates')
+        os.makedirs(candidates_path)
+        for name, validation, test in (("a", 0.9, 0.5), ("b", 0.6, 0.95)):
+            with open(os.path.join(candidates_path, f"{name}.json"), "w") as f:
+                json.dump({"model": name, "validation": {"f1": validation}, "test": {"f1": test}}, f)
+            with open(os.path.join(candidates_path, f"{name}.pkl"), "w") as f:
+                f.write(name)
+
+        best = select_model_stage(["a", "b"], candidates_path, os.path.join(temp_dir, 'model'))
+        assert best['model'] == "a"
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 import numpy as np
+import joblib
 import os
 import tempfile
 from unittest.mock import patch, MagicMock
@@ -93,12 +94,47 @@ class TestDataProcessing:
         assert len(y_test) == len(X_test)
         
         # Check if files are saved
-        assert os.path.exists(os.path.join(output_path, 'X_train.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'X_test.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'y_train.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'y_test.pkl'))
+        assert os.path.exists(os.path.join(output_path, 'X_train.npy'))
+        assert os.path.exists(os.path.join(output_path, 'X_test.npy'))
+        assert os.path.exists(os.path.join(output_path, 'y_train.npy'))
+        assert os.path.exists(os.path.join(output_path, 'y_test.npy'))
+        assert os.path.exists(os.path.join(output_path, 'manifest.json'))
         assert os.path.exists(os.path.join(output_path, 'scaler.pkl'))
 
+    def test_split_and_scale_pickle_format(self, sample_csv_file, temp_dir):
+        """Test the legacy joblib pickle format is still available"""
+        output_path = os.path.join(temp_dir, 'output')
+        processor = DataProcessing(sample_csv_file, output_path, data_format='pickle')
+        processor.load_data()
+        processor.preprocess_data()
+        processor.split_and_scale()
+
+        for name in ['X_train.pkl', 'X_test.pkl', 'y_train.pkl', 'y_test.pkl', 'scaler.pkl']:
+            assert os.path.exists(os.path.join(output_path, name))
+        assert not os.path.exists(os.path.join(output_path, 'manifest.json'))
+
+    @pytest.mark.parametrize("first, second", [('npy', 'pickle'), ('pickle', 'npy')])
+    def test_switching_format_removes_stale_splits(self, first, second, sample_data, temp_dir):
+        """Test a run in one format leaves no splits of the other format for the loader to pick up"""
+        from src.model_training import ModelTraining
+
+        output_path = os.path.join(temp_dir, 'output')
+        small_csv = os.path.join(temp_dir, 'small.csv')
+        large_csv = os.path.join(temp_dir, 'large.csv')
+        sample_data.to_csv(small_csv, index=False)
+        pd.concat([sample_data] * 3, ignore_index=True).to_csv(large_csv, index=False)
+
+        DataProcessing(small_csv, output_path, data_format=first).run()
+        DataProcessing(large_csv, output_path, data_format=second).run()
+
+        assert os.path.exists(os.path.join(output_path, 'manifest.json')) == (second == 'npy')
+        assert os.path.exists(os.path.join(output_path, 'X_train.pkl')) == (second == 'pickle')
+        assert os.path.exists(os.path.join(output_path, 'X_train.npy')) == (second == 'npy')
+
+        trainer = ModelTraining(output_path, os.path.join(temp_dir, 'model'))
+        trainer.load_processed_data()
+        assert trainer.X_train.shape[0] == 240
+
     @patch('src.data_processing.get_logger')
     def test_run_pipeline(self, mock_get_logger, sample_csv_file, temp_dir):
         """Test complete pipeline run"""
@@ -109,10 +145,11 @@ class TestDataProcessing:
         processor.run()
         
         # Check if all output files exist
-        assert os.path.exists(os.path.join(output_path, 'X_train.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'X_test.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'y_train.pkl'))
-        assert os.path.exists(os.path.join(output_path, 'y_test.pkl'))
+        assert os.path.exists(os.path.join(output_path, 'X_train.npy'))
+        assert os.path.exists(os.path.join(output_path, 'X_test.npy'))
+        assert os.path.exists(os.path.join(output_path, 'y_train.npy'))
+        assert os.path.exists(os.path.join(output_path, 'y_test.npy'))
+        assert os.path.exists(os.path.join(output_path, 'manifest.json'))
         assert os.path.exists(os.path.join(output_path, 'scaler.pkl'))
 
     def test_data_types_after_preprocessing(self, sample_csv_file, temp_dir):
@@ -147,4 +184,105 @@ class TestDataProcessing:
             'Predictive_Maintenance_Score', 'Error_Rate_%', 'Year', 'Month', 'Day', 'Hour'
         ]
         
-        assert len(X_train[0]) == len(expected_features)
\ No newline at end of file
+        assert len(X_train[0]) == len(expected_features)
+
+
+class TestStreamingDataProcessing:
+    """Test suite for chunked/streaming processing"""
+
+    def load_shards(self, output_path, split):
+        import json
+        shard_path = os.path.join(output_path, 'shards')
+        with open(os.path.join(shard_path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        shards = [s for s in manifest['shards'] if s['split'] == split]
+        X = np.vstack([np.load(os.path.join(shard_path, s['X'])) for s in shards])
+        y = np.concatenate([np.load(os.path.join(shard_path, s['y'])) for s in shards])
+        return manifest, X, y
+
+    def test_run_streaming_writes_shards(self, sample_csv_file, temp_dir):
+        """Test shards and manifest cover every input row"""
+        output_path = os.path.join(temp_dir, 'output')
+        processor = DataProcessing(sample_csv_file, output_path)
+
+        manifest = processor.run_streaming(chunksize=30, test_size=0.2)
+
+        assert manifest['rows']['train'] + manifest['rows']['test'] == 100
+        assert manifest['features'][-4:] == ['Year', 'Month', 'Day', 'Hour']
+        assert len({s['X'] for s in manifest['shards']}) == len(manifest['shards'])
+        assert os.path.exists(os.path.join(output_path, 'scaler.pkl'))
+
+        _, X_train, y_train = self.load_shards(output_path, 'train')
+        assert X_train.shape == (manifest['rows']['train'], 14)
+        assert len(y_train) == len(X_train)
+
+    def test_streaming_uses_processor_split_settings(self, sample_csv_file, temp_dir):
+        """Test test_size and random_state default to the processor's own"""
+        configured = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'configured'),
+                                    test_size=0.5, random_state=7).run_streaming(chunksize=30)
+        explicit = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'explicit')).run_streaming(
+            chunksize=30, test_size=0.5, random_state=7)
+
+        assert configured['rows'] == explicit['rows']
+        assert configured['rows']['test'] > 30
+
+    def test_streaming_matches_in_memory(self, sample_csv_file, temp_dir):
+        """Test incremental scaler and chunked encoding match the in-memory path"""
+        import joblib
+        from sklearn.preprocessing import StandardScaler
+        from src.data_processing import FEATURES
+
+        stream_path = os.path.join(temp_dir, 'stream')
+        DataProcessing(sample_csv_file, stream_path).run_streaming(chunksize=17)
+        stream_scaler = joblib.load(os.path.join(stream_path, 'scaler.pkl'))
+
+        processor = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'memory'))
+        processor.load_data()
+        df = processor.preprocess_data()
+        X = df[FEATURES].to_numpy(dtype=float)
+        full_scaler = StandardScaler().fit(X)
+
+        np.testing.assert_allclose(stream_scaler.mean_, full_scaler.mean_)
+        np.testing.assert_allclose(stream_scaler.scale_, full_scaler.scale_)
+
+        _, X_train, _ = self.load_shards(stream_path, 'train')
+        _, X_test, _ = self.load_shards(stream_path, 'test')
+        X_all = np.vstack([X_train, X_test])
+        np.testing.assert_allclose(X_all.mean(axis=0), 0, atol=1e-9)
+
+    def test_streaming_missing_categories_match_in_memory(self, sample_data, temp_dir):
+        """Test a chunk with a missing mode or label is encoded as the in-memory path encodes it"""
+        from src.data_processing import FEATURES
+
+        data = sample_data.copy()
+        data['Operation_Mode'] = data['Operation_Mode'].astype(object)
+        data['Efficiency_Status'] = data['Efficiency_Status'].astype(object)
+        data.loc[[3, 40], 'Operation_Mode'] = np.nan
+        data.loc[5, 'Efficiency_Status'] = np.nan
+        csv_path = os.path.join(temp_dir, 'missing.csv')
+        data.to_csv(csv_path, index=False)
+
+        stream_path = os.path.join(temp_dir, 'stream')
+        manifest = DataProcessing(csv_path, stream_path).run_streaming(chunksize=17)
+
+        processor = DataProcessing(csv_path, os.path.join(temp_dir, 'memory'))
+        processor.load_data()
+        df = processor.preprocess_data()
+
+        assert manifest['rows']['train'] + manifest['rows']['test'] == len(df) == 99
+        assert (df['Operation_Mode'] == -1).sum() == 2
+        assert 'nan' not in processor.categories['Efficiency_Status']
+        assert manifest['categories'] == processor.categories
+
+        _, X_train, _ = self.load_shards(stream_path, 'train')
+        _, X_test, _ = self.load_shards(stream_path, 'test')
+        scaler = joblib.load(os.path.join(stream_path, 'scaler.pkl'))
+        modes = scaler.inverse_transform(np.vstack([X_train, X_test]))[:, FEATURES.index('Operation_Mode')]
+        assert np.isclose(modes, -1).sum() == 2
+
+    def test_streaming_unknown_file(self, temp_dir):
+        """Test streaming a missing file raises"""
+        processor = DataProcessing(os.path.join(temp_dir, 'missing.csv'), os.path.join(temp_dir, 'output'))
+
+        with pytest.raises(Exception):
+            processor.run_streaming(chunksize=10)
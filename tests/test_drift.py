@@ -0,0 +1,176 @@
+import pytest
+import numpy as np
+import os
+from unittest.mock import patch
+
+from src.drift import (DriftReference, DriftMonitor, DRIFT_FEATURES, DRIFT_REFERENCE_FILE, bin_edges,
+                       population_stability_index, binned_ks)
+from src.feature_transformer import FEATURES
+from src.data_processing import DataProcessing
+from src.exception import CustomException
+
+
+def feature_matrix(n, shift=0.0, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(loc=50 + shift, scale=10, size=(n, len(FEATURES)))
+    X[:, FEATURES.index('Operation_Mode')] = rng.randint(0, 3, n)
+    X[:, -4:] = [2024, 1, 15, 12]
+    return X
+
+
+@pytest.fixture
+def reference():
+    X = feature_matrix(5000)
+    return DriftReference.from_sample(X).update(X)
+
+
+class TestDriftReference:
+    """Test suite for the training-time drift reference"""
+
+    def test_bin_edges(self):
+        assert bin_edges(np.array([0, 1, 2, 2, 1, np.nan])).tolist() == [0.5, 1.5]
+        edges = bin_edges(np.arange(1000, dtype=np.float64), bins=4)
+        np.testing.assert_allclose(edges, [249.75, 499.5, 749.25])
+
+    def test_reference_counts(self, reference):
+        assert reference.rows == 5000
+        assert len(reference.edges['Operation_Mode']) == 2
+        for j, name in enumerate(DRIFT_FEATURES):
+            assert reference.feature_counts(reference.counts, j).sum() == 5000
+        # Calendar fields are not monitored
+        assert 'Year' not in reference.edges
+
+    def test_histogram_skips_non_finite(self, reference):
+        X = feature_matrix(10)
+        X[0, FEATURES.index('Temperature_C')] = np.nan
+        counts = reference.histogram(X)
+        assert reference.feature_counts(counts, DRIFT_FEATURES.index('Temperature_C')).sum() == 9
+        assert reference.feature_counts(counts, DRIFT_FEATURES.index('Vibration_Hz')).sum() == 10
+
+    def test_save_load(self, reference, temp_dir):
+        path = os.path.join(temp_dir, DRIFT_REFERENCE_FILE)
+        reference.save(path)
+        loaded = DriftReference.load(path)
+
+        np.testing.assert_array_equal(loaded.counts, reference.counts)
+        np.testing.assert_array_equal(loaded.edges['Temperature_C'], reference.edges['Temperature_C'])
+        with pytest.raises(CustomException):
+            DriftReference.load(os.path.join(temp_dir, 'missing.json'))
+
+    def test_data_processing_writes_reference(self, sample_csv_file, temp_dir):
+        processor = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'processed'))
+        processor.run()
+        streamed = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'streamed'))
+        streamed.run_streaming(chunksize=30)
+
+        reference = DriftReference.load(os.path.join(processor.output_path, DRIFT_REFERENCE_FILE))
+        streamed_reference = DriftReference.load(os.path.join(streamed.output_path, DRIFT_REFERENCE_FILE))
+        assert reference.rows == len(processor.df)
+        assert streamed_reference.rows == len(processor.df)
+
+
+class TestDriftStatistics:
+    """Test suite for PSI and KS on binned counts"""
+
+    def test_identical_histograms(self):
+        counts = np.array([10.0, 20.0, 30.0])
+        assert population_stability_index(counts, counts * 3) == pytest.approx(0.0)
+        assert binned_ks(counts, counts * 3) == pytest.approx(0.0)
+
+    def test_disjoint_histograms(self):
+        expected, actual = np.array([100.0, 0.0]), np.array([0.0, 100.0])
+        assert population_stability_index(expected, actual) > 10
+        assert binned_ks(expected, actual) == pytest.approx(1.0)
+
+
+class TestDriftMonitor:
+    """Test suite for the live drift monitor"""
+
+    def test_no_drift(self, reference):
+        monitor = DriftMonitor(reference)
+        monitor.observe(feature_matrix(2000, seed=1))
+        report = monitor.update()
+
+        assert report['window_rows'] == pytest.approx(2000, rel=1e-3)
+        assert report['drifted'] == []
+        assert all(feature['status'] == 'stable' for feature in report['features'].values())
+        assert set(report['features']) == set(DRIFT_FEATURES)
+
+    def test_shift_detected(self, reference):
+        monitor = DriftMonitor(reference)
+        monitor.observe(feature_matrix(2000, shift=15, seed=1))
+        report = monitor.update()
+
+        assert report['features']['Temperature_C']['status'] == 'significant'
+        assert report['features']['Temperature_C']['ks'] > 0.4
+        # The mode codes are drawn from the same distribution
+        assert report['features']['Operation_Mode']['status'] == 'stable'
+        assert 'Temperature_C' in report['drifted']
+
+    def test_insufficient_data(self, reference):
+        monitor = DriftMonitor(reference, min_rows=100)
+        monitor.observe(feature_matrix(10, shift=15))
+        report = monitor.update()
+        assert report['drifted'] == []
+        assert report['features']['Temperature_C']['status'] == 'insufficient_data'
+
+    def test_report_is_not_computed_on_read(self, reference):
+        monitor = DriftMonitor(reference)
+        monitor.observe(feature_matrix(500))
+        assert monitor.report()['window_rows'] == 0
+        monitor.update()
+        assert monitor.report()['window_rows'] == pytest.approx(500, rel=1e-3)
+
+    def test_full_queue_drops_batches(self, reference):
+        monitor = DriftMonitor(reference, max_pending_rows=2)
+        for _ in range(5):
+            monitor.observe(feature_matrix(1))
+        report = monitor.update()
+        assert report['dropped_batches'] == 3
+        assert report['window_rows'] == pytest.approx(2, rel=1e-3)
+
+    def test_decay(self, reference):
+        monitor = DriftMonitor(reference, half_life_seconds=10)
+        monitor.observe(feature_matrix(1000))
+        monitor.update()
+        monitor._updated_at -= 10
+        assert monitor.update()['window_rows'] == pytest.approx(500, rel=1e-2)
+
+    def test_set_reference_restarts_window(self, reference):
+        monitor = DriftMonitor(reference)
+        monitor.observe(feature_matrix(500))
+        monitor.update()
+        monitor.set_reference(reference)
+        assert monitor.report()['window_rows'] == 0
+
+    def test_background_thread(self, reference):
+        monitor = DriftMonitor(reference, interval_seconds=0.01)
+        monitor.start()
+        try:
+            monitor.observe(feature_matrix(500))
+            for _ in range(200):
+                if monitor.report()['window_rows'] > 0:
+                    break
+                monitor._stop.wait(0.01)
+        finally:
+            monitor.stop()
+        assert monitor.report()['window_rows'] == pytest.approx(500, rel=1e-2)
+
+    def test_shared_counts_summed_over_workers(self, reference, temp_dir):
+        workers = [DriftMonitor(reference, shared_dir=temp_dir) for _ in range(2)]
+        for pid, (monitor, shift) in enumerate(zip(workers, (0, 15)), start=1001):
+            monitor.observe(feature_matrix(1000, shift=shift, seed=pid))
+            with patch('src.drift.os.getpid', return_value=pid):
+                monitor.update()
+
+        # Either worker answers for the whole server
+        for monitor in workers:
+            report = monitor.report()
+            assert report['workers'] == 2
+            assert report['window_rows'] == pytest.approx(2000, rel=1e-3)
+            assert 'Temperature_C' in report['drifted']
+
+        # Counts taken against another reference are not mixed in
+        other = DriftMonitor(DriftReference.from_sample(feature_matrix(100)).update(feature_matrix(100)),
+                             shared_dir=temp_dir)
+        assert other.report()['window_rows'] == 0
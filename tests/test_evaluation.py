@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+import os
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score
+
+from src.evaluation import (Evaluator, confusion_counts, metrics_from_confusion, format_report,
+                            save_metrics, load_metrics)
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.RandomState(0)
+    y_true = rng.randint(0, 3, 500)
+    y_pred = np.where(rng.rand(500) < 0.7, y_true, rng.randint(0, 3, 500))
+    return y_true, y_pred
+
+
+class TestConfusionMetrics:
+    """Metrics derived from one confusion matrix match sklearn's separate passes"""
+
+    def test_confusion_counts(self, predictions):
+        y_true, y_pred = predictions
+        np.testing.assert_array_equal(confusion_counts(y_true, y_pred, [0, 1, 2]),
+                                      confusion_matrix(y_true, y_pred))
+
+    def test_metrics_match_sklearn(self, predictions):
+        y_true, y_pred = predictions
+        overall, per_class = metrics_from_confusion(confusion_counts(y_true, y_pred, [0, 1, 2]))
+
+        assert overall["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+        assert overall["precision_weighted"] == pytest.approx(precision_score(y_true, y_pred, average='weighted'))
+        assert overall["recall_weighted"] == pytest.approx(recall_score(y_true, y_pred, average='weighted'))
+        assert overall["f1_weighted"] == pytest.approx(f1_score(y_true, y_pred, average='weighted'))
+        assert overall["f1_macro"] == pytest.approx(f1_score(y_true, y_pred, average='macro'))
+        np.testing.assert_allclose(per_class["f1"], f1_score(y_true, y_pred, average=None))
+
+    def test_metrics_vectorized_over_stack(self, predictions):
+        y_true, y_pred = predictions
+        cm = confusion_counts(y_true, y_pred, [0, 1, 2])
+        overall, _ = metrics_from_confusion(np.stack([cm, cm]))
+        assert overall["accuracy"].shape == (2,)
+
+    def test_unpredicted_class_scores_zero(self):
+        overall, per_class = metrics_from_confusion(np.array([[5, 0], [3, 0]]))
+        assert per_class["precision"][1] == 0.0
+        assert overall["accuracy"] == pytest.approx(5 / 8)
+
+
+class TestEvaluator:
+    """Test suite for the streaming Evaluator"""
+
+    def test_streaming_equals_single_pass(self, predictions):
+        y_true, y_pred = predictions
+        streamed = Evaluator([0, 1, 2])
+        for start in range(0, len(y_true), 128):
+            streamed.update(y_true[start:start + 128], y_pred[start:start + 128])
+        whole = Evaluator([0, 1, 2]).update(y_true, y_pred)
+        np.testing.assert_array_equal(streamed.cm, whole.cm)
+
+    def test_evaluate_batches_parallel(self):
+        rng = np.random.RandomState(0)
+        X = rng.rand(600, 4)
+        y = (X[:, 0] * 3).astype(int)
+        clf = LogisticRegression(max_iter=1000).fit(X, y)
+        batches = [(X[i:i + 100], y[i:i + 100]) for i in range(0, 600, 100)]
+
+        parallel = Evaluator(clf.classes_).evaluate_batches(clf, batches, n_jobs=3)
+        np.testing.assert_array_equal(parallel.cm, confusion_matrix(y, clf.predict(X)))
+
+    def test_bootstrap_interval_contains_estimate(self, predictions):
+        evaluator = Evaluator([0, 1, 2]).update(*predictions)
+        intervals = evaluator.bootstrap(n_resamples=2000)
+        metrics, _ = evaluator.metrics()
+        for name, (low, high) in intervals.items():
+            assert low <= metrics[name] <= high
+        assert intervals["accuracy"][1] - intervals["accuracy"][0] < 0.2
+
+    def test_bootstrap_is_reproducible(self, predictions):
+        evaluator = Evaluator([0, 1, 2]).update(*predictions)
+        assert evaluator.bootstrap(random_state=1) == evaluator.bootstrap(random_state=1)
+
+    def test_bootstrap_empty(self):
+        assert Evaluator([0, 1]).bootstrap() == {}
+
+    def test_report_roundtrip(self, predictions, temp_dir):
+        report = Evaluator([0, 1, 2]).update(*predictions).report(n_resamples=200)
+        save_metrics(report, temp_dir, "LogisticRegression")
+
+        saved = load_metrics(temp_dir)
+        assert saved["model"] == "LogisticRegression"
+        assert saved["n_samples"] == 500
+        assert saved["confusion_matrix"] == report["confusion_matrix"]
+        assert set(saved["confidence_intervals"]) == set(saved["metrics"])
+        assert not os.path.exists(os.path.join(temp_dir, 'metrics.json.tmp'))
+
+    def test_format_report(self, predictions):
+        text = format_report(Evaluator([0, 1, 2]).update(*predictions).report(n_resamples=10))
+        assert "weighted avg" in text
+        assert len(text.splitlines()) == 7
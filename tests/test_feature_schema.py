@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+
+from src.feature_schema import FeatureSchema, FEATURE_SCHEMA_FILE
+from src.feature_transformer import FEATURES
+from src.data_processing import DataProcessing
+from src.exception import CustomException
+
+MODES = ['Active', 'Idle', 'Maintenance']
+
+
+@pytest.fixture
+def training_matrix(sample_data):
+    X = sample_data.copy()
+    X['Year'], X['Month'], X['Day'], X['Hour'] = 2024, 1, 1, 0
+    return X[FEATURES].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture
+def schema(training_matrix):
+    return FeatureSchema.from_data(training_matrix, {'Operation_Mode': MODES})
+
+
+def field(schema, name):
+    return schema.fields[FEATURES.index(name)]
+
+
+class TestFeatureSchema:
+    """Test suite for the compiled feature schema"""
+
+    def test_bounds_from_training_data(self, schema, training_matrix):
+        temperature = training_matrix[:, FEATURES.index('Temperature_C')]
+        span = temperature.max() - temperature.min()
+
+        assert field(schema, 'Temperature_C')['min'] == pytest.approx(temperature.min() - 0.1 * span)
+        assert field(schema, 'Temperature_C')['max'] == pytest.approx(temperature.max() + 0.1 * span)
+        assert field(schema, 'Operation_Mode') == {'name': 'Operation_Mode', 'dtype': 'category', 'min': 0,
+                                                   'max': 2, 'labels': MODES}
+        # Calendar bounds do not depend on the training period
+        assert (field(schema, 'Year')['min'], field(schema, 'Year')['max']) == (1970, 2100)
+        assert (field(schema, 'Hour')['min'], field(schema, 'Hour')['max']) == (0, 23)
+
+    def test_validate_training_rows(self, schema, training_matrix):
+        row_indices, errors = schema.validate(training_matrix)
+        assert row_indices == list(range(len(training_matrix)))
+        assert errors == []
+
+    def test_per_field_errors(self, schema, training_matrix):
+        X = training_matrix[:5].copy()
+        X[1, FEATURES.index('Temperature_C')] = 1e6
+        X[1, FEATURES.index('Hour')] = 12.5
+        X[3, FEATURES.index('Operation_Mode')] = 7
+        X[4, FEATURES.index('Vibration_Hz')] = np.nan
+
+        row_indices, errors = schema.validate(X)
+
+        assert row_indices == [0, 2]
+        assert [error['index'] for error in errors] == [1, 3, 4]
+        assert errors[0]['fields'] == {'Temperature_C': f"above maximum {field(schema, 'Temperature_C')['max']:g}",
+                                       'Hour': 'must be an integer'}
+        assert errors[0]['error'].startswith('Invalid features: Temperature_C above maximum')
+        assert errors[1]['fields'] == {'Operation_Mode': 'unknown code 7'}
+        assert errors[2]['fields'] == {'Vibration_Hz': 'must be a finite number'}
+
+    def test_save_load(self, schema, temp_dir):
+        path = os.path.join(temp_dir, FEATURE_SCHEMA_FILE)
+        schema.save(path)
+        loaded = FeatureSchema.load(path)
+
+        assert loaded.fields == schema.fields
+        np.testing.assert_array_equal(loaded.upper, schema.upper)
+
+    def test_extended_covers_new_rows(self, schema, training_matrix):
+        np.testing.assert_allclose(schema.extended(training_matrix).upper, schema.upper)
+
+        wider = training_matrix.copy()
+        wider[0, FEATURES.index('Temperature_C')] = 500.0
+        extended = schema.extended(wider)
+
+        assert schema.validate(wider)[1] and not extended.validate(wider)[1]
+        assert field(extended, 'Operation_Mode') == field(schema, 'Operation_Mode')
+        assert field(extended, 'Hour') == field(schema, 'Hour')
+
+    def test_rejects_mismatched_features(self, schema):
+        with pytest.raises(CustomException):
+            FeatureSchema(schema.fields[:-1])
+
+    def test_data_processing_writes_schema(self, sample_csv_file, temp_dir):
+        processed_path = os.path.join(temp_dir, 'processed')
+        processor = DataProcessing(sample_csv_file, processed_path)
+        processor.run()
+        batch = DataProcessing(sample_csv_file, os.path.join(temp_dir, 'streamed'))
+        batch.run_streaming(chunksize=30)
+
+        schema = FeatureSchema.load(os.path.join(processed_path, FEATURE_SCHEMA_FILE))
+        streamed = FeatureSchema.load(os.path.join(batch.output_path, FEATURE_SCHEMA_FILE))
+        assert streamed.fields == schema.fields
+        assert schema.validate(processor.df[FEATURES].to_numpy())[1] == []
@@ -0,0 +1,156 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+
+from src.feature_transformer import (FeatureTransformer, FEATURES, decompose_timestamps, decompose_datetime64,
+                                     parse_iso_hours, decompose_timestamp_cached, timestamp_cache_info,
+                                     decode_feature_matrix, encode_feature_matrix)
+from src.data_processing import DataProcessing
+
+
+@pytest.fixture
+def transformer():
+    return FeatureTransformer({'Operation_Mode': ['Active', 'Idle', 'Maintenance']})
+
+
+@pytest.fixture
+def raw_frame(sample_data):
+    frame = sample_data.copy()
+    frame['Operation_Mode'] = np.where(frame['Operation_Mode'] == 1, 'Idle', 'Active')
+    return frame
+
+
+class TestFeatureTransformer:
+    """Test suite for the shared feature transformer"""
+
+    def test_fit_sorted_vocabulary(self, raw_frame):
+        transformer = FeatureTransformer().fit(raw_frame)
+        assert transformer.categories['Operation_Mode'] == ['Active', 'Idle']
+
+    def test_encode_modes(self, transformer):
+        codes = transformer.encode_modes(['Idle', 'Maintenance', 0, '2', 'Turbo', 7, None])
+        np.testing.assert_array_equal(codes, [1, 2, 0, 2, -1, -1, -1])
+
+    def test_encode_modes_without_vocabulary(self):
+        np.testing.assert_array_equal(FeatureTransformer().encode_modes([1, '0', 'Idle']), [1, 0, -1])
+
+    def test_decompose_timestamps(self):
+        parts = decompose_timestamps(['2024-03-05 17:45:00', 'not a date'])
+        np.testing.assert_array_equal(parts[0], [2024, 3, 5, 17])
+        assert np.isnan(parts[1]).all()
+
+    def test_iso_fast_path(self):
+        values = ['2024-02-29 23:59:59', '2023-02-29 01:00:00', '2024-04-31T05:00', '2024-13-01 00:00',
+                  '2100-02-29 00:00', '2000-02-29T07', '03/05/2024 17:00', '2024-01-01', None, 'é024-01-01 00']
+        parts, ok = parse_iso_hours(values)
+        assert list(ok) == [True, False, False, False, False, True, False, False, False, False]
+        np.testing.assert_array_equal(parts[0], [2024, 2, 29, 23])
+        np.testing.assert_array_equal(parts[5], [2000, 2, 29, 7])
+        assert np.isnan(parts[~ok]).all()
+
+    def test_decompose_matches_pandas(self):
+        rng = np.random.RandomState(0)
+        datetimes = np.datetime64('1999-12-31T20:00:00') + rng.randint(0, 10 ** 9, 500).astype('timedelta64[s]')
+        strings = [str(value).replace('T', ' ') for value in datetimes] + ['March 5 2024 5pm']
+        expected = pd.to_datetime(pd.Series(strings), format='mixed')
+        expected = np.column_stack([expected.dt.year, expected.dt.month, expected.dt.day, expected.dt.hour])
+
+        np.testing.assert_array_equal(decompose_timestamps(strings), expected)
+        np.testing.assert_array_equal(decompose_datetime64(datetimes), expected[:-1])
+        assert np.isnan(decompose_datetime64(np.array(['NaT'], dtype='datetime64[s]'))).all()
+
+    def test_cache_keys_on_hour(self):
+        before = timestamp_cache_info()
+        first = decompose_timestamp_cached('2031-07-04 09:00:00')
+        second = decompose_timestamp_cached('2031-07-04T09:41:07.123')
+        after = timestamp_cache_info()
+        assert first == second == (2031, 7, 4, 9)
+        assert after['misses'] - before['misses'] == 1
+        assert after['hits'] - before['hits'] == 1
+
+    def test_transform_frame(self, transformer, raw_frame):
+        X = transformer.transform(raw_frame)
+        assert X.shape == (len(raw_frame), len(FEATURES))
+        np.testing.assert_array_equal(X[:, 0], (raw_frame['Operation_Mode'] == 'Idle').astype(float))
+        np.testing.assert_array_equal(X[:, FEATURES.index('Hour')], raw_frame['Timestamp'].dt.hour)
+
+    def test_transform_records_matches_frame(self, transformer, raw_frame):
+        records = raw_frame.astype({'Timestamp': str}).to_dict('records')
+        X, row_indices, errors = transformer.transform_records(records)
+        assert errors == []
+        assert row_indices == list(range(len(records)))
+        np.testing.assert_array_equal(X, transformer.transform(raw_frame))
+
+    def test_transform_records_errors(self, transformer, raw_frame):
+        good = raw_frame.astype({'Timestamp': str}).iloc[0].to_dict()
+        encoded = dict(good, Operation_Mode=1, Year=2024, Month=1, Day=1, Hour=0)
+        del encoded['Timestamp']
+        missing = dict(good)
+        del missing['Timestamp'], missing['Temperature_C']
+        records = [good, dict(good, Operation_Mode='Turbo'), missing,
+                   dict(good, Timestamp='yesterday'), dict(good, Vibration_Hz='high'), encoded]
+
+        X, row_indices, errors = transformer.transform_records(records)
+        assert row_indices == [0, 5]
+        assert X.shape == (2, len(FEATURES))
+        assert errors == [
+            {'index': 1, 'error': 'Unknown Operation_Mode'},
+            {'index': 2, 'error': 'Missing features: Temperature_C, Year, Month, Day, Hour'},
+            {'index': 3, 'error': 'Invalid Timestamp'},
+            {'index': 4, 'error': 'Feature values must be numeric'},
+        ]
+
+    def test_save_load(self, transformer, raw_frame, temp_dir):
+        path = os.path.join(temp_dir, 'feature_transformer.pkl')
+        transformer.save(path)
+        loaded = FeatureTransformer.load(path)
+        np.testing.assert_array_equal(loaded.transform(raw_frame), transformer.transform(raw_frame))
+
+    def test_training_uses_same_encoding(self, raw_frame, temp_dir):
+        """Features written by data processing match the saved transformer's output"""
+        csv_path = os.path.join(temp_dir, 'raw.csv')
+        raw_frame.to_csv(csv_path, index=False)
+        processor = DataProcessing(csv_path, os.path.join(temp_dir, 'processed'))
+        processor.load_data()
+        processed = processor.preprocess_data()
+
+        processor.split_and_scale()
+
+        transformer = FeatureTransformer.load(os.path.join(temp_dir, 'processed', 'feature_transformer.pkl'))
+        np.testing.assert_array_equal(processed[FEATURES].to_numpy(dtype=float),
+                                      transformer.transform(pd.read_csv(csv_path)))
+
+
+class TestBinaryFormat:
+    """Test suite for the float32 binary request format"""
+
+    def test_round_trip_without_copy(self, transformer, raw_frame):
+        X = transformer.transform(raw_frame)
+        body = encode_feature_matrix(X)
+        assert len(body) == X.size * 4
+
+        decoded = decode_feature_matrix(body)
+        assert decoded.shape == X.shape
+        assert decoded.dtype == np.float32
+        assert not decoded.flags.owndata
+        np.testing.assert_allclose(decoded, X, rtol=1e-6)
+
+    @pytest.mark.parametrize('body', [b'', b'\x00' * 10, b'\x00' * (4 * len(FEATURES) + 4)])
+    def test_rejects_partial_rows(self, body):
+        with pytest.raises(ValueError, match='multiple of'):
+            decode_feature_matrix(body)
+
+    def test_check_matrix(self, transformer):
+        X = np.zeros((4, len(FEATURES)), dtype=np.float32)
+        X[1, 3] = np.nan
+        X[2, 0] = 3
+        X[3, 0] = 1.5
+
+        row_indices, errors = transformer.check_matrix(X)
+        assert row_indices == [0]
+        assert errors == [
+            {'index': 1, 'error': 'Feature values must be numeric'},
+            {'index': 2, 'error': 'Unknown Operation_Mode'},
+            {'index': 3, 'error': 'Unknown Operation_Mode'},
+        ]
@@ -0,0 +1,171 @@
+import pytest
+import numpy as np
+import pandas as pd
+import joblib
+import os
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.data_processing import DataProcessing, FEATURES, TARGET
+from src.model_training import ModelTraining
+from src.incremental_retraining import (IncrementalRetraining, rebase_coefficients, anchored_update, linear_probabilities,
+                                       SCALER_FILE, MODEL_FILE)
+from src.feature_schema import FeatureSchema, FEATURE_SCHEMA_FILE
+from src.drift import DriftReference, DRIFT_REFERENCE_FILE
+from src.exception import CustomException
+
+
+def new_rows(sample_data, n, start):
+    rows = sample_data.sample(n, random_state=1, replace=True).reset_index(drop=True)
+    rows['Timestamp'] = pd.date_range(start, periods=n, freq='H')
+    return rows
+
+
+def linear_rows(n, flipped=False, seed=0):
+    """Three classes split by a linear score; ``flipped`` reverses the rule"""
+    rng = np.random.RandomState(seed)
+    X = rng.normal(0, 1, (n, len(FEATURES)))
+    score = X[:, 1] - X[:, 2]
+    y = np.digitize(-score if flipped else score, [-0.5, 0.5])
+    return X, y
+
+
+@pytest.fixture
+def trained_paths(sample_data, sample_csv_file, temp_dir):
+    """A full training run followed by recording the watermark"""
+    processed_path = os.path.join(temp_dir, 'processed')
+    model_path = os.path.join(temp_dir, 'model')
+    DataProcessing(sample_csv_file, processed_path).run()
+    ModelTraining(processed_path, model_path).run()
+    retrainer = IncrementalRetraining(sample_csv_file, processed_path, model_path, chunksize=40)
+    retrainer.initialize_state()
+    return sample_csv_file, processed_path, model_path
+
+
+class TestIncrementalRetraining:
+    """Test suite for watermark-based warm-start retraining"""
+
+    def test_rebase_preserves_decision_function(self):
+        """Test rebased coefficients give identical decisions under the new scaler"""
+        rng = np.random.RandomState(0)
+        X_old, X_new = rng.normal(5, 2, (200, 14)), rng.normal(7, 3, (50, 14))
+        y = rng.randint(0, 3, 200)
+        scaler = StandardScaler().fit(X_old)
+        clf = LogisticRegression(max_iter=1000).fit(scaler.transform(X_old), y)
+        expected = clf.decision_function(scaler.transform(X_new))
+
+        old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+        scaler.partial_fit(X_new)
+        clf.coef_, clf.intercept_ = rebase_coefficients(clf.coef_, clf.intercept_, old_mean, old_scale,
+                                                        scaler.mean_, scaler.scale_)
+
+        np.testing.assert_allclose(clf.decision_function(scaler.transform(X_new)), expected, rtol=1e-9)
+
+    def test_initialize_state(self, trained_paths):
+        """Test the watermark is the newest raw timestamp"""
+        raw_path, processed_path, model_path = trained_paths
+        retrainer = IncrementalRetraining(raw_path, processed_path, model_path)
+
+        state = retrainer.load_state()
+
+        assert pd.Timestamp(state['watermark']) == pd.Timestamp('2024-01-05 03:00:00')
+        assert state['rows_seen'] == 100
+        assert state['categories']['Efficiency_Status'] == ['0', '1', '2']
+
+    def test_run_with_no_new_rows(self, trained_paths):
+        """Test nothing is retrained when the raw file has not grown"""
+        retrainer = IncrementalRetraining(*trained_paths)
+
+        assert retrainer.run() == 0
+
+    def test_run_only_uses_new_rows(self, sample_data, trained_paths):
+        """Test only rows past the watermark update the scaler and model"""
+        raw_path, processed_path, model_path = trained_paths
+        new_rows(sample_data, 60, '2024-02-01').to_csv(raw_path, mode='a', header=False, index=False)
+        scaler_before = joblib.load(os.path.join(processed_path, 'scaler.pkl'))
+
+        retrainer = IncrementalRetraining(raw_path, processed_path, model_path, chunksize=40)
+        used = retrainer.run()
+
+        scaler_after = joblib.load(os.path.join(processed_path, 'scaler.pkl'))
+        assert used == 60
+        assert scaler_after.n_samples_seen_ == scaler_before.n_samples_seen_ + 60
+        assert pd.Timestamp(retrainer.state['watermark']) == pd.Timestamp('2024-02-03 11:00:00')
+        assert retrainer.state['rows_seen'] == 160
+        # A second run sees nothing new
+        assert IncrementalRetraining(raw_path, processed_path, model_path).run() == 0
+
+    def test_run_extends_schema_and_drift_reference(self, sample_data, trained_paths):
+        """Test the serving schema and drift reference cover the new rows after an update"""
+        raw_path, processed_path, model_path = trained_paths
+        rows = new_rows(sample_data, 20, '2024-02-01')
+        rows['Temperature_C'] = 400.0
+        rows.to_csv(raw_path, mode='a', header=False, index=False)
+        schema_path = os.path.join(processed_path, FEATURE_SCHEMA_FILE)
+        reference_path = os.path.join(processed_path, DRIFT_REFERENCE_FILE)
+        reference_before = DriftReference.load(reference_path)
+
+        retrainer = IncrementalRetraining(raw_path, processed_path, model_path)
+        retrainer.load_state()
+        X_new, _, _ = retrainer.load_new_rows()
+        assert FeatureSchema.load(schema_path).validate(X_new)[1]
+        retrainer.run()
+
+        assert FeatureSchema.load(schema_path).validate(X_new)[1] == []
+        reference_after = DriftReference.load(reference_path)
+        assert reference_after.rows == reference_before.rows + 20
+        for name in reference_before.edges:
+            np.testing.assert_array_equal(reference_after.edges[name], reference_before.edges[name])
+
+    def test_unseen_categories_are_skipped(self, sample_data, trained_paths):
+        """Test rows with unseen categorical values are not encoded"""
+        raw_path, processed_path, model_path = trained_paths
+        rows = new_rows(sample_data, 10, '2024-03-01')
+        rows.loc[:4, 'Operation_Mode'] = 7
+        rows.to_csv(raw_path, mode='a', header=False, index=False)
+
+        retrainer = IncrementalRetraining(raw_path, processed_path, model_path)
+        retrainer.load_state()
+        X, y, _ = retrainer.load_new_rows()
+
+        assert len(X) == 5
+
+    def test_update_retains_history(self, temp_dir):
+        """Test a small contradictory batch nudges the model instead of replacing it"""
+        X_old, y_old = linear_rows(2000)
+        scaler = StandardScaler().fit(X_old)
+        clf = LogisticRegression(max_iter=1000).fit(scaler.transform(X_old), y_old)
+        joblib.dump(scaler, os.path.join(temp_dir, SCALER_FILE))
+        joblib.dump(clf, os.path.join(temp_dir, MODEL_FILE))
+        accuracy_before = clf.score(scaler.transform(X_old), y_old)
+
+        retrainer = IncrementalRetraining('unused.csv', temp_dir, temp_dir)
+        retrainer.state = {"categories": {TARGET: ['0', '1', '2']}, "rows_seen": len(X_old)}
+        clf, scaler, _ = retrainer.update_model(*linear_rows(75, flipped=True, seed=1))
+
+        assert clf.score(scaler.transform(X_old), y_old) > accuracy_before - 0.02
+        assert not [name for name in os.listdir(temp_dir) if '.tmp-' in name]
+
+    def test_ovr_update_uses_per_class_sigmoid(self):
+        """Test an OvR model is updated on its own per-class losses, not a softmax"""
+        X, y = linear_rows(500)
+        clf = LogisticRegression(solver='liblinear').fit(X, y)
+        W, b = anchored_update(clf.coef_, clf.intercept_, X, y, anchor=0.0, link="ovr", epochs=0)
+
+        np.testing.assert_allclose(linear_probabilities(W, b, X, "ovr"),
+                                   1.0 / (1.0 + np.exp(-clf.decision_function(X))))
+
+        # At a per-class optimum the OvR gradient vanishes, while the softmax one does not
+        X, y = np.random.RandomState(2).normal(0, 1, (500, 3)), np.random.RandomState(3).randint(0, 3, 500)
+        fitted = [LogisticRegression(C=1e6, max_iter=5000).fit(X, y == k) for k in range(3)]
+        coef = np.vstack([model.coef_ for model in fitted])
+        intercept = np.concatenate([model.intercept_ for model in fitted])
+        ovr_W, _ = anchored_update(coef, intercept, X, y, anchor=0.0, link="ovr", epochs=5)
+        softmax_W, _ = anchored_update(coef, intercept, X, y, anchor=0.0, link="softmax", epochs=5)
+        assert np.abs(ovr_W - coef).max() < 1e-4
+        assert np.abs(softmax_W - coef).max() > 1e-2
+
+    def test_unknown_link_raises(self):
+        X, y = linear_rows(20)
+        with pytest.raises(CustomException):
+            anchored_update(np.zeros((3, X.shape[1])), np.zeros(3), X, y, anchor=1.0, link="probit")
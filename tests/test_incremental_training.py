@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+import joblib
+import os
+from sklearn.linear_model import SGDClassifier
+
+from src.data_processing import DataProcessing
+from src.incremental_training import IncrementalModelTraining
+
+
+@pytest.fixture
+def shard_data(sample_csv_file, temp_dir):
+    """Streamed shards of the sample dataset"""
+    processed_path = os.path.join(temp_dir, 'processed')
+    DataProcessing(sample_csv_file, processed_path).run_streaming(chunksize=25)
+    return processed_path
+
+
+class TestIncrementalModelTraining:
+    """Test suite for out-of-core SGD training"""
+
+    def test_load_manifest_holds_out_validation_shard(self, shard_data, temp_dir):
+        """Test the last train shard is held out for early stopping"""
+        trainer = IncrementalModelTraining(shard_data, os.path.join(temp_dir, 'model'))
+        trainer.load_manifest()
+
+        assert len(trainer.validation_shards) == 1
+        assert trainer.validation_shards[0] not in trainer.train_shards
+        assert len(trainer.test_shards) > 0
+        np.testing.assert_array_equal(trainer.classes, [0, 1, 2])
+
+    def test_iter_batches_covers_every_row(self, shard_data, temp_dir):
+        """Test the shuffle buffer yields every train row exactly once per epoch"""
+        trainer = IncrementalModelTraining(shard_data, os.path.join(temp_dir, 'model'),
+                                           batch_size=7, shuffle_buffer_size=10)
+        trainer.load_manifest()
+
+        batches = list(trainer.iter_batches(trainer.train_shards, np.random.RandomState(0)))
+        expected = sum(shard['rows'] for shard in trainer.train_shards)
+
+        assert sum(len(y) for _, y in batches) == expected
+        assert max(len(y) for _, y in batches) <= 7
+
+    def test_run_writes_servable_model(self, shard_data, temp_dir):
+        """Test the model is saved where application.py expects it"""
+        model_path = os.path.join(temp_dir, 'model')
+        trainer = IncrementalModelTraining(shard_data, model_path, epochs=3, batch_size=16)
+
+        trainer.run()
+
+        saved_model = joblib.load(os.path.join(model_path, 'logistic_regression_model.pkl'))
+        assert isinstance(saved_model, SGDClassifier)
+        assert 1 <= len(trainer.history) <= 3
+        assert 'validation_log_loss' in trainer.history[0]
+        assert saved_model.predict_proba(np.zeros((1, 14))).shape == (1, 3)
+
+    def test_early_stopping(self, shard_data, temp_dir):
+        """Test training stops once validation loss stops improving"""
+        trainer = IncrementalModelTraining(shard_data, os.path.join(temp_dir, 'model'),
+                                           epochs=50, patience=1, tol=10.0)
+
+        trainer.run()
+
+        assert len(trainer.history) == 2
+
+    def test_missing_shards(self, temp_dir):
+        """Test a helpful error when no shards were written"""
+        trainer = IncrementalModelTraining(os.path.join(temp_dir, 'processed'), os.path.join(temp_dir, 'model'))
+
+        with pytest.raises(Exception):
+            trainer.load_manifest()
@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+from unittest.mock import MagicMock
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.inference import InferenceEngine, fold_scaler
+
+
+def make_data(n_classes=3, n_samples=300, n_features=14):
+    """Create unscaled features on very different ranges"""
+    rng = np.random.RandomState(42)
+    X = rng.normal(size=(n_samples, n_features)) * rng.uniform(0.1, 500, n_features) + rng.uniform(-50, 2000, n_features)
+    y = rng.randint(0, n_classes, n_samples)
+    return X, y
+
+
+def fit_pipeline(X, y, **model_kwargs):
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression(random_state=42, max_iter=1000, **model_kwargs)
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+class TestInferenceEngine:
+    """Test suite for the fused inference engine"""
+
+    @pytest.mark.parametrize("n_classes,model_kwargs", [
+        (3, {}),
+        (2, {}),
+        (3, {"solver": "liblinear"}),
+        (3, {"multi_class": "ovr"}),
+    ])
+    def test_matches_sklearn(self, n_classes, model_kwargs):
+        """Test fused output matches scaler.transform + predict_proba"""
+        X, y = make_data(n_classes)
+        model, scaler = fit_pipeline(X, y, **model_kwargs)
+
+        engine = InferenceEngine(model, scaler)
+        pred_classes, pred_proba = engine.predict(X)
+
+        X_scaled = scaler.transform(X)
+        assert engine.fused
+        np.testing.assert_allclose(pred_proba, model.predict_proba(X_scaled), rtol=1e-9, atol=1e-12)
+        np.testing.assert_array_equal(pred_classes, model.predict(X_scaled))
+
+    def test_single_row(self):
+        """Test a single 1x14 request"""
+        X, y = make_data()
+        model, scaler = fit_pipeline(X, y)
+
+        pred_classes, pred_proba = InferenceEngine(model, scaler).predict(X[:1])
+
+        assert pred_classes.shape == (1,)
+        assert pred_proba.shape == (1, 3)
+        assert pred_proba.sum() == pytest.approx(1.0)
+
+    def test_fold_scaler_without_mean(self):
+        """Test folding a scaler fitted with with_mean=False"""
+        X, y = make_data()
+        scaler = StandardScaler(with_mean=False).fit(X)
+        model = LogisticRegression(max_iter=1000).fit(scaler.transform(X), y)
+
+        coef, intercept = fold_scaler(model.coef_, model.intercept_, None, scaler.scale_)
+
+        np.testing.assert_allclose(X @ coef.T + intercept, model.decision_function(scaler.transform(X)), rtol=1e-9)
+        np.testing.assert_allclose(InferenceEngine(model, scaler).predict_proba(X),
+                                   model.predict_proba(scaler.transform(X)), rtol=1e-9)
+
+    def test_fallback_for_other_models(self):
+        """Test the non-linear fallback derives the class from the probabilities"""
+        model = MagicMock()
+        model.classes_ = np.array([0, 1, 2])
+        model.predict_proba.return_value = np.array([[0.2, 0.3, 0.5], [0.6, 0.3, 0.1]])
+        scaler = MagicMock()
+        scaler.transform.side_effect = lambda X: X
+
+        engine = InferenceEngine(model, scaler)
+        pred_classes, _ = engine.predict(np.zeros((2, 14)))
+
+        assert not engine.fused
+        np.testing.assert_array_equal(pred_classes, [2, 0])
+        model.predict.assert_not_called()
+
+    @pytest.mark.parametrize("n_classes", [2, 3])
+    def test_matches_sgd_classifier(self, n_classes):
+        """Test a logistic-loss SGDClassifier is fused too"""
+        from sklearn.linear_model import SGDClassifier
+        X, y = make_data(n_classes)
+        scaler = StandardScaler().fit(X)
+        model = SGDClassifier(loss='log_loss', random_state=42).fit(scaler.transform(X), y)
+
+        engine = InferenceEngine(model, scaler)
+        pred_classes, pred_proba = engine.predict(X)
+
+        assert engine.fused
+        np.testing.assert_allclose(pred_proba, model.predict_proba(scaler.transform(X)), rtol=1e-9, atol=1e-12)
+        np.testing.assert_array_equal(pred_classes, model.predict(scaler.transform(X)))
@@ -0,0 +1,92 @@
+import pytest
+import os
+import threading
+import multiprocessing
+
+from src.metrics import MetricsRegistry, clear_metrics_dir
+from src.exception import CustomException
+
+
+def parse_samples(text):
+    """{sample line without value: value} for the non-comment lines of an exposition"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+@pytest.fixture
+def registry(temp_dir):
+    registry = MetricsRegistry(os.path.join(temp_dir, 'metrics'))
+    registry.requests = registry.counter('requests', 'Requests', label='endpoint', values=('a', 'b'))
+    registry.latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.01, 0.1))
+    return registry
+
+
+def record_in_child(registry):
+    registry.requests.inc('a', amount=5)
+    registry.set_info(model_version='child')
+
+
+class TestMetricsRegistry:
+    """Test suite for the multi-process Prometheus metrics"""
+
+    def test_counter_and_histogram_exposition(self, registry):
+        registry.requests.inc('a')
+        registry.requests.inc('a')
+        registry.requests.inc('b', amount=3)
+        for seconds in (0.005, 0.05, 0.5):
+            registry.latency.observe(seconds)
+
+        text = registry.render()
+        samples = parse_samples(text)
+        assert '# TYPE requests counter' in text
+        assert '# TYPE latency_seconds histogram' in text
+        assert samples['requests_total{endpoint="a"}'] == 2
+        assert samples['requests_total{endpoint="b"}'] == 3
+        assert samples['latency_seconds_bucket{le="0.01"}'] == 1
+        assert samples['latency_seconds_bucket{le="0.1"}'] == 2
+        assert samples['latency_seconds_bucket{le="+Inf"}'] == 3
+        assert samples['latency_seconds_count'] == 3
+        assert samples['latency_seconds_sum'] == pytest.approx(0.555)
+
+    def test_threads_write_separate_rows(self, registry):
+        def work():
+            for _ in range(1000):
+                registry.requests.inc('a')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert parse_samples(registry.render())['requests_total{endpoint="a"}'] == 8000
+
+    def test_workers_aggregated(self, registry):
+        registry.requests.inc('a')
+        registry.set_info(model_version='parent')
+
+        child = multiprocessing.get_context('fork').Process(target=record_in_child, args=(registry,))
+        child.start()
+        child.join()
+        assert child.exitcode == 0
+
+        samples = parse_samples(registry.render())
+        # The exited worker's counts are kept, its version is not
+        assert samples['requests_total{endpoint="a"}'] == 6
+        assert samples['serving_workers'] == 1
+        assert samples['model_version_info{version="parent"}'] == 1
+        assert 'model_version_info{version="child"}' not in samples
+
+    def test_metrics_fixed_after_first_value(self, registry):
+        registry.requests.inc('a')
+        with pytest.raises(CustomException):
+            registry.counter('late', 'Too late')
+
+    def test_clear_metrics_dir(self, registry):
+        registry.requests.inc('a')
+        clear_metrics_dir(registry.metrics_dir)
+        assert os.listdir(registry.metrics_dir) == []
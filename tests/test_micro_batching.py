@@ -0,0 +1,80 @@
+import pytest
+import threading
+import numpy as np
+
+from src.micro_batching import MicroBatcher
+
+
+def row_sum_predict(batch_sizes):
+    """predict_fn returning the row sum as class so results can be matched to callers"""
+    def predict_fn(X):
+        batch_sizes.append(len(X))
+        proba = np.tile([0.2, 0.3, 0.5], (len(X), 1))
+        return X.sum(axis=1).astype(int), proba
+    return predict_fn
+
+
+class TestMicroBatcher:
+    """Test suite for the dynamic micro-batching queue"""
+
+    def test_single_prediction(self):
+        """Test a lone request is served after the wait window"""
+        batch_sizes = []
+        batcher = MicroBatcher(row_sum_predict(batch_sizes), max_wait_ms=1)
+        try:
+            pred_class, pred_proba = batcher.predict(np.arange(14), timeout=5)
+        finally:
+            batcher.close()
+
+        assert pred_class == sum(range(14))
+        assert pred_proba.shape == (3,)
+        assert batch_sizes == [1]
+
+    def test_concurrent_requests_are_batched(self):
+        """Test concurrent callers share batches and get their own results"""
+        batch_sizes = []
+        batcher = MicroBatcher(row_sum_predict(batch_sizes), max_batch_size=16, max_wait_ms=50)
+        results = {}
+
+        def worker(i):
+            results[i] = batcher.predict(np.full(14, i), timeout=5)[0]
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(32)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            batcher.close()
+
+        assert results == {i: 14 * i for i in range(32)}
+        assert sum(batch_sizes) == 32
+        assert max(batch_sizes) <= 16
+        assert len(batch_sizes) < 32
+
+        stats = batcher.stats()
+        assert stats['requests'] == 32
+        assert stats['batches'] == len(batch_sizes)
+        assert stats['mean_batch_size'] == pytest.approx(32 / len(batch_sizes))
+        assert sum(stats['batch_size_histogram'].values()) == len(batch_sizes)
+
+    def test_errors_propagate_to_callers(self):
+        """Test a failing batch raises in every waiting caller"""
+        def failing_predict(X):
+            raise ValueError("bad batch")
+
+        batcher = MicroBatcher(failing_predict, max_wait_ms=1)
+        try:
+            with pytest.raises(ValueError):
+                batcher.predict(np.zeros(14), timeout=5)
+        finally:
+            batcher.close()
+
+    def test_submit_after_close(self):
+        """Test the batcher refuses work once closed"""
+        batcher = MicroBatcher(row_sum_predict([]), max_wait_ms=1)
+        batcher.close()
+
+        with pytest.raises(Exception):
+            batcher.submit(np.zeros(14))
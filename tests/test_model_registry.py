@@ -0,0 +1,215 @@
+import pytest
+import numpy as np
+import joblib
+import os
+import time
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.model_registry import ModelRegistry, artifact_fingerprint
+from src.shared_artifacts import snapshot_artifacts
+from src.exception import CustomException
+
+
+def write_artifacts(model_path, scaler_path, seed=0, n_features=4):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(200, n_features))
+    y = rng.randint(0, 3, 200)
+    scaler = StandardScaler().fit(X)
+    joblib.dump(LogisticRegression(max_iter=1000).fit(scaler.transform(X), y), model_path)
+    joblib.dump(scaler, scaler_path)
+
+
+@pytest.fixture
+def artifacts(temp_dir):
+    model_path = os.path.join(temp_dir, 'model.pkl')
+    scaler_path = os.path.join(temp_dir, 'scaler.pkl')
+    write_artifacts(model_path, scaler_path)
+    return model_path, scaler_path
+
+
+def bump_mtime(path, seconds=5):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+class TestModelRegistry:
+    """Test suite for hot model reloading"""
+
+    def test_initial_load(self, artifacts):
+        swapped = []
+        registry = ModelRegistry(*artifacts, on_swap=swapped.append)
+
+        assert registry.reload() is True
+        assert registry.version is not None
+        assert swapped == [registry.current]
+        assert registry.stats()['reloads'] == 0
+        assert registry.reload() is False
+
+    def test_reload_after_change(self, artifacts):
+        model_path, scaler_path = artifacts
+        registry = ModelRegistry(*artifacts)
+        registry.reload()
+        old_bundle = registry.current
+
+        write_artifacts(model_path, scaler_path, seed=1)
+        bump_mtime(model_path)
+        assert registry.reload() is True
+        assert registry.current is not old_bundle
+        assert registry.version != old_bundle.version
+        assert registry.stats()['reloads'] == 1
+
+    def test_watcher_waits_for_stable_files(self, artifacts):
+        model_path, scaler_path = artifacts
+        registry = ModelRegistry(*artifacts)
+        registry.reload()
+        old_version = registry.version
+
+        write_artifacts(model_path, scaler_path, seed=2)
+        bump_mtime(model_path)
+        assert registry.check_for_changes() is False
+        assert registry.version == old_version
+        assert registry.check_for_changes() is True
+        assert registry.version != old_version
+
+    def test_failed_load_keeps_serving(self, artifacts):
+        model_path, _ = artifacts
+        registry = ModelRegistry(*artifacts)
+        registry.reload()
+        bundle = registry.current
+
+        with open(model_path, 'wb') as f:
+            f.write(b'not a pickle')
+        with pytest.raises(CustomException):
+            registry.reload()
+        assert registry.current is bundle
+        assert 'Error loading model artifacts' in registry.stats()['last_error']
+
+        # The watcher does not retry the same broken files on every tick
+        registry.check_for_changes()
+        assert registry.check_for_changes() is False
+
+    def test_smoke_test_rejects_mismatched_scaler(self, artifacts, temp_dir):
+        model_path, _ = artifacts
+        scaler_path = os.path.join(temp_dir, 'other_scaler.pkl')
+        joblib.dump(StandardScaler().fit(np.random.rand(10, 7)), scaler_path)
+
+        with pytest.raises(CustomException):
+            ModelRegistry(model_path, scaler_path).reload()
+
+    def test_background_watcher(self, artifacts):
+        model_path, scaler_path = artifacts
+        registry = ModelRegistry(*artifacts)
+        registry.reload()
+        old_version = registry.version
+        registry.start_watching(0.05)
+        try:
+            write_artifacts(model_path, scaler_path, seed=3)
+            bump_mtime(model_path)
+            deadline = time.time() + 5
+            while registry.version == old_version and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            registry.stop_watching()
+        assert registry.version != old_version
+        assert registry.stats()['watching'] is False
+
+    def test_fingerprint_ignores_missing_paths(self, artifacts, temp_dir):
+        assert len(artifact_fingerprint(list(artifacts) + [os.path.join(temp_dir, 'missing.pkl'), None])) == 2
+
+    def test_feature_schema_loaded(self, artifacts, temp_dir):
+        from src.feature_schema import FeatureSchema
+        from src.feature_transformer import FEATURES
+        schema_path = os.path.join(temp_dir, 'feature_schema.json')
+        FeatureSchema.from_bounds(np.zeros(len(FEATURES)), np.ones(len(FEATURES))).save(schema_path)
+
+        registry = ModelRegistry(*artifacts, feature_schema_path=schema_path)
+        registry.reload()
+        assert registry.current.feature_schema.fields[1]['name'] == FEATURES[1]
+        assert ModelRegistry(*artifacts).load_bundle().feature_schema is None
+
+    def test_drift_reference_loaded(self, artifacts, temp_dir):
+        from src.drift import DriftReference
+        from src.feature_transformer import FEATURES
+        reference_path = os.path.join(temp_dir, 'drift_reference.json')
+        X = np.random.RandomState(0).rand(50, len(FEATURES))
+        DriftReference.from_sample(X).update(X).save(reference_path)
+
+        registry = ModelRegistry(*artifacts, drift_reference_path=reference_path)
+        registry.reload()
+        assert registry.current.drift_reference.rows == 50
+        assert ModelRegistry(*artifacts).load_bundle().drift_reference is None
+
+
+class TestSharedArtifacts:
+    """Test suite for memory-mapped artifacts shared across workers"""
+
+    def test_shared_load_maps_snapshot(self, artifacts, temp_dir):
+        snapshot_dir = os.path.join(temp_dir, 'snapshots')
+        registry = ModelRegistry(*artifacts, shared=True, snapshot_dir=snapshot_dir)
+        registry.reload()
+
+        coef = registry.current.model.coef_
+        assert isinstance(coef, np.memmap)
+        assert not coef.flags.writeable
+        assert os.path.dirname(coef.filename) == os.path.join(snapshot_dir, registry.version)
+        assert registry.stats()['shared'] is True
+
+    def test_workers_reuse_snapshot(self, artifacts, temp_dir):
+        snapshot_dir = os.path.join(temp_dir, 'snapshots')
+        first = snapshot_artifacts(list(artifacts), 'v1', snapshot_dir)
+        mtime = os.stat(first[0]).st_mtime_ns
+
+        assert snapshot_artifacts(list(artifacts) + [None], 'v1', snapshot_dir) == first + [None]
+        assert os.stat(first[0]).st_mtime_ns == mtime
+        assert os.listdir(snapshot_dir) == ['v1']
+
+    def test_prune_keeps_snapshots_beside_other_files(self, artifacts, temp_dir):
+        snapshot_dir = os.path.join(temp_dir, 'snapshots')
+        snapshot_artifacts(list(artifacts), 'v1', snapshot_dir)
+        with open(os.path.join(snapshot_dir, 'reload.trigger'), 'w') as f:
+            f.write('1')
+        snapshot_artifacts(list(artifacts), 'v2', snapshot_dir, keep=2)
+
+        assert sorted(os.listdir(snapshot_dir)) == ['reload.trigger', 'v1', 'v2']
+
+    def test_rewrite_does_not_touch_mapped_snapshot(self, artifacts, temp_dir):
+        model_path, scaler_path = artifacts
+        snapshot_dir = os.path.join(temp_dir, 'snapshots')
+        registry = ModelRegistry(*artifacts, shared=True, snapshot_dir=snapshot_dir)
+        registry.reload()
+        old_bundle = registry.current
+        old_coef = np.array(old_bundle.model.coef_)
+
+        write_artifacts(model_path, scaler_path, seed=1)
+        bump_mtime(model_path)
+        assert registry.reload() is True
+        np.testing.assert_array_equal(old_bundle.model.coef_, old_coef)
+        assert sorted(os.listdir(snapshot_dir)) == sorted([old_bundle.version, registry.version])
+
+    def test_old_snapshots_pruned(self, artifacts, temp_dir):
+        snapshot_dir = os.path.join(temp_dir, 'snapshots')
+        for i, version in enumerate(['v1', 'v2', 'v3']):
+            snapshot_artifacts(list(artifacts), version, snapshot_dir)
+            os.utime(os.path.join(snapshot_dir, version), (i, i))
+
+        snapshot_artifacts(list(artifacts), 'v3', snapshot_dir)
+        assert sorted(os.listdir(snapshot_dir)) == ['v2', 'v3']
+
+    def test_trigger_file_reaches_other_workers(self, artifacts, temp_dir):
+        trigger_path = os.path.join(temp_dir, 'reload.trigger')
+        # Two workers serving the same artifacts
+        worker, other = ModelRegistry(*artifacts, trigger_path=trigger_path), \
+            ModelRegistry(*artifacts, trigger_path=trigger_path)
+        worker.reload()
+        other.reload()
+        assert other.check_for_changes() is False
+
+        assert worker.request_reload(force=True) is True
+        assert other.check_for_changes() is True
+        assert other.stats()['reloads'] == 1
+        # Each request is acted on once, and not replayed by a process started later
+        assert other.check_for_changes() is False
+        late = ModelRegistry(*artifacts, trigger_path=trigger_path)
+        late.reload()
+        assert late.check_for_changes() is False
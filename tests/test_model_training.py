@@ -59,6 +59,24 @@ class TestModelTraining:
         assert trainer.X_train.shape == (80, 14)
         assert trainer.X_test.shape == (20, 14)
 
+    @patch('src.model_training.get_logger')
+    def test_load_processed_data_npy_format(self, mock_get_logger, temp_dir):
+        """Test loading memory-mapped .npy splits with a manifest"""
+        from src.processed_store import save_processed
+        processed_path = os.path.join(temp_dir, 'processed')
+        model_path = os.path.join(temp_dir, 'model')
+        np.random.seed(42)
+        save_processed(processed_path, np.random.rand(80, 14), np.random.rand(20, 14),
+                       np.random.randint(0, 3, 80), np.random.randint(0, 3, 20),
+                       [f'f{i}' for i in range(14)])
+
+        trainer = ModelTraining(processed_path, model_path)
+        trainer.run()
+
+        assert isinstance(trainer.X_train, np.memmap)
+        assert trainer.X_train.shape == (80, 14)
+        assert os.path.exists(os.path.join(model_path, 'logistic_regression_model.pkl'))
+
     @patch('src.model_training.get_logger')
     def test_load_processed_data_missing_files(self, mock_get_logger, temp_dir):
         """Test loading processed data with missing files"""
@@ -98,8 +116,10 @@ class TestModelTraining:
         trainer.load_processed_data()
         trainer.train_model()
         
-        # Should not raise any exceptions
-        trainer.evaluate_model()
+        report = trainer.evaluate_model(n_resamples=100)
+
+        assert report["n_samples"] == 20
+        assert os.path.exists(os.path.join(model_path, 'metrics.json'))
 
     @patch('src.model_training.get_logger')
     def test_run_complete_pipeline(self, mock_get_logger, temp_dir):
@@ -159,4 +179,28 @@ class TestModelTraining:
         predictions = saved_model.predict(X_test)
         
         assert predictions is not None
-        assert len(predictions) == len(X_test)
\ No newline at end of file
+        assert len(predictions) == len(X_test)
+
+    @patch('src.model_training.get_logger')
+    def test_tune_model(self, mock_get_logger, temp_dir):
+        """Test successive-halving search records every trial and saves the best model"""
+        processed_path = os.path.join(temp_dir, 'processed')
+        model_path = os.path.join(temp_dir, 'model')
+
+        rng = np.random.RandomState(0)
+        X_train = rng.rand(300, 14)
+        y_train = (X_train[:, 0] * 3).astype(int)
+
+        trainer = ModelTraining(processed_path, model_path)
+        trainer.X_train, trainer.y_train = X_train, y_train
+        param_grid = [{'solver': ['lbfgs'], 'penalty': ['l2'], 'C': [0.01, 0.1, 1.0, 10.0]}]
+        results = trainer.tune_model(param_grid=param_grid, factor=2, n_jobs=1)
+
+        # 4 candidates, then 2, then 1
+        assert list(results.groupby('iter').size()) == [4, 2, 1]
+        assert results['n_resources'].is_monotonic_increasing
+        assert os.path.exists(os.path.join(model_path, 'tuning_results.csv'))
+        assert isinstance(trainer.clf, LogisticRegression)
+
+        saved_model = joblib.load(os.path.join(model_path, 'logistic_regression_model.pkl'))
+        assert saved_model.C == trainer.clf.C
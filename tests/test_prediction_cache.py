@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+from src.prediction_cache import PredictionCache
+
+
+def fake_predict(X):
+    """Class 0/1 from the first feature, with a matching probability row"""
+    classes = (X[:, 0] > 0).astype(int)
+    return classes, np.column_stack([1 - classes, classes]).astype(float)
+
+
+class TestPredictionCache:
+    """Test suite for the quantized LRU/TTL prediction cache"""
+
+    def test_misses_scored_once(self):
+        cache = PredictionCache()
+        predict_fn = MagicMock(side_effect=fake_predict)
+        X = np.array([[1.0, 2.0], [-1.0, 2.0], [1.0, 2.0]])
+
+        classes, probas = cache.predict(X, predict_fn)
+        np.testing.assert_array_equal(classes, [1, 0, 1])
+        assert predict_fn.call_count == 1
+        assert predict_fn.call_args[0][0].shape == (3, 2)
+
+        classes_again, probas_again = cache.predict(X, predict_fn)
+        assert predict_fn.call_count == 1
+        np.testing.assert_array_equal(probas_again, probas)
+        assert cache.stats()['hits'] == 3
+
+    def test_quantization(self):
+        cache = PredictionCache(quantum=0.01)
+        assert cache.key([1.0, 2.0]) == cache.key([1.001, 1.999])
+        assert cache.key([1.0, 2.0]) != cache.key([1.02, 2.0])
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(max_entries=2)
+        for value in (1.0, 2.0, 1.0, 3.0):
+            cache.predict(np.array([[value]]), fake_predict)
+
+        stats = cache.stats()
+        assert stats['entries'] == 2
+        assert stats['evictions'] == 1
+        assert cache.get(cache.key([2.0])) is None
+        assert cache.get(cache.key([1.0])) is not None
+
+    def test_ttl_expiry(self):
+        cache = PredictionCache(ttl_seconds=10)
+        with patch('src.prediction_cache.time.monotonic', return_value=100.0):
+            cache.predict(np.array([[1.0]]), fake_predict)
+        with patch('src.prediction_cache.time.monotonic', return_value=105.0):
+            assert cache.get(cache.key([1.0])) is not None
+        with patch('src.prediction_cache.time.monotonic', return_value=111.0):
+            assert cache.get(cache.key([1.0])) is None
+        assert cache.stats()['expirations'] == 1
+
+    def test_bind_new_version_clears(self):
+        cache = PredictionCache()
+        cache.bind(1)
+        cache.predict(np.array([[1.0]]), fake_predict)
+        cache.bind(1)
+        assert cache.stats()['entries'] == 1
+
+        cache.bind(2)
+        assert cache.stats()['entries'] == 0
+        assert cache.stats()['invalidations'] == 1
+
+    def test_swap_during_scoring_is_not_cached(self):
+        cache = PredictionCache()
+        cache.bind(1)
+
+        def predict_then_swap(X):
+            result = fake_predict(X)
+            cache.bind(2)
+            return result
+
+        classes, _ = cache.predict(np.array([[1.0], [-1.0]]), predict_then_swap)
+        assert classes.tolist() == [1, 0]
+        # Scored by version 1, so nothing is stored under version 2
+        assert cache.stats()['entries'] == 0
+        assert cache.put(cache.key([1.0]), (1, np.ones(2)), version=1) is False
+        assert cache.stats()['entries'] == 0
+
+    def test_lock_taken_once_per_batch(self):
+        cache = PredictionCache()
+        cache._lock = MagicMock()
+
+        # One lookup and one store for 50 misses, a single lookup for 50 hits
+        cache.predict(np.arange(50, dtype=float).reshape(-1, 1), fake_predict)
+        assert cache._lock.__enter__.call_count == 2
+        cache.predict(np.arange(50, dtype=float).reshape(-1, 1), fake_predict)
+        assert cache._lock.__enter__.call_count == 3
+        assert cache.stats()['hits'] == 50
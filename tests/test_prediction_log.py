@@ -0,0 +1,176 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+from unittest.mock import patch
+
+from src.prediction_log import PredictionLogger, list_blocks, read_prediction_logs, partition_dir
+from src.feature_transformer import FEATURES
+from src.data_processing import DataProcessing
+from src.model_training import ModelTraining
+from src.exception import CustomException
+
+CATEGORIES = {'Operation_Mode': ['Active', 'Idle'], 'Efficiency_Status': ['High', 'Low', 'Medium']}
+
+
+def served_rows(n, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.uniform(1, 100, size=(n, len(FEATURES)))
+    X[:, FEATURES.index('Operation_Mode')] = rng.randint(0, 2, n)
+    X[:, -4:] = [2024, 1, 15, 12]
+    classes = rng.randint(0, 3, n)
+    probas = np.eye(3)[classes]
+    return X, classes, probas
+
+
+@pytest.fixture
+def prediction_logger(temp_dir):
+    prediction_logger = PredictionLogger(os.path.join(temp_dir, 'logs'), capacity_rows=1000, seed=0)
+    prediction_logger.set_categories('v1', CATEGORIES)
+    return prediction_logger
+
+
+class TestPredictionLogger:
+    """Test suite for the asynchronous prediction logger"""
+
+    def test_flush_writes_hourly_block(self, prediction_logger):
+        X, classes, probas = served_rows(5)
+        prediction_logger.log(X[:2], classes[:2], probas[:2], version='v1')
+        prediction_logger.log(X[2:].astype(np.float32), list(classes[2:]), list(probas[2:]), version='v1')
+        assert list_blocks(prediction_logger.log_dir) == []
+
+        assert prediction_logger.flush() == 5
+        blocks = list_blocks(prediction_logger.log_dir)
+        assert len(blocks) == 1
+        with np.load(blocks[0]) as block:
+            assert os.path.dirname(blocks[0]) == partition_dir(prediction_logger.log_dir, block['logged_at'][0])
+            np.testing.assert_allclose(block['X'], X, rtol=1e-6)
+            np.testing.assert_array_equal(block['predicted_class'], classes)
+            assert block['probabilities'].shape == (5, 3)
+            assert str(block['model_version']) == 'v1'
+            assert (block['sample_rate'] == 1).all()
+        assert prediction_logger.flush() == 0
+
+    def test_partition_dir(self):
+        assert partition_dir('logs', 1705323600) == os.path.join('logs', 'date=2024-01-15', 'hour=13')
+
+    def test_versions_written_separately(self, prediction_logger):
+        X, classes, probas = served_rows(4)
+        prediction_logger.log(X[:2], classes[:2], probas[:2], version='v1')
+        prediction_logger.log(X[2:], classes[2:], probas[2:], version='v2')
+        prediction_logger.flush()
+
+        df = read_prediction_logs(prediction_logger.log_dir)
+        assert sorted(df['Model_Version']) == ['v1', 'v1', 'v2', 'v2']
+        assert prediction_logger.stats()['blocks'] == 2
+
+    def test_sampling_under_backpressure(self, prediction_logger):
+        X, classes, probas = served_rows(100)
+        for _ in range(5):
+            prediction_logger.log(X, classes, probas, version='v1')
+        assert prediction_logger.stats()['sample_rate'] == 1.0
+
+        for _ in range(20):
+            prediction_logger.log(X, classes, probas, version='v1')
+        stats = prediction_logger.stats()
+        assert stats['buffered_rows'] <= prediction_logger.capacity_rows
+        assert stats['sampled_out_rows'] > 0
+        assert stats['logged_rows'] + stats['sampled_out_rows'] == 2500
+
+        prediction_logger.flush()
+        df = read_prediction_logs(prediction_logger.log_dir)
+        assert len(df) == stats['logged_rows']
+        assert df['Sample_Weight'].max() > 1
+        assert prediction_logger.stats()['sample_rate'] == 1.0
+
+    def test_background_writer(self, prediction_logger):
+        prediction_logger.flush_interval = 0.01
+        prediction_logger.start()
+        X, classes, probas = served_rows(3)
+        prediction_logger.log(X, classes, probas, version='v1')
+        for _ in range(200):
+            if prediction_logger.written_rows:
+                break
+            prediction_logger._stop.wait(0.01)
+        prediction_logger.log(X, classes, probas, version='v1')
+        prediction_logger.stop()
+        assert prediction_logger.written_rows == 6
+
+
+class TestReadPredictionLogs:
+    """Test suite for reading prediction logs as a training source"""
+
+    def test_raw_layout(self, prediction_logger):
+        X, classes, probas = served_rows(6)
+        prediction_logger.log(X, classes, probas, version='v1')
+        prediction_logger.flush()
+
+        df = read_prediction_logs(prediction_logger.log_dir)
+        assert list(df.columns[:4]) == ['Prediction_ID', 'Timestamp', 'Machine_ID', 'Operation_Mode']
+        assert df['Timestamp'][0] == '2024-01-15 12:00:00'
+        assert list(df['Operation_Mode']) == [CATEGORIES['Operation_Mode'][int(c)] for c in X[:, 0]]
+        assert list(df['Predicted_Status']) == [CATEGORIES['Efficiency_Status'][c] for c in classes]
+        # The model's own predictions are never used as labels
+        assert df['Efficiency_Status'].isna().all()
+        assert df['Prediction_ID'].is_unique
+        np.testing.assert_allclose(df['Temperature_C'], X[:, FEATURES.index('Temperature_C')])
+
+    def test_time_range(self, prediction_logger):
+        X, classes, probas = served_rows(2)
+        prediction_logger.log(X, classes, probas, version='v1')
+        prediction_logger.flush()
+
+        assert len(list_blocks(prediction_logger.log_dir, start='2000-01-01')) == 1
+        assert list_blocks(prediction_logger.log_dir, end='2000-01-01') == []
+
+    def test_empty_log_dir(self, temp_dir):
+        with pytest.raises(CustomException):
+            read_prediction_logs(temp_dir)
+
+    def test_outcomes_joined_by_prediction_id(self, prediction_logger, temp_dir):
+        X, classes, probas = served_rows(4)
+        prediction_logger.log(X, classes, probas, version='v1')
+        prediction_logger.flush()
+        ids = read_prediction_logs(prediction_logger.log_dir)['Prediction_ID']
+        outcomes_path = os.path.join(temp_dir, 'outcomes.csv')
+        pd.DataFrame({'Prediction_ID': ids[[0, 2]], 'Efficiency_Status': ['Low', 'High']}).to_csv(outcomes_path,
+                                                                                                   index=False)
+
+        df = read_prediction_logs(prediction_logger.log_dir, outcomes=outcomes_path)
+        assert df['Efficiency_Status'].tolist()[0] == 'Low'
+        assert df['Efficiency_Status'].tolist()[2] == 'High'
+        assert df['Efficiency_Status'].isna().sum() == 2
+
+    def test_data_processing_requires_outcomes(self, prediction_logger, temp_dir):
+        X, classes, probas = served_rows(10)
+        prediction_logger.log(X, classes, probas, version='v1')
+        prediction_logger.flush()
+
+        processor = DataProcessing(prediction_logger.log_dir, os.path.join(temp_dir, 'processed'))
+        with pytest.raises(CustomException):
+            processor.load_data()
+
+    def test_data_processing_trains_on_labelled_logs(self, prediction_logger, temp_dir):
+        X, classes, probas = served_rows(80)
+        prediction_logger.log(X[:40], classes[:40], probas[:40], version='v1')
+        # Rows kept at half rate under backpressure count twice
+        prediction_logger._buffer.append((prediction_logger._buffer[0][0], 0.5, 'v1', X[40:], classes[40:],
+                                          probas[40:], [f"half-{i}" for i in range(40)], None, None))
+        prediction_logger.flush()
+        logged = read_prediction_logs(prediction_logger.log_dir)
+        outcomes = pd.DataFrame({'Prediction_ID': logged['Prediction_ID'][:70],
+                                 'Efficiency_Status': np.random.RandomState(1).choice(['High', 'Low'], 70)})
+
+        processor = DataProcessing(prediction_logger.log_dir, os.path.join(temp_dir, 'processed'),
+                                   outcomes_path=outcomes)
+        processor.run()
+        trainer = ModelTraining(processor.output_path, os.path.join(temp_dir, 'model'))
+        trainer.load_processed_data()
+
+        assert len(processor.df) == 70
+        assert processor.categories['Efficiency_Status'] == ['High', 'Low']
+        assert len(trainer.w_train) == len(trainer.y_train)
+        assert set(np.unique(trainer.w_train)) == {1.0, 2.0}
+        with patch('src.model_training.LogisticRegression') as mock_model, patch('src.model_training.joblib.dump'):
+            trainer.train_model()
+        assert mock_model.return_value.fit.call_args[1]['sample_weight'] is trainer.w_train
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import os
+
+from src.processed_store import save_processed, load_processed, load_split, load_manifest, has_manifest
+
+FEATURES = [f'f{i}' for i in range(14)]
+
+
+@pytest.fixture
+def saved_splits(temp_dir):
+    np.random.seed(42)
+    X_train, X_test = np.random.rand(80, 14), np.random.rand(20, 14)
+    y_train, y_test = np.random.randint(0, 3, 80), np.random.randint(0, 3, 20)
+    save_processed(temp_dir, X_train, X_test, y_train, y_test, FEATURES)
+    return temp_dir, X_train, X_test, y_train, y_test
+
+
+class TestProcessedStore:
+    """Test suite for the memory-mapped processed-data format"""
+
+    def test_manifest(self, saved_splits):
+        """Test the manifest records feature order, dtypes and row counts"""
+        path = saved_splits[0]
+        manifest = load_manifest(path)
+
+        assert has_manifest(path)
+        assert manifest['features'] == FEATURES
+        assert manifest['splits']['train']['rows'] == 80
+        assert manifest['splits']['test']['rows'] == 20
+        assert manifest['splits']['train']['X_dtype'] == 'float64'
+        assert manifest['splits']['train']['y_dtype'] == 'int64'
+
+    def test_round_trip_is_memory_mapped(self, saved_splits):
+        """Test splits load unchanged as memory-mapped arrays"""
+        path, X_train, X_test, y_train, y_test = saved_splits
+
+        loaded = load_processed(path)
+
+        for original, array in zip((X_train, X_test, y_train, y_test), loaded):
+            assert isinstance(array, np.memmap)
+            np.testing.assert_array_equal(array, original)
+
+    def test_column_and_row_selection(self, saved_splits):
+        """Test reading a subset of columns and rows"""
+        path, X_train, _, y_train, _ = saved_splits
+
+        X, y = load_split(path, 'train', columns=['f2', 'f3'], rows=slice(10, 20))
+        X_one, _ = load_split(path, 'train', columns=['f5'])
+
+        np.testing.assert_array_equal(X, X_train[10:20, 2:4])
+        np.testing.assert_array_equal(y, y_train[10:20])
+        # A single column of a column-major file is a contiguous zero-copy view
+        assert isinstance(X_one, np.memmap)
+        assert X_one.flags['F_CONTIGUOUS']
+
+    def test_missing_manifest(self, temp_dir):
+        """Test loading from a directory without a manifest"""
+        assert not has_manifest(temp_dir)
+        with pytest.raises(Exception):
+            load_processed(temp_dir)
@@ -0,0 +1,61 @@
+import pytest
+import json
+import numpy as np
+from unittest.mock import patch
+
+from src.response_encoding import ResponseEncoder, dumps
+
+LABELS = {0: 'Low Efficiency', 1: 'Medium Efficiency', 2: 'High Efficiency'}
+
+
+@pytest.fixture
+def encoder():
+    return ResponseEncoder(LABELS)
+
+
+@pytest.fixture
+def predictions():
+    classes = np.array([1, 2, 0])
+    probas = np.array([[0.1, 0.8, 0.1], [0.2, 0.1, 0.7], [0.5, 0.3, 0.2]])
+    return [4, 7, 9], classes, probas
+
+
+class TestResponseEncoder:
+    """Test suite for prediction response encoding"""
+
+    def test_single(self, encoder):
+        body = encoder.single(np.int64(1), np.array([0.1, 0.8, 0.1]))
+        assert body == {
+            'prediction': 'Medium Efficiency',
+            'confidence': 0.8,
+            'class': 1,
+            'probabilities': {'Low Efficiency': 0.1, 'Medium Efficiency': 0.8, 'High Efficiency': 0.1},
+        }
+        assert all(type(value) in (str, int, float, dict) for value in body.values())
+
+    def test_rows_match_single(self, encoder, predictions):
+        row_indices, classes, probas = predictions
+        rows = encoder.rows(row_indices, classes, probas)
+
+        assert rows == [dict(encoder.single(c, p), index=i) for i, c, p in zip(row_indices, classes, probas)]
+
+    def test_columnar(self, encoder, predictions):
+        row_indices, classes, probas = predictions
+        body = json.loads(dumps(encoder.columnar(row_indices, classes, probas)))
+
+        assert body['index'] == [4, 7, 9]
+        assert body['class'] == [1, 2, 0]
+        assert body['prediction'] == ['Medium Efficiency', 'High Efficiency', 'Low Efficiency']
+        assert body['confidence'] == [0.8, 0.7, 0.5]
+        assert body['probabilities']['High Efficiency'] == [0.1, 0.7, 0.2]
+
+    @pytest.mark.parametrize('response_format', ['rows', 'columnar'])
+    def test_empty_batch(self, encoder, response_format):
+        body = json.loads(dumps(encoder.results([], [], [], response_format)))
+        assert body == [] or body['index'] == []
+
+    def test_dumps_without_orjson(self, encoder, predictions):
+        payload = encoder.columnar(*predictions)
+        with patch('src.response_encoding.orjson', None):
+            fallback = dumps(payload)
+        assert json.loads(fallback) == json.loads(dumps(payload))
@@ -0,0 +1,84 @@
+import pytest
+import os
+import time
+
+from pipeline.stage_cache import StageCache
+
+CODE = ['src/data_processing.py']
+
+
+def write_outputs(output_dir, size=100, content=b'x'):
+    os.makedirs(output_dir, exist_ok=True)
+    for name in ('a.npy', 'b.pkl'):
+        with open(os.path.join(output_dir, name), 'wb') as f:
+            f.write(content * size)
+    return ['a.npy', 'b.pkl']
+
+
+class TestStageCache:
+    """Test suite for the pipeline stage cache"""
+
+    def test_key_depends_on_input_and_params(self, sample_csv_file, temp_dir):
+        """Test the key changes with parameters and input contents"""
+        cache = StageCache(os.path.join(temp_dir, 'cache'))
+        key = cache.key('stage', sample_csv_file, {'test_size': 0.2}, CODE)
+
+        assert key == cache.key('stage', sample_csv_file, {'test_size': 0.2}, CODE)
+        assert key != cache.key('stage', sample_csv_file, {'test_size': 0.3}, CODE)
+        assert key != cache.key('other', sample_csv_file, {'test_size': 0.2}, CODE)
+
+        with open(sample_csv_file, 'a') as f:
+            f.write('\n')
+        assert key != cache.key('stage', sample_csv_file, {'test_size': 0.2}, CODE)
+
+    def test_content_hash_ignores_mtime(self, sample_csv_file, temp_dir):
+        """Test content hashing keys on file contents only"""
+        cache = StageCache(os.path.join(temp_dir, 'cache'), hash_contents=True)
+        key = cache.key('stage', sample_csv_file, {}, CODE)
+
+        os.utime(sample_csv_file, (time.time() + 100, time.time() + 100))
+
+        assert key == cache.key('stage', sample_csv_file, {}, CODE)
+
+    def test_store_and_restore(self, temp_dir):
+        """Test outputs round-trip through the cache"""
+        cache = StageCache(os.path.join(temp_dir, 'cache'))
+        output_dir = os.path.join(temp_dir, 'out')
+        files = write_outputs(output_dir)
+
+        assert not cache.restore('k1', output_dir)
+        cache.store('k1', 'stage', output_dir, files)
+        assert cache.is_current(output_dir, 'k1', files)
+
+        restored_dir = os.path.join(temp_dir, 'restored')
+        assert cache.restore('k1', restored_dir)
+        assert sorted(os.listdir(restored_dir)) == ['.stage_key', 'a.npy', 'b.pkl']
+
+    def test_modified_outputs_are_not_current(self, temp_dir):
+        """Test outputs changed after caching are replaced on restore"""
+        cache = StageCache(os.path.join(temp_dir, 'cache'))
+        output_dir = os.path.join(temp_dir, 'out')
+        files = write_outputs(output_dir)
+        cache.store('k1', 'stage', output_dir, files)
+
+        write_outputs(output_dir, size=5, content=b'y')
+        assert not cache.is_current(output_dir, 'k1', files)
+
+        assert cache.restore('k1', output_dir)
+        with open(os.path.join(output_dir, 'a.npy'), 'rb') as f:
+            assert f.read() == b'x' * 100
+
+    def test_lru_eviction(self, temp_dir):
+        """Test least recently used entries are evicted above max_bytes"""
+        cache = StageCache(os.path.join(temp_dir, 'cache'), max_bytes=450)
+        output_dir = os.path.join(temp_dir, 'out')
+        files = write_outputs(output_dir)
+
+        cache.store('k1', 'stage', output_dir, files)
+        cache.store('k2', 'stage', output_dir, files)
+        cache.restore('k1', os.path.join(temp_dir, 'r1'))
+        cache.store('k3', 'stage', output_dir, files)
+
+        assert cache.contains('k1')
+        assert not cache.contains('k2')
+        assert cache.contains('k3')
@@ -0,0 +1,118 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+from pipeline.training_pipeline import TrainingPipeline, run_data_processing_directly
+
+
+@pytest.fixture
+def pipeline_paths(sample_csv_file, temp_dir):
+    return {
+        'raw_data_path': sample_csv_file,
+        'processed_data_path': os.path.join(temp_dir, 'processed'),
+        'model_output_path': os.path.join(temp_dir, 'model'),
+        'cache_dir': os.path.join(temp_dir, 'cache'),
+    }
+
+
+class TestTrainingPipeline:
+    """Test suite for the training pipeline runner"""
+
+    def test_run_in_process(self, pipeline_paths):
+        """Test stages run in-process and report wall time"""
+        pipeline = TrainingPipeline(**pipeline_paths)
+
+        with patch('pipeline.training_pipeline.subprocess.run') as mock_run:
+            assert pipeline.run() is True
+            mock_run.assert_not_called()
+
+        assert set(pipeline.stage_timings) == {'validate_paths', 'data_processing', 'model_training'}
+        assert all(seconds >= 0 for seconds in pipeline.stage_timings.values())
+        assert os.path.exists(os.path.join(pipeline_paths['model_output_path'], 'logistic_regression_model.pkl'))
+        assert os.path.exists(os.path.join(pipeline_paths['processed_data_path'], 'manifest.json'))
+
+    def test_in_memory_splits_skip_reload(self, pipeline_paths):
+        """Test model training uses the arrays from data processing"""
+        pipeline = TrainingPipeline(**pipeline_paths)
+
+        with patch('src.model_training.ModelTraining.load_processed_data') as mock_load:
+            assert pipeline.run() is True
+            mock_load.assert_not_called()
+
+    def test_run_missing_raw_data(self, pipeline_paths, temp_dir):
+        """Test a missing raw file fails validation"""
+        pipeline_paths['raw_data_path'] = os.path.join(temp_dir, 'missing.csv')
+
+        assert TrainingPipeline(**pipeline_paths).run() is False
+
+    def test_unchanged_data_processing_is_cached(self, pipeline_paths):
+        """Test a second run reuses cached processed outputs"""
+        assert TrainingPipeline(**pipeline_paths).run() is True
+
+        with patch('src.data_processing.DataProcessing.load_data') as mock_load:
+            assert TrainingPipeline(**pipeline_paths).run() is True
+            mock_load.assert_not_called()
+
+    def test_cache_restores_deleted_outputs(self, pipeline_paths):
+        """Test cached outputs are copied back when the processed dir was cleaned"""
+        import shutil
+        assert TrainingPipeline(**pipeline_paths).run() is True
+        shutil.rmtree(pipeline_paths['processed_data_path'])
+
+        with patch('src.data_processing.DataProcessing.load_data') as mock_load:
+            assert TrainingPipeline(**pipeline_paths).run() is True
+            mock_load.assert_not_called()
+        assert os.path.exists(os.path.join(pipeline_paths['processed_data_path'], 'X_train.npy'))
+
+    def test_force_and_changed_input_rerun_processing(self, pipeline_paths):
+        """Test --force and a modified raw file both bypass the cache"""
+        assert TrainingPipeline(**pipeline_paths).run() is True
+
+        with patch('src.data_processing.DataProcessing.load_data', side_effect=Exception("ran")) as mock_load:
+            assert TrainingPipeline(force=True, **pipeline_paths).run() is False
+            assert mock_load.call_count == 1
+
+            with open(pipeline_paths['raw_data_path'], 'a') as f:
+                f.write('\n')
+            assert TrainingPipeline(**pipeline_paths).run() is False
+            assert mock_load.call_count == 2
+
+    def test_subprocess_opt_in_uses_current_interpreter(self, pipeline_paths):
+        """Test subprocess isolation is opt-in and uses sys.executable"""
+        pipeline = TrainingPipeline(use_subprocess=True, **pipeline_paths)
+
+        with patch('pipeline.training_pipeline.subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout='', stderr='')
+            assert pipeline.run() is True
+
+        assert mock_run.call_count == 2
+        assert mock_run.call_args_list[0][0][0][0] == sys.executable
+
+    def test_sample_weights_reach_training_and_cache(self, pipeline_paths):
+        """Test per-row weights are passed to fit in-process and survive a cache restore"""
+        import shutil
+        import numpy as np
+        from sklearn.linear_model import LogisticRegression
+        from src.data_processing import DataProcessing
+        from src.model_training import ModelTraining
+        from src.prediction_log import SAMPLE_WEIGHT_COLUMN
+
+        read_csv = DataProcessing.load_data
+
+        def load_weighted(self):
+            df = read_csv(self)
+            df[SAMPLE_WEIGHT_COLUMN] = np.where(np.arange(len(df)) % 2, 2.0, 1.0)
+            return df
+
+        with patch.object(DataProcessing, 'load_data', load_weighted), \
+                patch.object(LogisticRegression, 'fit', autospec=True, side_effect=LogisticRegression.fit) as fit:
+            assert TrainingPipeline(**pipeline_paths).run() is True
+        weights = fit.call_args[1]['sample_weight']
+        assert weights is not None and set(np.unique(weights)) == {1.0, 2.0}
+
+        shutil.rmtree(pipeline_paths['processed_data_path'])
+        assert TrainingPipeline(**pipeline_paths).process_data() is None
+        trainer = ModelTraining(pipeline_paths['processed_data_path'], pipeline_paths['model_output_path'])
+        trainer.load_processed_data()
+        np.testing.assert_array_equal(trainer.w_train, weights)